@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+# Only the ASGI server process closes its DB connections after each request
+os.environ["DJANGO_ASGI_SERVER"] = "true"
 
 application = get_asgi_application()
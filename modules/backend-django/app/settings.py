@@ -85,6 +85,15 @@ WSGI_APPLICATION = "app.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Persistent DB connections: reused for DB_CONN_MAX_AGE seconds and health
+# checked before each reuse, so a MySQL restart only costs a reconnect. In the
+# ASGI server every request runs in its own thread and connections are not
+# reused, so that process (flagged by app/asgi.py) closes them after each
+# request instead; the consumer and other commands keep them in both modes.
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", 60))
+if os.getenv("DJANGO_ASGI_SERVER") == "true":
+    DB_CONN_MAX_AGE = 0
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.mysql",
@@ -93,6 +102,8 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", "password_db"),
         "HOST": os.getenv("DB_HOST", "mysql-django"),
         "PORT": int(os.getenv("DB_PORT", 3306)),
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
         "OPTIONS": {
             "charset": "utf8mb4",
         },
@@ -160,6 +171,51 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
 }
 
+# Order list endpoints: "optional" keeps the plain list response unless the
+# client sends `cursor` or `page_size`; "always" paginates every response.
+ORDER_LIST_PAGINATION = os.getenv("ORDER_LIST_PAGINATION", "optional")
+
+# Server started by entrypoint.sh: "wsgi" (gunicorn) or "asgi" (uvicorn). Under
+# ASGI the streamed listings (`stream=true`) iterate the ORM asynchronously.
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
+
+# Redis connections: one pool per URL and process, shared by the consumer,
+# the recent-IDs filter, the Django-Q broker and the response cache
+REDIS_URL = os.getenv("REDIS_URL") or "redis://redis:6379/0"
+REDIS_POOL_OPTIONS = {
+    "max_connections": int(os.getenv("REDIS_MAX_CONNECTIONS", 50)),
+    "health_check_interval": int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30)),
+    "socket_keepalive": True,
+}
+
+# Cache of the read endpoints. "redis" is shared by the API workers and the
+# Redis consumer, so the invalidations of any process reach all of them.
+# "locmem" is per process and only fits a single-process setup; "dummy"
+# disables the cache.
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND") or "redis"
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60))
+
+CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "logistrack",
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("RESPONSE_CACHE_URL") or "redis://redis:6379/1",
+        "OPTIONS": REDIS_POOL_OPTIONS,
+    },
+    "dummy": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
+
+CACHES = {RESPONSE_CACHE_ALIAS: CACHE_BACKENDS[RESPONSE_CACHE_BACKEND]}
+
+# Read dashboard and consolidation counts from the order summary tables
+# (rebuild them first with `manage.py order_summary_command`).
+ORDER_SUMMARY_READS = os.getenv("ORDER_SUMMARY_READS", "false").lower() == "true"
+
 # drf-spectacular settings (optional polish)
 SPECTACULAR_SETTINGS = {
     "TITLE": "Logistrack API",
@@ -186,18 +242,22 @@ CORS_ALLOW_METHODS = (
 )
 
 #  Django-Q for queue with redis
+# Q_BROKER: "orm" keeps the queue in the database; "redis" uses the shared
+# Redis pool, and enqueues a whole batch of tasks in one pipeline
+Q_BROKER = os.getenv("Q_BROKER", "orm")
 Q_CLUSTER = {
     "name": "backend-django-Q",
     "workers": 4,
     "timeout": 90,
     "retry": 120,
     "compress": True,
-    "orm": "default",
-    "redis": {
-        "host": os.getenv("REDIS_URL", "redis"),
-        "port": 6379,
-        "db": 0,
-    },
+    "redis": REDIS_URL,
 }
+if Q_BROKER == "redis":
+    Q_CLUSTER["broker_class"] = (
+        "service_app.helpers.redis_pool_helper.PooledRedisBroker"
+    )
+else:
+    Q_CLUSTER["orm"] = "default"
 
 SILENCED_SYSTEM_CHECKS = ["models.W037"]
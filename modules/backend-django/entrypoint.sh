@@ -4,7 +4,19 @@ set -e
 echo "Running migrations..."
 python manage.py migrate --noinput
 
+# SERVER_MODE=wsgi: gunicorn sync workers, one request per worker at a time
+# SERVER_MODE=asgi: uvicorn workers, streamed listings don't hold a worker
+WEB_WORKERS="${WEB_WORKERS:-3}"
+
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    echo "Init Django with Uvicorn (ASGI)..."
+    exec uvicorn app.asgi:application \
+        --host 0.0.0.0 \
+        --port 8000 \
+        --workers "$WEB_WORKERS"
+fi
+
 echo "Init Django with Gunicorn..."
 exec gunicorn app.wsgi:application \
     --bind 0.0.0.0:8000 \
-    --workers 3
+    --workers "$WEB_WORKERS"
@@ -0,0 +1,110 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+from django.db.models import Count, Max, QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .response_cache_helper import ResponseCache, response_cache
+
+# (ETag, Last-Modified) of a response
+Validators = Tuple[str, Optional[datetime]]
+
+
+def get_validators(*querysets) -> Validators:
+    """
+    Derive validators of a listing from the rows it is built from.
+
+    Each queryset costs one aggregate query: the latest ``updated_at`` and the
+    row count. Any save bumps ``updated_at`` and rows leaving the filtered set
+    change the count, so the ETag changes whenever the listing can, and a
+    conditional GET is answered without building the listing.
+
+    :param querysets: Querysets of TimeStampedModel rows behind the response
+    :return: (etag, last_modified)
+    """
+    parts = []
+    last_modified = None
+
+    for queryset in querysets:
+        aggregate = queryset.order_by().aggregate(
+            last_modified=Max("updated_at"), total=Count("pk")
+        )
+        modified = aggregate["last_modified"]
+        parts.append(
+            f"{modified.isoformat() if modified else '-'}:{aggregate['total']}"
+        )
+
+        if modified and (last_modified is None or modified > last_modified):
+            last_modified = modified
+
+    digest = hashlib.md5("|".join(parts).encode()).hexdigest()
+    return f'"{digest}"', last_modified
+
+
+def cached_response(
+    request,
+    statuses: Sequence[str],
+    build: Callable[[], Any],
+    querysets: Callable[[], Sequence[QuerySet]],
+    cache: ResponseCache = response_cache,
+) -> Response:
+    """
+    Answer a GET from the response cache, honouring conditional headers.
+
+    The validators are stored in the cache entry next to the payload, so a
+    hit answers the 200 or the 304 without querying the database. On a miss
+    they come from get_validators(), before anything is built: a client copy
+    that is still current gets its 304 after the aggregate queries only.
+    They are read before the payload, so a write in between can only make
+    the stored ETag older than the body, never newer.
+
+    :param request: DRF request
+    :param statuses: Order statuses the endpoint can return
+    :param build: Callable computing the payload on a miss
+    :param querysets: Callable returning the querysets the payload is built from
+    :param cache: Response cache to read and fill
+    """
+    key, entry = cache.lookup(request.path, request.query_params, statuses)
+    hit = entry is not None
+
+    if hit:
+        validators = (entry["etag"], entry["last_modified"])
+    else:
+        validators = get_validators(*querysets())
+
+    response = not_modified_response(request, validators)
+    if response is None:
+        if not hit:
+            etag, last_modified = validators
+            entry = {"data": build(), "etag": etag, "last_modified": last_modified}
+            cache.store(key, entry)
+        response = set_validators(Response(entry["data"]), validators)
+    response["X-Cache"] = "HIT" if hit else "MISS"
+    return response
+
+
+def not_modified_response(request, validators: Validators):
+    """
+    Return a 304 response when the client copy is still current, None otherwise.
+
+    :param request: DRF or Django request
+    :param validators: (etag, last_modified) of the current listing
+    """
+    etag, last_modified = validators
+    return get_conditional_response(
+        getattr(request, "_request", request),
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def set_validators(response, validators: Validators):
+    """Add the ETag and Last-Modified headers to a response."""
+    etag, last_modified = validators
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,112 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_date(value: str) -> date:
+    """
+    Parse a ``YYYY-MM-DD`` query parameter.
+
+    :param value: Date string
+    :return: Parsed date
+    :raises ValueError: If the value is not a valid date
+    """
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+
+def start_of_day(day: date) -> datetime:
+    """
+    Return the first instant of a day in the active timezone.
+
+    :param day: Calendar day
+    :return: Aware datetime when USE_TZ is enabled, naive otherwise
+    """
+    value = datetime.combine(day, time.min)
+    if settings.USE_TZ:
+        return timezone.make_aware(value, timezone.get_current_timezone())
+    return value
+
+
+def day_range(
+    date_from: Optional[date], date_to: Optional[date]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Return the half-open ``[start, end)`` interval covering whole days.
+
+    :param date_from: First day included, or None for no lower bound
+    :param date_to: Last day included, or None for no upper bound
+    :return: (start, end) datetimes, either of them None when unbounded
+        (including a last day of ``date.max``, which has no next day)
+    """
+    start = start_of_day(date_from) if date_from else None
+    end = None
+    if date_to:
+        try:
+            end = start_of_day(date_to + timedelta(days=1))
+        except OverflowError:
+            pass
+    return start, end
+
+
+def date_range_filter(
+    field: str,
+    date_str: Optional[str] = None,
+    date_from_str: Optional[str] = None,
+    date_to_str: Optional[str] = None,
+) -> Q:
+    """
+    Build a sargable filter on a datetime column from day query parameters.
+
+    ``date`` selects a single day and ``date_from`` / ``date_to`` an inclusive
+    range of days. Days are turned into ``field >= start AND field < end``
+    bounds in the active timezone, so the database compares the raw column and
+    can use its indexes, instead of applying ``DATE()`` / ``CONVERT_TZ()`` on
+    every row like a ``__date`` lookup does.
+
+    :param field: Datetime field name, e.g. "dispatch_date"
+    :param date_str: Single day (YYYY-MM-DD)
+    :param date_from_str: First day of the range (YYYY-MM-DD)
+    :param date_to_str: Last day of the range (YYYY-MM-DD)
+    :return: Q object, empty when no parameter is given
+    :raises ValueError: If any of the dates is not a valid date
+    """
+    filters = Q()
+    ranges = []
+
+    if date_str:
+        day = parse_date(date_str)
+        ranges.append(day_range(day, day))
+
+    date_from = parse_date(date_from_str) if date_from_str else None
+    date_to = parse_date(date_to_str) if date_to_str else None
+    ranges.append(day_range(date_from, date_to))
+
+    for start, end in ranges:
+        if start is not None:
+            filters &= Q(**{f"{field}__gte": start})
+        if end is not None:
+            filters &= Q(**{f"{field}__lt": end})
+
+    return filters
+
+
+def dispatch_date_filter(request) -> Q:
+    """
+    Build the dispatch_date filter of the ``date``, ``date_from`` and ``date_to``
+    query parameters of a request.
+
+    :param request: DRF request
+    :return: Q object
+    :raises ValueError: If any of the dates is not a valid date
+    """
+    return date_range_filter(
+        "dispatch_date",
+        date_str=request.query_params.get("date"),
+        date_from_str=request.query_params.get("date_from"),
+        date_to_str=request.query_params.get("date_to"),
+    )
@@ -0,0 +1,127 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+ENVELOPE_FORMAT = os.getenv("REDIS_ENVELOPE_FORMAT", "php")
+
+
+def _default_loads() -> Callable[[Any], Any]:
+    """Use orjson when it is installed, the standard library otherwise."""
+    return orjson.loads if orjson is not None else json.loads
+
+
+class EnvelopeDecodeError(ValueError):
+    """Raised when a stream entry is not a valid Symfony Messenger envelope."""
+
+
+class EnvelopeDecoder(ABC):
+    """
+    Base decoder for Symfony Messenger envelopes read from Redis streams.
+
+    An envelope is a JSON object ``{"body": "<json>", "headers": {...}}`` whose
+    body holds the ``eventType`` and ``payload`` of the event.
+    """
+
+    def __init__(self, loads: Optional[Callable[[Any], Any]] = None):
+        self.loads = loads or _default_loads()
+
+    @abstractmethod
+    def decode(self, raw: bytes) -> Optional[Tuple[str, dict]]:
+        """
+        Decode a raw stream entry.
+
+        Args:
+            raw: Value of the ``message`` field of the stream entry
+
+        Returns:
+            Optional[Tuple[str, dict]]: (event_type, payload), or None when the
+            envelope has an empty body
+        """
+
+    def _decode_envelope(self, envelope: Dict[str, Any]) -> Optional[Tuple[str, dict]]:
+        try:
+            body = self.loads(envelope["body"])
+        except (KeyError, TypeError) as e:
+            raise EnvelopeDecodeError(f"Envelope without body: {e}")
+
+        if not body:
+            return None
+
+        event_type = body.get("eventType")
+        payload = body.get("payload")
+
+        # Some publishers encode the payload twice
+        if isinstance(payload, (bytes, str)):
+            payload = self.loads(payload)
+
+        return event_type, payload
+
+
+class PhpSerializedEnvelopeDecoder(EnvelopeDecoder):
+    """
+    Decoder for envelopes serialized by phpredis as a PHP string: ``s:<len>:"<json>";``.
+
+    The length prefix is the size in bytes of the JSON string, so the envelope
+    is sliced out directly instead of being searched with a regex.
+    """
+
+    def decode(self, raw: bytes) -> Optional[Tuple[str, dict]]:
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+
+        if not raw.startswith(b"s:"):
+            raise EnvelopeDecodeError("Envelope is not a PHP serialized string")
+
+        separator = raw.find(b":", 2)
+        if separator == -1 or not raw[2:separator].isdigit():
+            raise EnvelopeDecodeError("Invalid PHP string length prefix")
+
+        start = separator + 2
+        end = start + int(raw[2:separator])
+
+        if not raw.startswith(b'"', separator + 1) or not raw.startswith(b'";', end):
+            raise EnvelopeDecodeError("PHP string length does not match the envelope")
+
+        # json.loads is noticeably slower on bytes, so hand it text
+        return self._decode_envelope(self.loads(raw[start:end].decode("utf-8")))
+
+
+class JsonEnvelopeDecoder(EnvelopeDecoder):
+    """Decoder for envelopes stored as plain JSON."""
+
+    def decode(self, raw: bytes) -> Optional[Tuple[str, dict]]:
+        return self._decode_envelope(self.loads(raw))
+
+
+ENVELOPE_DECODERS = {
+    "php": PhpSerializedEnvelopeDecoder,
+    "json": JsonEnvelopeDecoder,
+}
+
+
+def get_envelope_decoder(
+    envelope_format: str = ENVELOPE_FORMAT, loads: Optional[Callable[[Any], Any]] = None
+) -> EnvelopeDecoder:
+    """
+    Build the envelope decoder for the given format.
+
+    :param envelope_format: One of the keys of ENVELOPE_DECODERS ("php" or "json")
+    :param loads: Optional JSON loads function, defaults to orjson when installed
+    :return: Envelope decoder instance
+    :rtype: EnvelopeDecoder
+    """
+    try:
+        decoder_class = ENVELOPE_DECODERS[envelope_format]
+    except KeyError:
+        raise ValueError(
+            f"Unknown envelope format '{envelope_format}', "
+            f"expected one of: {', '.join(ENVELOPE_DECODERS)}"
+        )
+
+    return decoder_class(loads=loads)
@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models
+
+IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", 4096))
+# Seconds an entry is trusted, 0 to keep entries until they are invalidated
+IDENTITY_CACHE_TTL = int(os.getenv("IDENTITY_CACHE_TTL", 300))
+# Seconds between two reads of the shared version of a model
+IDENTITY_CACHE_VERSION_INTERVAL = float(os.getenv("IDENTITY_CACHE_VERSION_INTERVAL", 5))
+
+# Cached instance and its monotonic expiry time (None: no expiry)
+Entry = Tuple[models.Model, Optional[float]]
+
+
+class IdentityCache:
+    """
+    Bounded LRU cache of model instances keyed by (model, primary key).
+
+    Used by the ingestion path to resolve drivers, blocks and products that
+    show up in almost every event without querying the database. Entries are
+    dropped when the instance is saved or deleted (see ``signals.py``).
+
+    Those signals only fire in the process that made the change, so an
+    invalidation also bumps a version of the model in the shared cache
+    (``alias``). The other processes read that version at most once every
+    ``version_interval`` seconds per model, so lookups rarely pay a round
+    trip, and drop their entries of the model when it changed. Changes that
+    send no signal (``QuerySet.update()``, raw SQL, other applications) are
+    only picked up once the entry is older than ``ttl`` seconds, and so are
+    invalidations while the shared cache is unreachable.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = IDENTITY_CACHE_SIZE,
+        ttl: float = IDENTITY_CACHE_TTL,
+        alias: Optional[str] = settings.RESPONSE_CACHE_ALIAS,
+        version_interval: float = IDENTITY_CACHE_VERSION_INTERVAL,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.alias = alias
+        self.version_interval = version_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int], Entry]" = OrderedDict()
+        # Model label -> shared version the local entries of the model match
+        self._versions: Dict[str, int] = {}
+        # Model label -> monotonic time of the next read of its shared version
+        self._next_version_check: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(model, pk) -> Tuple[str, int]:
+        return model._meta.label, int(pk)
+
+    @staticmethod
+    def _version_key(model) -> str:
+        return f"identity:version:{model._meta.label}"
+
+    def _shared_version(self, model) -> Optional[int]:
+        """Version of a model in the shared cache, None when it is unreachable."""
+        if self.alias is None:
+            return 0
+        try:
+            return caches[self.alias].get(self._version_key(model), 0)
+        except Exception as e:
+            print(f"Identity cache version of {model._meta.label} unavailable: {e}")
+            return None
+
+    def _sync_version(self, model) -> None:
+        """Drop the entries of a model invalidated by another process."""
+        label = model._meta.label
+        now = time.monotonic()
+        if now < self._next_version_check.get(label, 0.0):
+            return
+
+        self._next_version_check[label] = now + self.version_interval
+        version = self._shared_version(model)
+        if version is None:
+            return
+
+        with self._lock:
+            if self._versions.get(label, version) != version:
+                for key in [key for key in self._entries if key[0] == label]:
+                    del self._entries[key]
+            self._versions[label] = version
+
+    def get(self, model, pk) -> Optional[models.Model]:
+        """Return the cached instance or None, counting the hit/miss."""
+        return self.get_many(model, [pk]).get(int(pk))
+
+    def get_many(self, model, pks: Iterable) -> Dict[int, models.Model]:
+        """Return the cached instances among the given primary keys."""
+        self._sync_version(model)
+        now = time.monotonic()
+        found = {}
+
+        with self._lock:
+            for pk in pks:
+                key = self._key(model, pk)
+                instance, expires_at = self._entries.get(key, (None, None))
+
+                if (
+                    instance is not None
+                    and expires_at is not None
+                    and expires_at <= now
+                ):
+                    del self._entries[key]
+                    instance = None
+
+                if instance is None:
+                    self.misses += 1
+                    continue
+
+                self._entries.move_to_end(key)
+                self.hits += 1
+                found[key[1]] = instance
+
+        return found
+
+    def set_many(self, instances: Iterable[models.Model]) -> None:
+        """Store instances, evicting the least recently used ones when full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+
+        with self._lock:
+            for instance in instances:
+                key = self._key(type(instance), instance.pk)
+                self._entries[key] = (instance, expires_at)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, model, pk) -> None:
+        """Drop the entry of an instance that changed, in every process."""
+        with self._lock:
+            self._entries.pop(self._key(model, pk), None)
+
+        if self.alias is None:
+            return
+
+        key = self._version_key(model)
+        try:
+            cache = caches[self.alias]
+            try:
+                cache.incr(key)
+            except ValueError:
+                if not cache.add(key, 1, timeout=None):
+                    cache.incr(key)
+        except Exception as e:
+            # The other processes pick the change up when their entries expire
+            print(f"Identity cache version of {model._meta.label} not bumped: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._next_version_check.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return the counters of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hitRatio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Process-level cache shared by the ingestion services
+identity_cache = IdentityCache()
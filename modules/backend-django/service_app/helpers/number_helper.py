@@ -1,7 +1,9 @@
-import random
+def generate_order_code(order_id: int) -> str:
+    """
+    Generate the code of an order created from an event: PED-XXXXXX.
 
-
-def generate_random_code() -> str:
-    """Generate a random order code in format PED-XXXX"""
-    random_number = random.randint(0, 9999)
-    return f"PED-{random_number:04d}"
+    Derived from the order id, so it is unique among generated codes. The six
+    digits keep it apart from the four-digit PED-XXXX codes of older orders
+    and fixtures.
+    """
+    return f"PED-{order_id:06d}"
@@ -0,0 +1,221 @@
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from .spanish_status_helper import to_spanish_status
+
+
+def _float_or_none(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def driver_to_dict(driver) -> Optional[dict]:
+    if driver is None:
+        return None
+
+    return {
+        "id": driver.id,
+        "firstName": driver.first_name,
+        "lastName": driver.last_name,
+        "licensePlate": driver.license_plate,
+        "dateOfBirth": driver.date_of_birth,
+    }
+
+
+def product_to_dict(product) -> dict:
+    return {"id": product.id, "Name": product.name, "Sku": product.sku}
+
+
+# Output key -> getter, in the same order as the fields of OrderDTO
+ORDER_FIELD_GETTERS: Dict[str, Callable[[Any], Any]] = {
+    "id": lambda o: o.id,
+    "code": lambda o: o.code,
+    "origin": lambda o: o.origin,
+    "destination": lambda o: o.destination,
+    "user": lambda o: o.user,
+    "status": lambda o: to_spanish_status(o.status),
+    "driver": lambda o: driver_to_dict(o.driver),
+    "latitude": lambda o: _float_or_none(o.latitude),
+    "longitude": lambda o: _float_or_none(o.longitude),
+    "dispatchDate": lambda o: o.dispatch_date,
+    "volume": lambda o: _float_or_none(o.volume),
+    "weight": lambda o: _float_or_none(o.weight),
+    "incidents": lambda o: o.incidents,
+    "numberOfBags": lambda o: o.number_of_bags,
+    "products": lambda o: [product_to_dict(p) for p in o.products.all()],
+}
+
+
+# Output key -> Order column it reads ("driver" is the foreign key column)
+ORDER_FIELD_COLUMNS: Dict[str, str] = {
+    "id": "id",
+    "code": "code",
+    "origin": "origin",
+    "destination": "destination",
+    "user": "user",
+    "status": "status",
+    "driver": "driver",
+    "latitude": "latitude",
+    "longitude": "longitude",
+    "dispatchDate": "dispatch_date",
+    "volume": "volume",
+    "weight": "weight",
+    "incidents": "incidents",
+    "numberOfBags": "number_of_bags",
+}
+
+# Output keys read through a relation, loaded with a join or a prefetch
+ORDER_FIELD_SELECT_RELATED: Dict[str, str] = {"driver": "driver"}
+ORDER_FIELD_PREFETCH_RELATED: Dict[str, str] = {"products": "products"}
+
+# Columns every listing needs, for the (dispatch_date, id) ordering and cursor
+ORDER_KEY_COLUMNS = ("id", "dispatch_date")
+
+
+class OrderProjection:
+    """
+    Compiled projection of an Order into the camelCase dict of an endpoint.
+
+    The list of getters is resolved once, when the projection is declared, so
+    projecting an order is a single dict comprehension over model attributes,
+    without building and dumping pydantic DTOs. The output is the same as the
+    DTO based helpers of ``dto_helper``.
+
+    The projection also knows the columns and relations it reads, and
+    ``apply`` restricts a queryset to them: endpoints without driver or
+    products skip the join and the prefetch.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        extra: Optional[Dict[str, Callable[[Any], Any]]] = None,
+        extra_columns: Sequence[str] = (),
+    ):
+        getters = [(name, ORDER_FIELD_GETTERS[name]) for name in fields]
+        getters += list((extra or {}).items())
+
+        self.fields: Tuple[str, ...] = tuple(name for name, _ in getters)
+        self._getters = tuple(getters)
+
+        columns = list(ORDER_KEY_COLUMNS)
+        columns += [ORDER_FIELD_COLUMNS[f] for f in fields if f in ORDER_FIELD_COLUMNS]
+        columns += list(extra_columns)
+        self.columns: Tuple[str, ...] = tuple(dict.fromkeys(columns))
+        self.select_related: Tuple[str, ...] = tuple(
+            ORDER_FIELD_SELECT_RELATED[f]
+            for f in fields
+            if f in ORDER_FIELD_SELECT_RELATED
+        )
+        self.prefetch_related: Tuple[str, ...] = tuple(
+            ORDER_FIELD_PREFETCH_RELATED[f]
+            for f in fields
+            if f in ORDER_FIELD_PREFETCH_RELATED
+        )
+
+    def __call__(self, order) -> dict:
+        return {name: getter(order) for name, getter in self._getters}
+
+    def apply(self, queryset, select_related: Sequence[str] = ()):
+        """
+        Load only the columns and relations of the projection.
+
+        :param queryset: Order queryset
+        :param select_related: Other foreign keys the caller reads
+        :return: The restricted queryset
+        """
+        related = self.select_related + tuple(select_related)
+        if related:
+            queryset = queryset.select_related(*related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+
+        return queryset.only(*self.columns, *select_related)
+
+
+# Same output as order_to_dto(order).model_dump(by_alias=True)
+ORDER_PROJECTION = OrderProjection(list(ORDER_FIELD_GETTERS))
+
+DISPATCH_PROJECTION = OrderProjection(
+    [
+        "id",
+        "code",
+        "origin",
+        "destination",
+        "status",
+        "latitude",
+        "longitude",
+        "dispatchDate",
+    ]
+)
+
+PREPARATION_PROJECTION = OrderProjection(
+    [
+        "id",
+        "code",
+        "origin",
+        "destination",
+        "status",
+        "latitude",
+        "longitude",
+        "dispatchDate",
+        "volume",
+        "weight",
+        "products",
+    ]
+)
+
+RECEIVING_PROJECTION = OrderProjection(
+    list(ORDER_FIELD_GETTERS),
+    extra={"hasIncidents": lambda o: bool(o.incidents)},
+    extra_columns=["incidents"],
+)
+
+DISTRIBUTION_PROJECTION = OrderProjection(
+    list(ORDER_FIELD_GETTERS),
+    extra={"confirmation": lambda o: o.status == "DELIVERED"},
+    extra_columns=["status"],
+)
+
+
+def block_to_dict(block, orders=None) -> dict:
+    """Same output as block_to_dto(block, orders).model_dump(by_alias=True)."""
+    ords = orders if orders is not None else block.orders.all()
+
+    return {
+        "id": block.id,
+        "name": block.name,
+        "description": block.description,
+        "orders": [ORDER_PROJECTION(o) for o in ords],
+    }
+
+
+# Output key -> order status counted in a consolidation group
+CONSOLIDATION_STATUS_COUNTS: Dict[str, str] = {
+    "completed": "COMPLETED",
+    "pending": "PENDING",
+    "rejected": "REJECTED",
+    "delivered": "DELIVERED",
+    "approved": "APPROVED",
+    "inDispatch": "IN_DISPATCH",
+    "readyToShip": "READY_TO_SHIP",
+    "readyToDeliver": "READY_TO_DELIVER",
+}
+
+
+def consolidation_group_to_dict(driver, block, counts: dict, orders) -> dict:
+    """
+    Same output as build_consolidation_group(...).model_dump(by_alias=True).
+
+    :param counts: ``total`` plus one entry per key of CONSOLIDATION_STATUS_COUNTS
+    :param orders: orders of the group
+    """
+    data = {
+        "driver": driver_to_dict(driver),
+        "blockId": block.id if block else None,
+        "blockName": block.name if block else None,
+        "total": counts["total"],
+    }
+    for key in CONSOLIDATION_STATUS_COUNTS:
+        data[key] = counts[key]
+    data["orders"] = [ORDER_PROJECTION(o) for o in orders]
+
+    return data
@@ -0,0 +1,75 @@
+import copy
+import threading
+from typing import Dict, Iterable, Optional
+
+import redis
+from django.conf import settings
+from django_q.brokers import get_broker, redis_broker
+from django_q.tasks import async_task
+
+_pools: Dict[str, redis.ConnectionPool] = {}
+_lock = threading.Lock()
+
+
+def get_connection_pool(url: Optional[str] = None) -> redis.ConnectionPool:
+    """
+    Return the process-wide connection pool of a Redis URL.
+
+    Pools are created once per URL with settings.REDIS_POOL_OPTIONS; redis-py
+    resets a pool inherited through fork, so forked workers get their own
+    connections.
+
+    :param url: Redis URL, settings.REDIS_URL by default
+    :return: The shared pool
+    """
+    url = url or settings.REDIS_URL
+
+    with _lock:
+        pool = _pools.get(url)
+        if pool is None:
+            pool = redis.ConnectionPool.from_url(url, **settings.REDIS_POOL_OPTIONS)
+            _pools[url] = pool
+    return pool
+
+
+def get_redis(url: Optional[str] = None) -> redis.Redis:
+    """Redis client on the shared pool of the URL."""
+    return redis.Redis(connection_pool=get_connection_pool(url))
+
+
+class PooledRedisBroker(redis_broker.Redis):
+    """Django-Q Redis broker on the shared pool of settings.REDIS_URL."""
+
+    @staticmethod
+    def get_connection(list_key: str = None) -> redis.Redis:
+        return get_redis()
+
+
+def enqueue_tasks(func: str, calls: Iterable[tuple]) -> int:
+    """
+    Enqueue one Django-Q task per call of `func`.
+
+    With a Redis broker every push goes through one pipeline, so the whole
+    batch costs a single round trip; other brokers enqueue one by one.
+
+    :param func: Dotted path of the task function
+    :param calls: Positional arguments of each task
+    :return: Number of tasks enqueued
+    """
+    calls = list(calls)
+    if not calls:
+        return 0
+
+    broker = get_broker()
+    pipe = None
+    if isinstance(broker, redis_broker.Redis):
+        pipe = broker.connection.pipeline(transaction=False)
+        broker = copy.copy(broker)
+        broker.connection = pipe
+
+    for args in calls:
+        async_task(func, *args, broker=broker)
+
+    if pipe is not None:
+        pipe.execute()
+    return len(calls)
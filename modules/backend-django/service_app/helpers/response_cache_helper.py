@@ -0,0 +1,276 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .date_range_helper import parse_date
+
+# Query params that narrow an entry to the orders of one driver, block or day
+TAG_DIMENSIONS = ("driver", "block", "date")
+
+# Seconds between flushes of the counters of a process to the shared counters
+RESPONSE_CACHE_STATS_INTERVAL = float(os.getenv("RESPONSE_CACHE_STATS_INTERVAL") or 60)
+
+# Counters of the cache, per process and summed over processes
+STATS_COUNTERS = ("hits", "misses", "invalidations")
+
+# (status, driver_id, block_id, dispatch day) of an order at some point in time
+OrderSnapshot = Tuple[str, Optional[int], Optional[int], Optional[str]]
+
+
+class ResponseCache:
+    """
+    Cache of read endpoint payloads with tag-version invalidation.
+
+    An entry is keyed by endpoint, normalized query params and the current
+    version of each of its tags. A tag is an order status, optionally combined
+    with the driver, block or day the request filters on
+    (e.g. ``status:APPROVED:driver:5``). When an order changes, the versions of
+    the tags it matched before and after the change are bumped, so the entries
+    that could contain it stop being reachable and expire on their own.
+
+    The cache is an optimization only: when its backend fails, payloads are
+    built directly and invalidations are skipped.
+    """
+
+    def __init__(
+        self,
+        alias: str = settings.RESPONSE_CACHE_ALIAS,
+        timeout: int = settings.RESPONSE_CACHE_TIMEOUT,
+        prefix: str = "resp",
+        stats_interval: float = RESPONSE_CACHE_STATS_INTERVAL,
+    ):
+        self.alias = alias
+        self.timeout = timeout
+        self.prefix = prefix
+        self.stats_interval = stats_interval
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._unflushed = dict.fromkeys(STATS_COUNTERS, 0)
+        self._next_flush = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_or_set(
+        self,
+        endpoint: str,
+        params,
+        statuses: Sequence[str],
+        build: Callable[[], Any],
+    ) -> Tuple[Any, bool]:
+        """
+        Return the cached payload of a request, building it on a miss.
+
+        :param endpoint: Endpoint path
+        :param params: Query params of the request (QueryDict or dict)
+        :param statuses: Order statuses the endpoint can return
+        :param build: Callable computing the payload
+        :return: (payload, hit)
+        """
+        key, data = self.lookup(endpoint, params, statuses)
+        if data is not None:
+            return data, True
+
+        data = build()
+        self.store(key, data)
+        return data, False
+
+    def lookup(
+        self, endpoint: str, params, statuses: Sequence[str]
+    ) -> Tuple[Optional[str], Any]:
+        """
+        Return the key of a request and its cached payload.
+
+        :param endpoint: Endpoint path
+        :param params: Query params of the request (QueryDict or dict)
+        :param statuses: Order statuses the endpoint can return
+        :return: (key, payload); the payload is None on a miss and the key is
+            None when the cache is unavailable
+        """
+        normalized = self._normalize_params(params)
+        version_keys = [
+            self._version_key(tag) for tag in self.entry_tags(statuses, params)
+        ]
+        try:
+            versions = self.cache.get_many(version_keys)
+            key = self._entry_key(
+                endpoint, normalized, [versions.get(k, 0) for k in version_keys]
+            )
+            data = self.cache.get(key)
+        except Exception as e:
+            print(f"Response cache unavailable for {endpoint}: {e}")
+            return None, None
+
+        self._count("misses" if data is None else "hits")
+        return key, data
+
+    def store(self, key: Optional[str], data) -> None:
+        """Cache the payload of a key returned by lookup()."""
+        if key is None:
+            return
+
+        try:
+            self.cache.set(key, data, self.timeout)
+        except Exception as e:
+            print(f"Response cache entry {key} not stored: {e}")
+
+    @staticmethod
+    def entry_tags(statuses: Sequence[str], params) -> List[str]:
+        """Tags an entry depends on: its statuses narrowed by the first filter."""
+        dimension = ""
+        for name in TAG_DIMENSIONS:
+            value = ResponseCache._tag_value(name, params.get(name))
+            if value:
+                dimension = f":{name}:{value}"
+                break
+
+        return [f"status:{status}{dimension}" for status in statuses]
+
+    @staticmethod
+    def _tag_value(name: str, value) -> Optional[str]:
+        """
+        Normalize a filter value the way order_tags writes it.
+
+        Ids become plain integers (``05`` -> ``5``) and days ISO dates, so
+        that an entry and the orders it contains share their tags. Invalid
+        values give None and the entry falls back to the status-only tags.
+        """
+        if not value:
+            return None
+
+        try:
+            if name == "date":
+                return parse_date(value).isoformat()
+            return str(int(value))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def order_tags(snapshot: OrderSnapshot) -> List[str]:
+        """Tags of every entry that can contain an order in this state."""
+        status, driver_id, block_id, day = snapshot
+        tags = [f"status:{status}"]
+        for name, value in zip(TAG_DIMENSIONS, (driver_id, block_id, day)):
+            if value is not None:
+                tags.append(f"status:{status}:{name}:{value}")
+        return tags
+
+    @staticmethod
+    def snapshot(order) -> OrderSnapshot:
+        """Capture the fields of an order that entries are tagged with."""
+        day = (
+            timezone.localdate(order.dispatch_date).isoformat()
+            if order.dispatch_date
+            else None
+        )
+        return order.status, order.driver_id, order.block_id, day
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Bump the version of each tag."""
+        try:
+            for tag in set(tags):
+                self._incr(self._version_key(tag))
+        except Exception as e:
+            # Entries of the tags are served until they expire
+            print(f"Response cache not invalidated: {e}")
+            return
+
+        self._count("invalidations")
+
+    def invalidate_orders(self, snapshots: Iterable[OrderSnapshot]) -> None:
+        """Invalidate the entries of orders, given their old and new snapshots."""
+        tags = [tag for snapshot in set(snapshots) for tag in self.order_tags(snapshot)]
+        if tags:
+            self.invalidate(tags)
+
+    def clear(self) -> None:
+        self.cache.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+            self._unflushed = dict.fromkeys(STATS_COUNTERS, 0)
+            self._next_flush = 0.0
+
+    def stats(self) -> dict:
+        """Return the counters of this process."""
+        return self._with_ratio({name: getattr(self, name) for name in STATS_COUNTERS})
+
+    def shared_stats(self) -> dict:
+        """
+        Return the counters summed over every process using the cache.
+
+        Each process adds its counts every stats_interval seconds, so the
+        latest counts of a process may be missing.
+        """
+        keys = {name: self._stats_key(name) for name in STATS_COUNTERS}
+        values = self.cache.get_many(list(keys.values()))
+        return self._with_ratio(
+            {name: values.get(key, 0) for name, key in keys.items()}
+        )
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+            self._unflushed[name] += 1
+
+            now = time.monotonic()
+            if now < self._next_flush:
+                return
+            self._next_flush = now + self.stats_interval
+            counts = self._unflushed
+            self._unflushed = dict.fromkeys(STATS_COUNTERS, 0)
+
+        try:
+            for name, count in counts.items():
+                if count:
+                    self._incr(self._stats_key(name), count)
+        except Exception as e:
+            print(f"Response cache counters not shared: {e}")
+
+    def _incr(self, key: str, delta: int = 1) -> None:
+        """Add delta to a counter without expiry, creating it if missing."""
+        try:
+            self.cache.incr(key, delta)
+        except ValueError:
+            if not self.cache.add(key, delta, timeout=None):
+                self.cache.incr(key, delta)
+
+    @staticmethod
+    def _with_ratio(counters: dict) -> dict:
+        lookups = counters["hits"] + counters["misses"]
+        return {**counters, "hitRatio": counters["hits"] / lookups if lookups else 0.0}
+
+    @staticmethod
+    def _normalize_params(params) -> List[Tuple[str, Tuple[str, ...]]]:
+        lists = params.lists() if hasattr(params, "lists") else params.items()
+        normalized = []
+        for name, values in lists:
+            values = values if isinstance(values, (list, tuple)) else [values]
+            values = tuple(sorted(v for v in values if v != ""))
+            if values:
+                normalized.append((name, values))
+        return sorted(normalized)
+
+    def _version_key(self, tag: str) -> str:
+        return f"{self.prefix}:v:{tag}"
+
+    def _stats_key(self, name: str) -> str:
+        return f"{self.prefix}:stats:{name}"
+
+    def _entry_key(self, endpoint: str, params, versions) -> str:
+        digest = hashlib.md5(repr((params, versions)).encode()).hexdigest()
+        return f"{self.prefix}:{endpoint}:{digest}"
+
+
+# Process-level cache shared by the read endpoints and the order service
+response_cache = ResponseCache()
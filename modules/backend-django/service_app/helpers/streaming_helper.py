@@ -0,0 +1,104 @@
+import json
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Union
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+# Rows fetched per query round trip while streaming, products prefetched per chunk
+STREAM_CHUNK_SIZE = 500
+
+# Blocks read per query while streaming, orders prefetched per page of blocks
+STREAM_BLOCK_PAGE_SIZE = 20
+
+# Items serialized before a chunk of bytes is handed to the server
+STREAM_FLUSH_ITEMS = 100
+
+
+def to_json(value) -> str:
+    """Encode a value the same way DRF's JSONRenderer does."""
+    return json.dumps(
+        value,
+        cls=JSONEncoder,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    )
+
+
+def json_array_chunks(items: Iterable[dict]) -> Iterator[str]:
+    """
+    Encode items as a JSON array, one chunk every STREAM_FLUSH_ITEMS items.
+
+    Only the current chunk is kept in memory, so the size of the array does
+    not change the memory used to encode it.
+    """
+    yield "["
+
+    buffer = []
+    separator = ""
+    for item in items:
+        buffer.append(separator + to_json(item))
+        separator = ","
+
+        if len(buffer) >= STREAM_FLUSH_ITEMS:
+            yield "".join(buffer)
+            buffer = []
+
+    if buffer:
+        yield "".join(buffer)
+
+    yield "]"
+
+
+async def async_json_array_chunks(items: AsyncIterable[dict]) -> AsyncIterator[str]:
+    """Same as json_array_chunks, for items produced by async ORM iteration."""
+    yield "["
+
+    buffer = []
+    separator = ""
+    async for item in items:
+        buffer.append(separator + to_json(item))
+        separator = ","
+
+        if len(buffer) >= STREAM_FLUSH_ITEMS:
+            yield "".join(buffer)
+            buffer = []
+
+    if buffer:
+        yield "".join(buffer)
+
+    yield "]"
+
+
+async def _async_encode(chunks: AsyncIterable[str]) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield chunk.encode("utf-8")
+
+
+def streaming_json_response(
+    chunks: Union[Iterable[str], AsyncIterable[str]],
+) -> StreamingHttpResponse:
+    """Wrap JSON text chunks, sync or async, in a streaming HTTP response."""
+    if hasattr(chunks, "__aiter__"):
+        content = _async_encode(chunks)
+    else:
+        content = (chunk.encode("utf-8") for chunk in chunks)
+
+    return StreamingHttpResponse(content, content_type="application/json")
+
+
+def is_async_streaming() -> bool:
+    """
+    Stream with async ORM iteration when served by ASGI.
+
+    The ASGI handler consumes an async body on the event loop, so a long
+    listing doesn't keep a thread busy; under WSGI it would be run through
+    async_to_sync, so the sync iterator is kept there.
+    """
+    return settings.SERVER_MODE == "asgi"
+
+
+def is_streaming_requested(request) -> bool:
+    """Streaming is enabled with `?stream=true`."""
+    return request.query_params.get("stream", "").lower() in ("1", "true")
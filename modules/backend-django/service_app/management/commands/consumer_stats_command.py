@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from ...helpers.redis_pool_helper import get_redis
+from ...services import redis_consumer_service
+from ...services.redis_consumer_service import GROUP, REDIS_URL, STREAM
+
+
+class Command(BaseCommand):
+    help = "Show the backlog of the Redis stream: length, group lag and pending entries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--prometheus",
+            action="store_true",
+            help="Print the backlog gauges in the Prometheus text format",
+        )
+
+    def handle(self, *args, **options):
+        r = get_redis(REDIS_URL)
+
+        if options["prometheus"]:
+            redis_consumer_service.update_stream_metrics(r)
+            for gauge in (
+                redis_consumer_service.STREAM_LENGTH,
+                redis_consumer_service.STREAM_LAG,
+                redis_consumer_service.PENDING_ENTRIES,
+                redis_consumer_service.OLDEST_PENDING_SECONDS,
+            ):
+                self.stdout.write("\n".join(gauge.render()))
+            return
+
+        stats = redis_consumer_service.read_stream_stats(r)
+        lag = "unknown (Redis < 7)" if stats["lag"] is None else stats["lag"]
+        oldest = stats["oldest_pending_idle_ms"]
+
+        self.stdout.write(f"Stream {STREAM}: {stats['length']} entries")
+        self.stdout.write(f"Group {GROUP}: lag {lag}, pending {stats['pending']}")
+        if oldest is not None:
+            self.stdout.write(f"Oldest pending entry idle for {oldest / 1000:.1f}s")
+
+        for name, pending, idle in stats["consumers"]:
+            self.stdout.write(
+                f"  consumer {name}: pending {pending}, idle {idle / 1000:.1f}s"
+            )
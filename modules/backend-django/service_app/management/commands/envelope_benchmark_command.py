@@ -0,0 +1,84 @@
+import json
+import re
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from ...helpers.envelope_helper import get_envelope_decoder, orjson
+
+
+def _regex_decode(raw: bytes):
+    """Previous consumer parsing path, kept as the benchmark baseline."""
+    match = re.search(r's:\d+:"(.*)";', raw.decode("utf-8"))
+    if not match:
+        return None
+
+    outer_json = json.loads(match.group(1))
+    body_json = json.loads(outer_json["body"])
+    payload = body_json.get("payload")
+
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+
+    return body_json.get("eventType"), payload
+
+
+def _sample_message(products: int) -> bytes:
+    body = json.dumps(
+        {
+            "eventType": "order.created",
+            "payload": {
+                "order_id": 1,
+                "block_id": 2,
+                "driver_id": 3,
+                "products": list(range(1, products + 1)),
+                "dispatch_date": "2025-08-12 10:00:00",
+            },
+        }
+    )
+    envelope = json.dumps(
+        {"body": body, "headers": {"type": "App\\Message\\EventMessage"}}
+    )
+    return f's:{len(envelope.encode("utf-8"))}:"{envelope}";'.encode("utf-8")
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark of the Redis envelope decoders against the regex parser"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=100000)
+        parser.add_argument(
+            "--products", type=int, default=10, help="Products per sample payload"
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        raw = _sample_message(options["products"])
+
+        candidates = {
+            "regex + json (previous)": _regex_decode,
+            "php decoder + json": get_envelope_decoder("php", loads=json.loads).decode,
+        }
+        if orjson is not None:
+            candidates["php decoder + orjson"] = get_envelope_decoder(
+                "php", loads=orjson.loads
+            ).decode
+
+        expected = _regex_decode(raw)
+        baseline = None
+
+        for name, decode in candidates.items():
+            if decode(raw) != expected:
+                self.stderr.write(self.style.ERROR(f"{name}: output differs"))
+                continue
+
+            seconds = min(
+                timeit.repeat(lambda: decode(raw), number=iterations, repeat=3)
+            )
+            per_message = seconds / iterations * 1_000_000
+            baseline = baseline or per_message
+
+            self.stdout.write(
+                f"{name:<26} {per_message:8.2f} us/msg "
+                f"{iterations / seconds:12.0f} msg/s  x{baseline / per_message:.2f}"
+            )
@@ -0,0 +1,71 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_URL = "http://localhost:8000/api/distribucion/bloques/"
+
+
+def _fetch(url: str, timeout: float) -> Tuple[float, Optional[int]]:
+    """Read a whole response; return its latency and status (None on error)."""
+    start = time.perf_counter()
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            while response.read(64 * 1024):
+                pass
+            code = response.status
+    except (URLError, OSError):
+        code = None
+    return time.perf_counter() - start, code
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent HTTP load test of one endpoint, to compare the server modes "
+        "(SERVER_MODE=wsgi / asgi) with the same workers"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default=DEFAULT_URL)
+        parser.add_argument(
+            "--concurrency", type=int, default=20, help="Clients sending requests"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Total requests to send"
+        )
+        parser.add_argument("--timeout", type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        url = options["url"]
+        total = options["requests"]
+        if total < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(
+                executor.map(lambda _: _fetch(url, options["timeout"]), range(total))
+            )
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(seconds * 1000 for seconds, code in results if code == 200)
+        errors = total - len(latencies)
+
+        self.stdout.write(
+            f"{url}\n"
+            f"requests {total}  concurrency {options['concurrency']}  "
+            f"errors {errors}\n"
+            f"elapsed {elapsed:.2f} s  throughput {total / elapsed:.1f} req/s"
+        )
+        if len(latencies) < 2:
+            raise CommandError("Not enough successful requests to report latencies")
+
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"latency ms  p50 {percentiles[49]:.1f}  p95 {percentiles[94]:.1f}  "
+            f"p99 {percentiles[98]:.1f}  max {latencies[-1]:.1f}"
+        )
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.order_summary_service import OrderSummaryService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the order summary tables from the orders, or check them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare the summary with the orders and report the differences",
+        )
+
+    def handle(self, *args, **options):
+        service = OrderSummaryService()
+
+        if not options["check"]:
+            groups = service.rebuild()
+            self.stdout.write(
+                self.style.SUCCESS(f"Order summary rebuilt with {groups} groups")
+            )
+            return
+
+        differences = service.check()
+        if not differences:
+            self.stdout.write(self.style.SUCCESS("Order summary is up to date"))
+            return
+
+        for key, (stored, actual) in sorted(differences.items(), key=str):
+            self.stdout.write(f"{self.describe(key)}: stored={stored} actual={actual}")
+        raise CommandError(f"Order summary is out of date ({len(differences)} groups)")
+
+    @staticmethod
+    def describe(key: tuple) -> str:
+        """Name a group of order_summary (driver, block, status) or order_day_summary."""
+        if len(key) == 2:
+            day, status = key
+            return f"day={day} status={status}"
+
+        driver_id, block_id, status = key
+        return f"driver={driver_id} block={block_id} status={status}"
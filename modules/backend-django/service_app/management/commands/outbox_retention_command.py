@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_q.models import Schedule
+
+from ...services.outbox_retention_service import (
+    OUTBOX_ARCHIVE_DIR,
+    OUTBOX_RETENTION_BATCH_SIZE,
+    OUTBOX_RETENTION_DAYS,
+    OutboxRetentionService,
+)
+
+SCHEDULE_NAME = "outbox-retention"
+
+
+class Command(BaseCommand):
+    help = "Archive to gzip JSONL and delete the redis_outbox rows older than the retention"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=OUTBOX_RETENTION_DAYS)
+        parser.add_argument(
+            "--batch-size", type=int, default=OUTBOX_RETENTION_BATCH_SIZE
+        )
+        parser.add_argument("--archive-dir", default=OUTBOX_ARCHIVE_DIR)
+        parser.add_argument(
+            "--no-archive",
+            action="store_true",
+            help="Delete the expired rows without archiving them",
+        )
+        parser.add_argument(
+            "--max-batches", type=int, help="Stop after this many batches"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only count the expired rows"
+        )
+        parser.add_argument(
+            "--schedule",
+            action="store_true",
+            help="Create or update a daily Django-Q schedule running the retention",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            Schedule.objects.update_or_create(
+                name=SCHEDULE_NAME,
+                defaults={
+                    "func": "service_app.tasks.purge_outbox_q",
+                    "schedule_type": Schedule.DAILY,
+                },
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Daily schedule '{SCHEDULE_NAME}' saved")
+            )
+            return
+
+        try:
+            service = OutboxRetentionService(
+                retention_days=options["days"],
+                batch_size=options["batch_size"],
+                archive_dir=None if options["no_archive"] else options["archive_dir"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        cutoff = service.cutoff()
+        if options["dry_run"]:
+            expired = service.count_expired(cutoff)
+            self.stdout.write(f"{expired} outbox rows created before {cutoff}")
+            return
+
+        result = service.purge(cutoff, max_batches=options["max_batches"])
+        message = f"Deleted {result['deleted']} outbox rows created before {cutoff}"
+        if result["archive"]:
+            message += f", archived to {result['archive']}"
+        self.stdout.write(self.style.SUCCESS(message))
@@ -1,11 +1,46 @@
 from django.core.management.base import BaseCommand
 
-from ...services.redis_consumer_service import run
+from ...services.consumer_pool_service import ConsumerPool
+from ...services.redis_consumer_service import CONSUMER_NAME, METRICS_PORT, run
 
 
 class Command(BaseCommand):
     help = "Run Redis Stream consumer with consumer group"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of consumer processes to run under a supervisor (default: 1)",
+        )
+        parser.add_argument(
+            "--consumer-name",
+            default=CONSUMER_NAME,
+            help="Consumer name, used as prefix of the worker names in supervisor mode",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=METRICS_PORT,
+            help="Port of the Prometheus metrics (worker N uses port + N - 1, 0: disabled)",
+        )
+
     def handle(self, *args, **options):
+        workers = options["workers"]
+        consumer_name = options["consumer_name"]
+        metrics_port = options["metrics_port"]
+
+        if workers > 1:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Starting Redis consumer pool with {workers} workers..."
+                )
+            )
+            ConsumerPool(
+                workers, consumer_prefix=consumer_name, metrics_port=metrics_port
+            ).run()
+            return
+
         self.stdout.write(self.style.SUCCESS("Starting Redis consumer..."))
-        run()
+        run(consumer_name=consumer_name, metrics_port=metrics_port)
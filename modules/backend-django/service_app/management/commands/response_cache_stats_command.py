@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from ...helpers.response_cache_helper import response_cache
+
+
+class Command(BaseCommand):
+    help = "Show the hit ratio of the response cache, summed over the web workers"
+
+    def handle(self, *args, **options):
+        stats = response_cache.shared_stats()
+
+        self.stdout.write(
+            f"Response cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"(hit ratio {stats['hitRatio']:.1%})"
+        )
+        self.stdout.write(f"Invalidations: {stats['invalidations']}")
+        self.stdout.write(
+            f"Counts are shared every {response_cache.stats_interval:g}s per process"
+        )
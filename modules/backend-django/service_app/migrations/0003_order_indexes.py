@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service_app", "0002_redisoutbox"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "dispatch_date", "id"],
+                name="order_status_dispatch_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["driver", "status", "dispatch_date"],
+                name="order_driver_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["block", "status", "dispatch_date"],
+                name="order_block_status_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service_app", "0003_order_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "updated_at"], name="order_status_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["dispatch_date", "id"], name="order_dispatch_idx"
+            ),
+        ),
+    ]
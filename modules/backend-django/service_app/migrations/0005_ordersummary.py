@@ -0,0 +1,100 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service_app", "0004_order_dispatch_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("driver_id", models.PositiveBigIntegerField(default=0)),
+                ("block_id", models.PositiveBigIntegerField(default=0)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("COMPLETED", "Completed"),
+                            ("PENDING", "Pending"),
+                            ("REJECTED", "Rejected"),
+                            ("DELIVERED", "Delivered"),
+                            ("READY_TO_SHIP", "Ready to ship"),
+                            ("IN_DISPATCH", "In dispatch"),
+                            ("APPROVED", "Approved"),
+                            ("READY_TO_DELIVER", "Ready to deliver"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("total", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "order_summary",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "block_id"], name="order_summary_status_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("driver_id", "block_id", "status"),
+                        name="order_summary_group_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="OrderDaySummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("COMPLETED", "Completed"),
+                            ("PENDING", "Pending"),
+                            ("REJECTED", "Rejected"),
+                            ("DELIVERED", "Delivered"),
+                            ("READY_TO_SHIP", "Ready to ship"),
+                            ("IN_DISPATCH", "In dispatch"),
+                            ("APPROVED", "Approved"),
+                            ("READY_TO_DELIVER", "Ready to deliver"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("total", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "order_day_summary",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "status"), name="order_day_summary_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service_app", "0005_ordersummary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="redisoutbox",
+            index=models.Index(fields=["created_at"], name="redis_outbox_created_idx"),
+        ),
+    ]
@@ -114,6 +114,28 @@ class Order(TimeStampedModel):
 
     class Meta:
         db_table = "order"
+        indexes = [
+            # Process endpoints: status filter sorted by (dispatch_date, id)
+            models.Index(
+                fields=["status", "dispatch_date", "id"],
+                name="order_status_dispatch_idx",
+            ),
+            models.Index(
+                fields=["driver", "status", "dispatch_date"],
+                name="order_driver_status_idx",
+            ),
+            models.Index(
+                fields=["block", "status", "dispatch_date"],
+                name="order_block_status_idx",
+            ),
+            # Validators of streamed listings: MAX(updated_at) per status
+            models.Index(
+                fields=["status", "updated_at"],
+                name="order_status_updated_idx",
+            ),
+            # Dashboard map points and unfiltered listings by (dispatch_date, id)
+            models.Index(fields=["dispatch_date", "id"], name="order_dispatch_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.code}"
@@ -131,3 +153,67 @@ class RedisOutbox(TimeStampedModel):
 
     class Meta:
         db_table = "redis_outbox"
+        indexes = [
+            # Retention: finds the rows older than the cutoff
+            models.Index(fields=["created_at"], name="redis_outbox_created_idx"),
+        ]
+
+
+class OrderSummary(models.Model):
+    """
+    Number of orders per (driver, block, status), maintained incrementally.
+
+    Updated by OrderService in the same transaction as the orders, and rebuilt
+    or checked with ``order_summary_command``. Orders without a driver or
+    block are counted under id 0, so the unique constraint covers them too.
+    """
+
+    driver_id = models.PositiveBigIntegerField(default=0)
+    block_id = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=32, choices=OrderStatus.choices)
+    total = models.IntegerField(default=0)
+
+    objects = models.Manager()
+
+    class Meta:
+        db_table = "order_summary"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["driver_id", "block_id", "status"],
+                name="order_summary_group_uniq",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["status", "block_id"], name="order_summary_status_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.driver_id}/{self.block_id}/{self.status}: {self.total}"
+
+
+class OrderDaySummary(models.Model):
+    """
+    Number of orders per (dispatch day, status), maintained with OrderSummary.
+
+    The day is the local date of dispatch_date; orders without a dispatch date
+    are not counted.
+    """
+
+    day = models.DateField()
+    status = models.CharField(max_length=32, choices=OrderStatus.choices)
+    total = models.IntegerField(default=0)
+
+    objects = models.Manager()
+
+    class Meta:
+        db_table = "order_day_summary"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "status"], name="order_day_summary_uniq"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day}/{self.status}: {self.total}"
@@ -0,0 +1,213 @@
+import base64
+import json
+from typing import AsyncIterator, Iterator, Optional, Tuple
+from urllib import parse
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def get_page_slice(
+    request,
+    page_size: int = settings.REST_FRAMEWORK["PAGE_SIZE"],
+    max_page_size: int = 500,
+) -> Optional[slice]:
+    """
+    Slice of the ``page`` / ``page_size`` query params, for short listings
+    paged by offset (groups, blocks).
+
+    :param request: DRF request
+    :param page_size: Page size when ``page_size`` is not given
+    :param max_page_size: Upper bound of ``page_size``
+    :return: The slice of the page, or None when no page was requested
+    :raises NotFound: If the page is not a positive integer
+    """
+    params = request.query_params
+    if "page" not in params and "page_size" not in params:
+        return None
+
+    try:
+        page = int(params.get("page", 1))
+    except ValueError:
+        raise NotFound("Invalid page.")
+    if page < 1:
+        raise NotFound("Invalid page.")
+
+    try:
+        page_size = min(max(int(params["page_size"]), 1), max_page_size)
+    except (KeyError, ValueError):
+        pass
+
+    start = (page - 1) * page_size
+    return slice(start, start + page_size)
+
+
+def after_keyset(dispatch_date, pk: int) -> Q:
+    """
+    Orders that sort after (dispatch_date, pk), NULL dates first.
+
+    :param dispatch_date: Dispatch date of the last order read, or None
+    :param pk: Id of the last order read
+    :return: Filter of the orders that come next
+    """
+    if dispatch_date is None:
+        return Q(dispatch_date__isnull=True, id__gt=pk) | Q(dispatch_date__isnull=False)
+
+    return Q(dispatch_date__gt=dispatch_date) | Q(
+        dispatch_date=dispatch_date, id__gt=pk
+    )
+
+
+def iterate_by_keyset(queryset, chunk_size: int) -> Iterator:
+    """
+    Iterate orders sorted by ``(dispatch_date, id)``, one query per chunk.
+
+    Every chunk is a LIMIT query that starts after the last order of the
+    previous one, so only a chunk is held in client memory even when the
+    driver buffers the whole result set of a query (mysqlclient does), and
+    prefetches run per chunk.
+
+    :param queryset: Orders to iterate
+    :param chunk_size: Orders read per query
+    :return: Iterator over the orders
+    """
+    queryset = queryset.order_by("dispatch_date", "id")
+    position = None
+    while True:
+        chunk = (
+            queryset if position is None else queryset.filter(after_keyset(*position))
+        )
+        orders = list(chunk[:chunk_size])
+        yield from orders
+
+        if len(orders) < chunk_size:
+            return
+        position = orders[-1].dispatch_date, orders[-1].id
+
+
+async def aiterate_by_keyset(queryset, chunk_size: int) -> AsyncIterator:
+    """Same as iterate_by_keyset, with async ORM queries."""
+    queryset = queryset.order_by("dispatch_date", "id")
+    position = None
+    while True:
+        chunk = (
+            queryset if position is None else queryset.filter(after_keyset(*position))
+        )
+        orders = [order async for order in chunk[:chunk_size]]
+        for order in orders:
+            yield order
+
+        if len(orders) < chunk_size:
+            return
+        position = orders[-1].dispatch_date, orders[-1].id
+
+
+class OrderKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over orders sorted by ``(dispatch_date, id)``.
+
+    The cursor holds the sort key of the last order of the page, and the next
+    page is read with ``WHERE (dispatch_date, id) > cursor``. Every page costs
+    the same no matter how deep it is or how big the table is. Orders without
+    a dispatch_date come first, matching how MySQL sorts NULLs in ascending
+    order.
+    """
+
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(after_keyset(*position))
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        return self.page
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+
+        last = self.page[-1]
+        dispatch_date = last.dispatch_date.isoformat() if last.dispatch_date else None
+        url = self.request.build_absolute_uri()
+
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(dispatch_date, last.id)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor de paginación devuelto en `next`",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cantidad de resultados por página",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    @staticmethod
+    def encode_cursor(dispatch_date: Optional[str], pk: int) -> str:
+        raw = json.dumps([dispatch_date, pk]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    def decode_cursor(self, request) -> Optional[Tuple]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(parse.unquote(encoded).encode("ascii"))
+            dispatch_date, pk = json.loads(raw)
+            pk = int(pk)
+            if dispatch_date is not None:
+                dispatch_date = parse_datetime(dispatch_date)
+                if dispatch_date is None:
+                    raise ValueError(dispatch_date)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return dispatch_date, pk
@@ -24,14 +24,17 @@ class OrderRepository:
         return Order.objects.create(**order_data)
 
     @staticmethod
-    def get_order_by_id(order_id: int) -> Optional[Order]:
+    def get_order_by_id(order_id: int, for_update: bool = False) -> Optional[Order]:
         """
         Retrieve an order by its ID.
 
         Args:
             order_id: The ID of the order to retrieve
+            for_update: Lock the row with SELECT ... FOR UPDATE until the end
+                of the current transaction
 
         Returns:
             Optional[Order]: The Order instance if found, None otherwise
         """
-        return Order.objects.get(id=order_id)
+        queryset = Order.objects.select_for_update() if for_update else Order.objects
+        return queryset.filter(id=order_id).first()
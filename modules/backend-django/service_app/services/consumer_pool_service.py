@@ -0,0 +1,127 @@
+import multiprocessing
+import signal
+import socket
+import time
+from typing import Callable, Dict, Optional
+
+from django.db import connections
+
+from . import redis_consumer_service
+
+
+def _worker_main(consumer_name: str, metrics_port: int) -> None:
+    """Entry point of a forked consumer process."""
+    # The supervisor owns Ctrl+C; workers only react to SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(
+        signal.SIGTERM, lambda signum, frame: redis_consumer_service.request_stop()
+    )
+
+    redis_consumer_service.run(consumer_name=consumer_name, metrics_port=metrics_port)
+
+
+class ConsumerPool:
+    """
+    Supervisor that runs N Redis stream consumers as separate processes.
+
+    Every worker joins the same consumer group under its own consumer name, so
+    Redis balances the stream entries between them. Crashed workers are
+    restarted, and SIGTERM/SIGINT stop the whole pool gracefully.
+
+    The target of the workers is called as ``target(consumer_name,
+    metrics_port)``; it defaults to the Redis consumer.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        consumer_prefix: str = redis_consumer_service.CONSUMER_NAME,
+        restart_delay: float = 1.0,
+        shutdown_timeout: float = 30.0,
+        metrics_port: int = redis_consumer_service.METRICS_PORT,
+        target: Callable[[str, int], None] = _worker_main,
+        poll_interval: float = 1.0,
+    ):
+        self.workers = workers
+        self.consumer_prefix = consumer_prefix
+        self.hostname = socket.gethostname()
+        self.metrics_port = metrics_port
+        self.restart_delay = restart_delay
+        self.shutdown_timeout = shutdown_timeout
+        self.target = target
+        self.poll_interval = poll_interval
+        self._context = multiprocessing.get_context("fork")
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._stopping = False
+
+    def consumer_name(self, index: int) -> str:
+        """
+        Build the consumer name of a worker slot.
+
+        Names are stable per slot, so a restarted worker takes over the same
+        consumer in the group instead of leaving an orphan behind, and start
+        with the hostname, so pools on several hosts never share a consumer.
+        """
+        return f"{self.hostname}-{self.consumer_prefix}-{index}"
+
+    def metrics_port_of(self, index: int) -> int:
+        """Metrics port of a worker slot: one per worker, 0 when disabled."""
+        if self.metrics_port <= 0:
+            return 0
+        return self.metrics_port + index - 1
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        for index in range(1, self.workers + 1):
+            self._spawn(index)
+
+        while not self._stopping:
+            for index, process in list(self._processes.items()):
+                if process.is_alive() or self._stopping:
+                    continue
+
+                print(
+                    f"Consumer {self.consumer_name(index)} exited with code "
+                    f"{process.exitcode}, restarting..."
+                )
+                time.sleep(self.restart_delay)
+                self._spawn(index)
+
+            time.sleep(self.poll_interval)
+
+        self._shutdown()
+
+    def _spawn(self, index: int) -> None:
+        # Forked children must not share the parent's DB sockets
+        connections.close_all()
+
+        name = self.consumer_name(index)
+        process = self._context.Process(
+            target=self.target, args=(name, self.metrics_port_of(index)), name=name
+        )
+        process.start()
+        self._processes[index] = process
+
+        print(f"Started consumer {name} (pid {process.pid})")
+
+    def _handle_signal(self, signum: int, frame: Optional[object]) -> None:
+        print(f"Received signal {signum}, stopping consumers...")
+        self._stopping = True
+
+    def _shutdown(self) -> None:
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in self._processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+
+            if process.is_alive():
+                print(f"Consumer {process.name} did not stop in time, killing it")
+                process.kill()
+                process.join()
+
+        print("All consumers stopped")
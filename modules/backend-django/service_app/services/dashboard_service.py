@@ -0,0 +1,140 @@
+import os
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..helpers.date_range_helper import start_of_day
+from ..models import Block, Order, OrderStatus
+from .order_summary_service import OrderSummaryService
+
+DASHBOARD_MAX_POINTS = int(os.getenv("DASHBOARD_MAX_POINTS", 500))
+DASHBOARD_DAYS = int(os.getenv("DASHBOARD_DAYS", 30))
+
+# Fields of the map points, as returned by OrderDashboardSerializer
+POINT_FIELDS = ("status", "destination", "code", "latitude", "longitude")
+
+# (west, south, east, north) in degrees
+BoundingBox = Tuple[float, float, float, float]
+
+
+class DashboardService:
+    """
+    Service class for the dashboard summary.
+
+    Every figure is an aggregate computed by the database, and the map points
+    are limited to the visible bounding box and to a maximum count, so the
+    cost of the dashboard follows the screen instead of the table size. With
+    settings.ORDER_SUMMARY_READS the counts come from the order_summary table.
+    """
+
+    # Statuses of the blocks counted in countBlocks
+    BLOCK_STATUSES = (OrderStatus.COMPLETED, OrderStatus.APPROVED)
+
+    def __init__(self, summary_service: OrderSummaryService = None):
+        self.summary_service = summary_service or OrderSummaryService()
+
+    @property
+    def use_summary(self) -> bool:
+        return settings.ORDER_SUMMARY_READS
+
+    def count_blocks(self) -> int:
+        """Count the blocks having COMPLETED or APPROVED orders."""
+        if self.use_summary:
+            return self.summary_service.count_blocks(self.BLOCK_STATUSES)
+
+        return (
+            Order.objects.filter(
+                status__in=self.BLOCK_STATUSES,
+                block__isnull=False,
+            )
+            .order_by()
+            .values("block_id")
+            .distinct()
+            .count()
+        )
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Count the orders of each status, including the empty ones."""
+        if self.use_summary:
+            return self.summary_service.count_by_status()
+
+        counts = dict.fromkeys(OrderStatus.values, 0)
+        rows = Order.objects.order_by().values("status").annotate(total=Count("id"))
+        for row in rows:
+            counts[row["status"]] = row["total"]
+        return counts
+
+    def count_by_block(self) -> List[dict]:
+        """Count the orders of each block, largest first."""
+        if self.use_summary:
+            totals = self.summary_service.count_by_block()
+        else:
+            rows = (
+                Order.objects.filter(block__isnull=False)
+                .order_by()
+                .values("block_id")
+                .annotate(total=Count("id"))
+            )
+            totals = {row["block_id"]: row["total"] for row in rows}
+
+        names = Block.objects.in_bulk(list(totals))
+        ordered = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+        return [
+            {"blockId": block_id, "blockName": names[block_id].name, "total": total}
+            for block_id, total in ordered
+            if block_id in names
+        ]
+
+    def count_by_day(self, days: int = DASHBOARD_DAYS) -> List[dict]:
+        """Count the orders dispatched on each of the last days."""
+        first_day = timezone.localdate() - timedelta(days=days - 1)
+        if self.use_summary:
+            return self.summary_service.count_by_day(first_day)
+
+        rows = (
+            Order.objects.filter(dispatch_date__gte=start_of_day(first_day))
+            .order_by()
+            .annotate(day=TruncDate("dispatch_date"))
+            .values("day")
+            .annotate(total=Count("id"))
+            .order_by("day")
+        )
+        return [{"day": row["day"], "total": row["total"]} for row in rows]
+
+    @staticmethod
+    def get_points(
+        bbox: Optional[BoundingBox] = None, limit: int = DASHBOARD_MAX_POINTS
+    ) -> Tuple[List[Order], bool]:
+        """
+        Return the latest orders inside a bounding box, at most ``limit``.
+
+        Args:
+            bbox: (west, south, east, north) of the visible map, or None for all
+            limit: Maximum number of points
+
+        Returns:
+            Tuple[List[Order], bool]: The orders and whether more were left out
+        """
+        points = list(DashboardService.points_queryset(bbox)[: limit + 1])
+        return points[:limit], len(points) > limit
+
+    @staticmethod
+    def points_queryset(bbox: Optional[BoundingBox] = None):
+        """Orders inside a bounding box, latest first (order_dispatch_idx)."""
+        queryset = Order.objects.only(*POINT_FIELDS)
+
+        if bbox is not None:
+            west, south, east, north = bbox
+            queryset = queryset.filter(
+                latitude__gte=south,
+                latitude__lte=north,
+                longitude__gte=west,
+                longitude__lte=east,
+            )
+
+        return queryset.order_by("-dispatch_date", "-id")
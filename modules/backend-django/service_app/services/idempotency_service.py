@@ -0,0 +1,149 @@
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Set
+
+import redis
+
+from ..helpers.redis_pool_helper import get_redis
+
+RECENT_IDS_FILTER = os.getenv("REDIS_RECENT_IDS_FILTER", "memory")
+RECENT_IDS_SIZE = int(os.getenv("REDIS_RECENT_IDS_SIZE", 100000))
+BLOOM_KEY = os.getenv("REDIS_BLOOM_KEY", "events_stream:recent_ids")
+BLOOM_BITS = int(os.getenv("REDIS_BLOOM_BITS", 2**24))
+BLOOM_HASHES = int(os.getenv("REDIS_BLOOM_HASHES", 5))
+BLOOM_WINDOW = int(os.getenv("REDIS_BLOOM_WINDOW", 3600))
+
+
+class RecentIdsFilter(ABC):
+    """
+    Filter of recently processed event IDs, checked before the database.
+
+    ``exact`` filters only answer True for IDs they stored, so those events can
+    be skipped right away. Probabilistic filters can return false positives,
+    so their positive answers must still be confirmed against the outbox.
+    """
+
+    exact = True
+
+    @abstractmethod
+    def seen(self, event_ids: List[str]) -> Set[str]:
+        """Return the IDs that (may) have been processed already."""
+
+    @abstractmethod
+    def add(self, event_ids: Iterable[str]) -> None:
+        """Record IDs whose events were committed."""
+
+
+class MemoryRecentIdsFilter(RecentIdsFilter):
+    """Exact, bounded LRU set of the IDs processed by this consumer process."""
+
+    def __init__(self, maxsize: int = RECENT_IDS_SIZE):
+        self.maxsize = maxsize
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, event_ids: List[str]) -> Set[str]:
+        with self._lock:
+            return {event_id for event_id in event_ids if event_id in self._ids}
+
+    def add(self, event_ids: Iterable[str]) -> None:
+        with self._lock:
+            for event_id in event_ids:
+                self._ids[event_id] = None
+                self._ids.move_to_end(event_id)
+
+            while len(self._ids) > self.maxsize:
+                self._ids.popitem(last=False)
+
+
+class RedisBloomFilter(RecentIdsFilter):
+    """
+    Bloom filter on Redis bitmaps, shared by every consumer of the group.
+
+    IDs are written to the bitmap of the current time window and looked up in
+    the current and previous windows. Old bitmaps expire, so the filter only
+    covers recent IDs and its false positive rate stays bounded.
+    """
+
+    exact = False
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        key: str = BLOOM_KEY,
+        bits: int = BLOOM_BITS,
+        hashes: int = BLOOM_HASHES,
+        window: int = BLOOM_WINDOW,
+    ):
+        self.client = client
+        self.key = key
+        self.bits = bits
+        self.hashes = hashes
+        self.window = window
+
+    def _offsets(self, event_id: str) -> List[int]:
+        # Double hashing: k offsets from the two halves of one digest
+        digest = hashlib.blake2b(event_id.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def _keys(self) -> List[str]:
+        current = int(time.time()) // self.window
+        return [f"{self.key}:{current}", f"{self.key}:{current - 1}"]
+
+    def seen(self, event_ids: List[str]) -> Set[str]:
+        if not event_ids:
+            return set()
+
+        keys = self._keys()
+        pipe = self.client.pipeline(transaction=False)
+        for event_id in event_ids:
+            for key in keys:
+                for offset in self._offsets(event_id):
+                    pipe.getbit(key, offset)
+        bits = iter(pipe.execute())
+
+        found = set()
+        for event_id in event_ids:
+            windows = [[next(bits) for _ in range(self.hashes)] for _ in keys]
+            if any(all(window) for window in windows):
+                found.add(event_id)
+
+        return found
+
+    def add(self, event_ids: Iterable[str]) -> None:
+        key = self._keys()[0]
+        pipe = self.client.pipeline(transaction=False)
+        for event_id in event_ids:
+            for offset in self._offsets(event_id):
+                pipe.setbit(key, offset, 1)
+        pipe.expire(key, self.window * 2)
+        pipe.execute()
+
+
+def build_recent_ids_filter(
+    kind: str = RECENT_IDS_FILTER, redis_url: Optional[str] = None
+) -> Optional[RecentIdsFilter]:
+    """
+    Build the recent-IDs filter configured with REDIS_RECENT_IDS_FILTER.
+
+    :param kind: "memory", "redis" or "none"
+    :param redis_url: Redis URL, required by the "redis" filter
+    :return: Filter instance, or None when disabled
+    :rtype: Optional[RecentIdsFilter]
+    """
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return MemoryRecentIdsFilter()
+    if kind == "redis":
+        return RedisBloomFilter(get_redis(redis_url))
+
+    raise ValueError(
+        f"Unknown recent IDs filter '{kind}', expected memory, redis or none"
+    )
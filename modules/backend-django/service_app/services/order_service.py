@@ -1,12 +1,20 @@
 from datetime import datetime
+from typing import Dict, Iterable, List
 
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.timezone import make_aware
 
 from ..dto.order_model_dto import OrderDTO
 from ..helpers.dto_helper import order_to_dto
-from ..helpers.number_helper import generate_random_code
-from ..models import Block, Driver, OrderStatus, Product
+from ..helpers.identity_cache_helper import IdentityCache, identity_cache
+from ..helpers.number_helper import generate_order_code
+from ..helpers.response_cache_helper import ResponseCache
+from ..helpers.response_cache_helper import response_cache as default_response_cache
+from ..models import Block, Driver, Order, OrderStatus, Product
 from ..repositories.order_repository import OrderRepository
+from .order_summary_service import OrderSummaryService, summary_key
 
 
 class OrderService:
@@ -14,9 +22,19 @@ class OrderService:
     Service class for handling order-related business logic.
     """
 
-    def __init__(self, order_repository: OrderRepository = None):
+    def __init__(
+        self,
+        order_repository: OrderRepository = None,
+        cache: IdentityCache = None,
+        response_cache: ResponseCache = None,
+        summary_service: OrderSummaryService = None,
+    ):
         self.order_repository = order_repository or OrderRepository()
+        self.cache = cache or identity_cache
+        self.response_cache = response_cache or default_response_cache
+        self.summary_service = summary_service or OrderSummaryService()
 
+    @transaction.atomic
     def create_or_update_order(self, payload: dict) -> OrderDTO:
         """
         Create a new order with the provided payload.
@@ -40,79 +58,354 @@ class OrderService:
             block = self._get_or_create_block(payload["block_id"])
             products = self._get_or_create_products(payload["products"])
 
-            # Parse dispatch_date to datetime
-            dispatch_date = datetime.strptime(
-                payload["dispatch_date"], "%Y-%m-%d %H:%M:%S"
+            # Create order data
+            order_data = self._build_order_data(payload["order_id"], driver, block)
+            order_data["dispatch_date"] = self._parse_dispatch_date(
+                payload["dispatch_date"]
             )
 
-            # Create order data
-            order_data = {
-                "code": generate_random_code(),
-                "driver": driver,
-                "block": block,
-                "status": OrderStatus.APPROVED,
-                "dispatch_date": make_aware(dispatch_date),
-                "origin": "Bodega Central",
-                "destination": "Supermercado La Estrella",
-                "user": "operador1",
-                "latitude": "19.432608",
-                "longitude": "-99.133209",
-                "volume": "0.50",
-                "weight": "30.00",
-                "incidents": None,
-                "number_of_bags": 2,
-            }
-
-            # Get or create order based on order_id
-            order = self.order_repository.get_order_by_id(payload["order_id"])
+            # Get or create order based on order_id, locked so that the
+            # summary snapshot below cannot be changed by a concurrent writer
+            order = self.order_repository.get_order_by_id(
+                payload["order_id"], for_update=True
+            )
+            snapshots = []
+            summary_before = []
 
             if order:
+                snapshots.append(self.response_cache.snapshot(order))
+                summary_before.append(summary_key(order))
                 order.driver = order_data["driver"]
                 order.block = order_data["block"]
                 order.status = order_data["status"]
                 order.dispatch_date = order_data["dispatch_date"]
             else:
+                order_data["code"] = self._free_codes([order_data["code"]])[0]
                 order = self.order_repository.create_order(order_data)
 
             # Set products for the order and save
             order.products.set(products)
             order.save()
 
+            self.summary_service.apply_changes(summary_before, [summary_key(order)])
+            snapshots.append(self.response_cache.snapshot(order))
+            self._invalidate_responses_on_commit(snapshots)
+
             return order_to_dto(order)
         except Exception as e:
             raise ValueError(f"Failed to create order: {str(e)}")
 
+    @transaction.atomic
+    def upsert_orders(self, payloads: List[dict]) -> List[Order]:
+        """
+        Create or update a batch of orders with a fixed number of queries.
+
+        Drivers, blocks and products of the whole batch are resolved with
+        ``in_bulk`` and the missing ones are inserted with
+        ``bulk_create(ignore_conflicts=True)``. Orders are written with one
+        ``bulk_create`` and one ``bulk_update``, and the order/product rows of
+        the M2M through table are synced in bulk.
+
+        Args:
+            payloads: List of order payloads, same format as create_or_update_order.
+                When an order appears several times, the last payload wins.
+
+        Returns:
+            List[Order]: The created or updated orders, one per distinct order_id
+        """
+        try:
+            payload_by_order: Dict[int, dict] = {}
+            for payload in payloads:
+                payload_by_order[int(payload["order_id"])] = payload
+
+            drivers = self._bulk_get_or_create_drivers(
+                p["driver_id"] for p in payload_by_order.values()
+            )
+            blocks = self._bulk_get_or_create_blocks(
+                p["block_id"] for p in payload_by_order.values()
+            )
+            products = self._bulk_get_or_create_products(
+                product_id
+                for p in payload_by_order.values()
+                for product_id in p["products"]
+            )
+
+            # Locked in id order: the snapshots below must not go stale
+            # before the summary deltas are applied
+            existing = (
+                Order.objects.select_for_update()
+                .order_by("pk")
+                .in_bulk(list(payload_by_order))
+            )
+            to_create: List[Order] = []
+            to_update: List[Order] = []
+            snapshots = [self.response_cache.snapshot(o) for o in existing.values()]
+            summary_before = [summary_key(o) for o in existing.values()]
+            now = timezone.now()
+
+            for order_id, payload in payload_by_order.items():
+                driver = drivers[int(payload["driver_id"])]
+                block = blocks[int(payload["block_id"])]
+                dispatch_date = self._parse_dispatch_date(payload["dispatch_date"])
+
+                order = existing.get(order_id)
+                if order is None:
+                    order_data = self._build_order_data(order_id, driver, block)
+                    order_data["dispatch_date"] = dispatch_date
+                    to_create.append(Order(**order_data))
+                    continue
+
+                order.driver = driver
+                order.block = block
+                order.status = OrderStatus.APPROVED
+                order.dispatch_date = dispatch_date
+                order.updated_at = now
+                to_update.append(order)
+
+            codes = self._free_codes([order.code for order in to_create])
+            for order, code in zip(to_create, codes):
+                order.code = code
+            Order.objects.bulk_create(to_create)
+            Order.objects.bulk_update(
+                to_update, ["driver", "block", "status", "dispatch_date", "updated_at"]
+            )
+
+            self._bulk_set_products(
+                {
+                    order_id: {products[int(pid)].id for pid in payload["products"]}
+                    for order_id, payload in payload_by_order.items()
+                }
+            )
+
+            orders = {order.id: order for order in to_create + to_update}
+            self.summary_service.apply_changes(
+                summary_before, [summary_key(o) for o in orders.values()]
+            )
+            snapshots += [self.response_cache.snapshot(o) for o in orders.values()]
+            self._invalidate_responses_on_commit(snapshots)
+
+            return [orders[order_id] for order_id in payload_by_order]
+        except Exception as e:
+            raise ValueError(f"Failed to upsert orders: {str(e)}")
+
     @staticmethod
-    def _get_or_create_driver(driver_id: int) -> Driver:
-        """Get or create a driver with the given ID."""
-        return Driver.objects.get_or_create(
-            id=driver_id,
-            defaults={
-                "first_name": "Unknown",
-                "last_name": "Driver",
-                "license_plate": "UNKNOWN",
-                "date_of_birth": "2000-01-01",
-            },
-        )[0]
+    def _free_codes(codes: List[str]) -> List[str]:
+        """
+        Replace the codes already taken by other orders with free ones.
+
+        Generated codes only clash with codes written by other means (manual
+        edits, imports), so the common case costs one query. A taken code gets
+        the first free ``-N`` suffix.
+
+        Args:
+            codes: Codes of the orders about to be created
+
+        Returns:
+            List[str]: The codes to use, in the same order
+        """
+        if not codes:
+            return []
+
+        taken = set(Order.objects.filter(code__in=codes).values_list("code", flat=True))
+        free = []
+        for code in codes:
+            candidate, suffix = code, 0
+            while candidate in taken or (
+                suffix and Order.objects.filter(code=candidate).exists()
+            ):
+                suffix += 1
+                candidate = f"{code}-{suffix}"
+            taken.add(candidate)
+            free.append(candidate)
+        return free
 
     @staticmethod
-    def _get_or_create_block(block_id: int) -> Block:
-        """Get or create a block with the given ID."""
-        return Block.objects.get_or_create(
-            id=block_id,
-            defaults={"name": f"Block-{block_id}", "description": "Auto-created block"},
-        )[0]
+    def _build_order_data(order_id: int, driver: Driver, block: Block) -> dict:
+        """Build the attributes of an order created from an event."""
+        return {
+            "id": order_id,
+            "code": generate_order_code(order_id),
+            "driver": driver,
+            "block": block,
+            "status": OrderStatus.APPROVED,
+            "origin": "Bodega Central",
+            "destination": "Supermercado La Estrella",
+            "user": "operador1",
+            "latitude": "19.432608",
+            "longitude": "-99.133209",
+            "volume": "0.50",
+            "weight": "30.00",
+            "incidents": None,
+            "number_of_bags": 2,
+        }
 
     @staticmethod
-    def _get_or_create_products(product_ids: list[int]) -> list[Product]:
+    def _parse_dispatch_date(value: str) -> datetime:
+        """Parse an event dispatch_date ('YYYY-MM-DD HH:MM:SS') to an aware datetime."""
+        return make_aware(datetime.strptime(value, "%Y-%m-%d %H:%M:%S"))
+
+    def _get_or_create_driver(self, driver_id: int) -> Driver:
+        """Get or create a driver with the given ID."""
+        return self._get_or_create_cached(Driver, [driver_id], self._driver_defaults)[0]
+
+    def _get_or_create_block(self, block_id: int) -> Block:
+        """Get or create a block with the given ID."""
+        return self._get_or_create_cached(Block, [block_id], self._block_defaults)[0]
+
+    def _get_or_create_products(self, product_ids: list[int]) -> list[Product]:
         """Get or create products with the given IDs."""
-        products = []
+        return self._get_or_create_cached(Product, product_ids, self._product_defaults)
 
-        for product_id in product_ids:
-            product, _ = Product.objects.get_or_create(
-                id=product_id,
-                defaults={"name": f"Product-{product_id}", "sku": f"SKU-{product_id}"},
+    @staticmethod
+    def _driver_defaults(driver_id: int) -> dict:
+        return {
+            "first_name": "Unknown",
+            "last_name": "Driver",
+            "license_plate": "UNKNOWN",
+            "date_of_birth": "2000-01-01",
+        }
+
+    @staticmethod
+    def _block_defaults(block_id: int) -> dict:
+        return {"name": f"Block-{block_id}", "description": "Auto-created block"}
+
+    @staticmethod
+    def _product_defaults(product_id: int) -> dict:
+        return {"name": f"Product-{product_id}", "sku": f"SKU-{product_id}"}
+
+    def _cache_on_commit(self, instances: List) -> None:
+        """
+        Add instances to the identity cache once the transaction commits.
+
+        Rows created or read inside a transaction that is rolled back must not
+        end up in the cache, so population is deferred with on_commit.
+        """
+        if instances:
+            transaction.on_commit(lambda: self.cache.set_many(instances))
+
+    def _invalidate_responses_on_commit(self, snapshots: List) -> None:
+        """
+        Invalidate the cached responses of changed orders once committed.
+
+        Args:
+            snapshots: Order snapshots from before and after the change
+        """
+        transaction.on_commit(lambda: self.response_cache.invalidate_orders(snapshots))
+
+    def _get_or_create_cached(self, model, ids: List[int], defaults) -> List:
+        """
+        Get or create instances one by one, skipping the cached ones.
+
+        Args:
+            model: Model class (Driver, Block or Product)
+            ids: IDs to resolve
+            defaults: Callable returning the attributes of a missing instance
+
+        Returns:
+            List: Instances in the same order as ids
+        """
+        instances = self.cache.get_many(model, ids)
+        fetched = []
+
+        for pk in ids:
+            if int(pk) not in instances:
+                instance = model.objects.get_or_create(id=pk, defaults=defaults(pk))[0]
+                instances[int(pk)] = instance
+                fetched.append(instance)
+
+        self._cache_on_commit(fetched)
+        return [instances[int(pk)] for pk in ids]
+
+    def _bulk_get_or_create(
+        self, model, ids: Iterable[int], defaults
+    ) -> Dict[int, object]:
+        """
+        Resolve a set of IDs to instances, inserting the missing ones.
+
+        Cached instances are used first; the rest are loaded with in_bulk and
+        the missing ones inserted with bulk_create(ignore_conflicts=True).
+
+        Args:
+            model: Model class (Driver, Block or Product)
+            ids: IDs to resolve
+            defaults: Callable returning the attributes of a missing instance
+
+        Returns:
+            Dict[int, object]: Instances by ID
+        """
+        ids = {int(pk) for pk in ids}
+        instances = self.cache.get_many(model, ids)
+        missing = ids - instances.keys()
+
+        if missing:
+            fetched = model.objects.in_bulk(missing)
+            created = missing - fetched.keys()
+
+            if created:
+                model.objects.bulk_create(
+                    [model(id=pk, **defaults(pk)) for pk in created],
+                    ignore_conflicts=True,
+                )
+                fetched.update(model.objects.in_bulk(created))
+
+            instances.update(fetched)
+            self._cache_on_commit(list(fetched.values()))
+
+        unresolved = ids - instances.keys()
+        if unresolved:
+            raise ValueError(
+                f"Could not create {model.__name__} with IDs: "
+                f"{', '.join(str(pk) for pk in sorted(unresolved))}"
             )
-            products.append(product)
 
-        return products
+        return instances
+
+    def _bulk_get_or_create_drivers(
+        self, driver_ids: Iterable[int]
+    ) -> Dict[int, Driver]:
+        """Get or create the drivers with the given IDs."""
+        return self._bulk_get_or_create(Driver, driver_ids, self._driver_defaults)
+
+    def _bulk_get_or_create_blocks(self, block_ids: Iterable[int]) -> Dict[int, Block]:
+        """Get or create the blocks with the given IDs."""
+        return self._bulk_get_or_create(Block, block_ids, self._block_defaults)
+
+    def _bulk_get_or_create_products(
+        self, product_ids: Iterable[int]
+    ) -> Dict[int, Product]:
+        """Get or create the products with the given IDs."""
+        return self._bulk_get_or_create(Product, product_ids, self._product_defaults)
+
+    @staticmethod
+    def _bulk_set_products(products_by_order: Dict[int, set]) -> None:
+        """Sync the order/product M2M rows of several orders, like ``set()`` does."""
+        through = Order.products.through
+
+        current = set(
+            through.objects.filter(order_id__in=products_by_order).values_list(
+                "order_id", "product_id"
+            )
+        )
+        wanted = {
+            (order_id, product_id)
+            for order_id, product_ids in products_by_order.items()
+            for product_id in product_ids
+        }
+
+        stale: Dict[int, List[int]] = {}
+        for order_id, product_id in current - wanted:
+            stale.setdefault(order_id, []).append(product_id)
+
+        if stale:
+            stale_rows = Q()
+            for order_id, product_ids in stale.items():
+                stale_rows |= Q(order_id=order_id, product_id__in=product_ids)
+            through.objects.filter(stale_rows).delete()
+
+        through.objects.bulk_create(
+            [
+                through(order_id=order_id, product_id=product_id)
+                for order_id, product_id in wanted - current
+            ],
+            ignore_conflicts=True,
+        )
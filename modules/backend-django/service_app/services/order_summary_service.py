@@ -0,0 +1,275 @@
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..models import Order, OrderDaySummary, OrderStatus, OrderSummary
+
+# (driver_id, block_id, status, dispatch day) of an order, with 0 for a missing
+# driver/block and None for a missing dispatch date
+SummaryKey = Tuple[int, int, str, Optional[date]]
+
+# (driver_id, block_id, status) of an order_summary row
+GroupKey = Tuple[int, int, str]
+
+# (day, status) of an order_day_summary row
+DayKey = Tuple[date, str]
+
+GROUP_FIELDS = ("driver_id", "block_id", "status")
+DAY_FIELDS = ("day", "status")
+
+
+def summary_key(order) -> SummaryKey:
+    """Return the summary groups an order is counted in."""
+    day = timezone.localdate(order.dispatch_date) if order.dispatch_date else None
+    return order.driver_id or 0, order.block_id or 0, order.status, day
+
+
+class OrderSummaryService:
+    """
+    Service class keeping the order_summary and order_day_summary tables in
+    line with the orders.
+
+    Writers pass the keys of the changed orders before and after the change
+    and only the difference is applied, in the same transaction as the
+    orders. Readers get the dashboard and consolidation counts in O(groups).
+    """
+
+    def apply_changes(
+        self, before: Iterable[SummaryKey], after: Iterable[SummaryKey]
+    ) -> None:
+        """
+        Move orders between summary groups with one upsert per table.
+
+        The deltas are added with a single INSERT ... ON DUPLICATE KEY UPDATE
+        (ON CONFLICT ... DO UPDATE outside MySQL), rows in key order, so the
+        increment is atomic whether the group exists or not. Nothing is
+        locked beforehand with SELECT ... FOR UPDATE, whose gap locks on
+        missing groups made concurrent writers deadlock. Must run in the
+        transaction that changes the orders.
+
+        Args:
+            before: Keys of the changed orders before the change (none when created)
+            after: Keys of the changed orders after the change
+        """
+        groups: Counter = Counter()
+        days: Counter = Counter()
+        for keys, sign in ((after, 1), (before, -1)):
+            for driver_id, block_id, status, day in keys:
+                groups[(driver_id, block_id, status)] += sign
+                if day is not None:
+                    days[(day, status)] += sign
+
+        self._add_totals(OrderSummary, GROUP_FIELDS, groups)
+        self._add_totals(OrderDaySummary, DAY_FIELDS, days)
+
+    @staticmethod
+    def _add_totals(model, key_fields: Sequence[str], deltas: Dict[tuple, int]) -> None:
+        """Add each delta to the total of its row, creating the missing rows."""
+        rows = sorted((key, delta) for key, delta in deltas.items() if delta)
+        if not rows:
+            return
+
+        quote = connection.ops.quote_name
+        table = quote(model._meta.db_table)
+        fields = [model._meta.get_field(name) for name in key_fields]
+        columns = ", ".join(quote(name) for name in (*key_fields, "total"))
+        row = f"({', '.join(['%s'] * (len(fields) + 1))})"
+
+        if connection.vendor == "mysql":
+            conflict = "ON DUPLICATE KEY UPDATE total = total + VALUES(total)"
+        else:
+            keys = ", ".join(quote(name) for name in key_fields)
+            conflict = f"ON CONFLICT ({keys}) DO UPDATE SET total = {table}.total + excluded.total"
+
+        params = []
+        for key, delta in rows:
+            params += [f.get_db_prep_value(v, connection) for f, v in zip(fields, key)]
+            params.append(delta)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES {', '.join([row] * len(rows))} "
+                f"{conflict}",
+                params,
+            )
+
+    @staticmethod
+    def compute() -> Dict[GroupKey, int]:
+        """Count the orders of each group from the order table."""
+        rows = (
+            Order.objects.order_by()
+            .values("driver_id", "block_id", "status")
+            .annotate(total=Count("id"))
+        )
+        return {
+            (row["driver_id"] or 0, row["block_id"] or 0, row["status"]): row["total"]
+            for row in rows
+        }
+
+    @staticmethod
+    def compute_days() -> Dict[DayKey, int]:
+        """Count the orders of each dispatch day and status from the order table."""
+        rows = (
+            Order.objects.filter(dispatch_date__isnull=False)
+            .order_by()
+            .annotate(day=TruncDate("dispatch_date"))
+            .values("day", "status")
+            .annotate(total=Count("id"))
+        )
+        return {(row["day"], row["status"]): row["total"] for row in rows}
+
+    @staticmethod
+    def stored() -> Dict[GroupKey, int]:
+        """Return the non-empty groups of the summary table."""
+        rows = OrderSummary.objects.exclude(total=0).values_list(
+            "driver_id", "block_id", "status", "total"
+        )
+        return {(d, b, s): total for d, b, s, total in rows}
+
+    @staticmethod
+    def stored_days() -> Dict[DayKey, int]:
+        """Return the non-empty groups of the day summary table."""
+        rows = OrderDaySummary.objects.exclude(total=0).values_list(
+            "day", "status", "total"
+        )
+        return {(day, status): total for day, status, total in rows}
+
+    def check(self) -> Dict[Union[GroupKey, DayKey], Tuple[int, int]]:
+        """
+        Compare the summary tables with the order table.
+
+        Returns:
+            Dict[Union[GroupKey, DayKey], Tuple[int, int]]: (stored, actual) of
+                each group that differs; empty when the tables are up to date
+        """
+        differences = {}
+        for stored, actual in (
+            (self.stored(), self.compute()),
+            (self.stored_days(), self.compute_days()),
+        ):
+            differences.update(
+                {
+                    key: (stored.get(key, 0), actual.get(key, 0))
+                    for key in stored.keys() | actual.keys()
+                    if stored.get(key, 0) != actual.get(key, 0)
+                }
+            )
+        return differences
+
+    @transaction.atomic
+    def rebuild(self) -> int:
+        """
+        Recompute the summary tables from scratch.
+
+        Returns:
+            int: Number of groups written
+        """
+        groups = [
+            OrderSummary(driver_id=d, block_id=b, status=s, total=total)
+            for (d, b, s), total in self.compute().items()
+        ]
+        days = [
+            OrderDaySummary(day=day, status=status, total=total)
+            for (day, status), total in self.compute_days().items()
+        ]
+        OrderSummary.objects.all().delete()
+        OrderDaySummary.objects.all().delete()
+        OrderSummary.objects.bulk_create(groups, batch_size=1000)
+        OrderDaySummary.objects.bulk_create(days, batch_size=1000)
+        return len(groups) + len(days)
+
+    # Reads
+    @staticmethod
+    def count_by_status() -> Dict[str, int]:
+        """Count the orders of each status, including the empty ones."""
+        counts = dict.fromkeys(OrderStatus.values, 0)
+        rows = (
+            OrderSummary.objects.order_by()
+            .values("status")
+            .annotate(count=Sum("total"))
+        )
+        for row in rows:
+            counts[row["status"]] = row["count"]
+        return counts
+
+    @staticmethod
+    def count_by_day(first_day: date) -> List[dict]:
+        """Count the orders dispatched on each day since first_day."""
+        rows = (
+            OrderDaySummary.objects.filter(day__gte=first_day)
+            .order_by()
+            .values("day")
+            .annotate(count=Sum("total"))
+            .filter(count__gt=0)
+            .order_by("day")
+        )
+        return [{"day": row["day"], "total": row["count"]} for row in rows]
+
+    @staticmethod
+    def count_by_block() -> Dict[int, int]:
+        """Count the orders of each block, by block id."""
+        rows = (
+            OrderSummary.objects.exclude(block_id=0)
+            .order_by()
+            .values("block_id")
+            .annotate(count=Sum("total"))
+            .filter(count__gt=0)
+        )
+        return {row["block_id"]: row["count"] for row in rows}
+
+    @staticmethod
+    def count_blocks(statuses: Iterable[str]) -> int:
+        """Count the blocks having orders in one of the statuses."""
+        return (
+            OrderSummary.objects.filter(status__in=list(statuses), total__gt=0)
+            .exclude(block_id=0)
+            .values("block_id")
+            .distinct()
+            .count()
+        )
+
+    @staticmethod
+    def get_groups(
+        statuses: Iterable[str],
+        driver_id: Optional[int] = None,
+        block_id: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Return the (driver, block) groups with their per-status counts.
+
+        Args:
+            statuses: Statuses to count
+            driver_id: Only the groups of this driver
+            block_id: Only the groups of this block
+
+        Returns:
+            List[dict]: driver_id/block_id (None when missing), total and one
+                count per status, ordered by (driver_id, block_id)
+        """
+        filters = Q(status__in=list(statuses), total__gt=0)
+        if driver_id is not None:
+            filters &= Q(driver_id=driver_id)
+        if block_id is not None:
+            filters &= Q(block_id=block_id)
+
+        groups: Dict[Tuple[int, int], dict] = {}
+        rows = OrderSummary.objects.filter(filters).order_by("driver_id", "block_id")
+        for row in rows:
+            group = groups.setdefault(
+                (row.driver_id, row.block_id),
+                {
+                    "driver_id": row.driver_id or None,
+                    "block_id": row.block_id or None,
+                    "total": 0,
+                    "counts": dict.fromkeys(OrderStatus.values, 0),
+                },
+            )
+            group["total"] += row.total
+            group["counts"][row.status] += row.total
+
+        return list(groups.values())
@@ -0,0 +1,126 @@
+import gzip
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.utils import timezone
+
+from ..helpers.streaming_helper import to_json
+from ..models import RedisOutbox
+
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", 30))
+OUTBOX_RETENTION_BATCH_SIZE = int(os.getenv("OUTBOX_RETENTION_BATCH_SIZE", 5000))
+OUTBOX_ARCHIVE_DIR = os.getenv("OUTBOX_ARCHIVE_DIR", "archive/redis_outbox")
+
+ARCHIVE_FIELDS = (
+    "id",
+    "event_id",
+    "event_type",
+    "payload",
+    "received",
+    "created_at",
+    "updated_at",
+)
+
+
+class OutboxRetentionService:
+    """
+    Service class keeping the redis_outbox table to its recent rows.
+
+    Rows older than the retention are copied to gzip JSONL files, then
+    deleted, both in batches of a bounded size, so the purge never holds
+    long locks and the unique event_id index stays small.
+
+    The outbox is also the idempotency record of the consumer, so the
+    retention must be longer than any redelivery of a stream entry (the
+    stream is trimmed and the PEL dead-lettered well before that).
+    """
+
+    def __init__(
+        self,
+        retention_days: int = OUTBOX_RETENTION_DAYS,
+        batch_size: int = OUTBOX_RETENTION_BATCH_SIZE,
+        archive_dir: Optional[str] = OUTBOX_ARCHIVE_DIR,
+    ):
+        if retention_days < 1:
+            raise ValueError("The outbox retention must be at least one day")
+
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.archive_dir = Path(archive_dir) if archive_dir else None
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Rows created before this moment are expired."""
+        return (now or timezone.now()) - timedelta(days=self.retention_days)
+
+    def count_expired(self, cutoff: Optional[datetime] = None) -> int:
+        return RedisOutbox.objects.filter(
+            created_at__lt=cutoff or self.cutoff()
+        ).count()
+
+    def purge(
+        self, cutoff: Optional[datetime] = None, max_batches: Optional[int] = None
+    ) -> Dict[str, object]:
+        """
+        Archive and delete the expired rows, one batch at a time.
+
+        Each batch is written to the archive file before it is deleted, so a
+        failure can at worst archive a batch twice, never lose it.
+
+        Args:
+            cutoff: Rows created before it are purged (default: now - retention)
+            max_batches: Stop after this many batches (default: until done)
+
+        Returns:
+            Dict[str, object]: deleted rows, batches and the archive file (None
+                when archiving is disabled or nothing was purged)
+        """
+        cutoff = cutoff or self.cutoff()
+        archive_path = self._archive_path(cutoff) if self.archive_dir else None
+        deleted = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            rows = self._next_batch(cutoff)
+            if not rows:
+                break
+
+            if archive_path is not None:
+                self._archive(archive_path, rows)
+
+            count, _ = RedisOutbox.objects.filter(
+                id__in=[row["id"] for row in rows]
+            ).delete()
+
+            deleted += count
+            batches += 1
+            print(f"Outbox retention: deleted batch {batches} ({count} rows)")
+
+        return {
+            "deleted": deleted,
+            "batches": batches,
+            "archive": str(archive_path) if archive_path and deleted else None,
+        }
+
+    def _next_batch(self, cutoff: datetime) -> List[dict]:
+        return list(
+            RedisOutbox.objects.filter(created_at__lt=cutoff)
+            .order_by("created_at", "id")
+            .values(*ARCHIVE_FIELDS)[: self.batch_size]
+        )
+
+    def _archive_path(self, cutoff: datetime) -> Path:
+        stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+        name = f"redis_outbox-before-{cutoff:%Y%m%d}-{stamp}.jsonl.gz"
+        return self.archive_dir / name
+
+    @staticmethod
+    def _archive(path: Path, rows: List[dict]) -> None:
+        """Append rows to the archive as one gzip member, flushed to disk."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with gzip.open(path, "at", encoding="utf-8") as archive:
+            archive.writelines(to_json(row) + "\n" for row in rows)
+        with open(path, "ab") as raw:
+            os.fsync(raw.fileno())
@@ -1,22 +1,118 @@
 import json
 import os
-import re
-from typing import Any, Dict
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import redis
-from django.db import transaction
-
+from django.db import (
+    DatabaseError,
+    IntegrityError,
+    InterfaceError,
+    OperationalError,
+    close_old_connections,
+    connection,
+    connections,
+    transaction,
+)
+
+from ..helpers.envelope_helper import EnvelopeDecodeError, get_envelope_decoder
+from ..helpers.metrics_helper import MetricsRegistry, start_metrics_server
+from ..helpers.redis_pool_helper import get_redis
 from ..models import RedisOutbox
-from ..tasks import dispatch_to_q
+from ..tasks import dispatch_batch_to_q
+from .idempotency_service import build_recent_ids_filter
 from .order_service import OrderService
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 STREAM = os.getenv("REDIS_STREAM", "events_stream")
 GROUP = os.getenv("REDIS_GROUP", "main_group")
 CONSUMER_NAME = os.getenv("REDIS_CONSUMER", "worker-1")
+BATCH_SIZE = int(os.getenv("REDIS_BATCH_SIZE", 100))
+BLOCK_MS = int(os.getenv("REDIS_BLOCK_MS", 5000))
+ACK_CHUNK_SIZE = 1000
+
+# Idempotency: "insert" relies on the unique event_id, "check" queries first
+IDEMPOTENCY_MODE = os.getenv("REDIS_IDEMPOTENCY_MODE", "insert")
+# The batch is already in the outbox once committed: queue it to Django-Q only
+# for deployments whose Q tasks do extra work on it
+DISPATCH_TO_Q = os.getenv("REDIS_DISPATCH_TO_Q", "false").lower() == "true"
+
+# Pending entries (PEL) reclaim
+RECLAIM_MIN_IDLE_MS = int(os.getenv("REDIS_RECLAIM_MIN_IDLE_MS", 60000))
+RECLAIM_INTERVAL = int(os.getenv("REDIS_RECLAIM_INTERVAL", 30))
+MAX_DELIVERIES = int(os.getenv("REDIS_MAX_DELIVERIES", 5))
+DEAD_LETTER_STREAM = os.getenv("REDIS_DEAD_LETTER_STREAM", f"{STREAM}:dead")
+
+# Wait after a failed iteration, doubled on each consecutive failure (seconds)
+RETRY_BACKOFF = float(os.getenv("REDIS_RETRY_BACKOFF", 1))
+RETRY_BACKOFF_MAX = float(os.getenv("REDIS_RETRY_BACKOFF_MAX", 30))
+
+# MySQL client/server errors of a lost or unusable DB connection: the whole
+# batch is retried later instead of failing message by message
+DB_DISCONNECT_CODES = {1040, 1053, 2002, 2003, 2006, 2013, 2055, 4031}
+
+# Deadlock (1213) and lock wait timeout (1205): MySQL rolled the transaction
+# back, so the batch transaction is run again on the same connection
+DB_LOCK_CODES = {1205, 1213}
+DB_TRANSACTION_RETRIES = max(int(os.getenv("REDIS_DB_TRANSACTION_RETRIES", 3)), 1)
+
+# Prometheus metrics on http://<host>:REDIS_METRICS_PORT/metrics (0: disabled);
+# in supervisor mode worker N serves on REDIS_METRICS_PORT + N - 1
+METRICS_PORT = int(os.getenv("REDIS_METRICS_PORT", 0))
+
+metrics = MetricsRegistry()
+MESSAGES = metrics.counter(
+    "consumer_messages_total",
+    "Stream entries handled, by result (processed, failed, skipped)",
+)
+BATCH_SIZES = metrics.histogram(
+    "consumer_batch_size",
+    "Stream entries per batch",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+PHASE_SECONDS = metrics.histogram(
+    "consumer_phase_seconds",
+    "Seconds spent per batch phase (parse, db, dispatch, ack)",
+)
+RECLAIMED = metrics.counter(
+    "consumer_reclaimed_total", "Idle pending entries claimed from other consumers"
+)
+DEAD_LETTERED = metrics.counter(
+    "consumer_dead_lettered_total", "Entries moved to the dead-letter stream"
+)
+LOOP_ERRORS = metrics.counter(
+    "consumer_errors_total", "Failed iterations of the consumer loop"
+)
+STREAM_LENGTH = metrics.gauge("consumer_stream_length", "Entries in the stream")
+STREAM_LAG = metrics.gauge(
+    "consumer_stream_lag", "Entries not yet delivered to the group (Redis 7+)"
+)
+PENDING_ENTRIES = metrics.gauge(
+    "consumer_pending_entries", "Entries delivered to the group but not acked (PEL)"
+)
+OLDEST_PENDING_SECONDS = metrics.gauge(
+    "consumer_oldest_pending_seconds", "Idle time of the oldest pending entry"
+)
+IDENTITY_CACHE = metrics.gauge(
+    "consumer_identity_cache",
+    "Driver/block/product lookup cache of this process (hits, misses, entries)",
+)
+IDENTITY_CACHE_HIT_RATIO = metrics.gauge(
+    "consumer_identity_cache_hit_ratio", "Hit ratio of the identity cache"
+)
+RESPONSE_CACHE_INVALIDATIONS = metrics.gauge(
+    "consumer_response_cache_invalidations",
+    "Response cache invalidations sent by this process",
+)
 
 # Initialize services
 order_service = OrderService()
+envelope_decoder = get_envelope_decoder()
+recent_ids_filter = build_recent_ids_filter(redis_url=REDIS_URL)
+
+# Set when the consumer must stop after the batch in progress
+_stop_event = threading.Event()
 
 
 def ensure_group(r: redis.Redis):
@@ -38,29 +134,115 @@ def handle_event(event_id: str, event_type: str, payload: dict) -> None:
         payload: Event data
     """
     # Skip if we've already processed this event
-    if RedisOutbox.objects.filter(event_id=event_id).exists():
+    if not _filter_new_events([(event_id, event_type, payload)]):
         return
 
     try:
         with transaction.atomic():
+            # Record the event in the outbox first: the unique event_id
+            # rejects events already stored by another consumer
+            try:
+                with transaction.atomic():
+                    RedisOutbox.objects.create(
+                        event_id=event_id,
+                        event_type=event_type,
+                        payload=payload,
+                        received=True,
+                    )
+            except IntegrityError:
+                print(f"Skipped duplicate event {event_id}")
+                return
+
             # Handle different event types
             _handle_order_data(payload)
+            _remember_on_commit([event_id])
+
+            print(f"Processed event {event_id} of type {event_type}")
+    except Exception as e:
+        print(f"Error processing event {event_id}: {str(e)}")
+        raise
+
+
+def handle_events(events: List[Tuple[str, str, dict]]) -> None:
+    """
+    Bulk counterpart of handle_event for a whole batch of events.
+
+    The outbox rows are inserted first with one bulk insert, so a duplicate
+    event_id makes the whole call fail, and so does any invalid payload. The
+    caller then falls back to handle_event to isolate it. Orders are written
+    with OrderService.upsert_orders.
+
+    Args:
+        events: List of (event_id, event_type, payload)
+    """
+    new_events = _filter_new_events(events)
+
+    if not new_events:
+        return
 
-            # Record the event in the outbox
-            RedisOutbox.objects.create(
+    for _, _, payload in new_events:
+        _validate_order_payload(payload)
+
+    RedisOutbox.objects.bulk_create(
+        [
+            RedisOutbox(
                 event_id=event_id,
                 event_type=event_type,
                 payload=payload,
                 received=True,
             )
+            for event_id, event_type, payload in new_events
+        ]
+    )
 
-            print(f"Processed event {event_id} of type {event_type}")
-    except Exception as e:
-        print(f"Error processing event {event_id}: {str(e)}")
-        raise
+    order_service.upsert_orders([payload for _, _, payload in new_events])
+    _remember_on_commit([event_id for event_id, _, _ in new_events])
 
+    skipped = len(events) - len(new_events)
+    print(f"Processed {len(new_events)} events, skipped {skipped} duplicates")
 
-def _handle_order_data(payload: Dict[str, Any]) -> None:
+
+def _filter_new_events(
+    events: List[Tuple[str, str, dict]],
+) -> List[Tuple[str, str, dict]]:
+    """
+    Drop the events that were already processed.
+
+    The recent-IDs filter is checked first. Exact hits are dropped right away,
+    and probable hits of a probabilistic filter are confirmed against the
+    outbox. In "check" mode every event is looked up in the outbox; in
+    "insert" mode the remaining duplicates are caught by the unique event_id
+    when the outbox row is inserted.
+    """
+    event_ids = [event_id for event_id, _, _ in events]
+    maybe_seen = recent_ids_filter.seen(event_ids) if recent_ids_filter else set()
+
+    if recent_ids_filter is not None and recent_ids_filter.exact:
+        events = [event for event in events if event[0] not in maybe_seen]
+        maybe_seen = set()
+
+    to_verify = maybe_seen
+    if IDEMPOTENCY_MODE == "check":
+        to_verify = {event_id for event_id, _, _ in events}
+
+    if not to_verify:
+        return events
+
+    seen = set(
+        RedisOutbox.objects.filter(event_id__in=to_verify).values_list(
+            "event_id", flat=True
+        )
+    )
+    return [event for event in events if event[0] not in seen]
+
+
+def _remember_on_commit(event_ids: List[str]) -> None:
+    """Add committed event IDs to the recent-IDs filter."""
+    if recent_ids_filter is not None:
+        transaction.on_commit(lambda: recent_ids_filter.add(event_ids))
+
+
+def _validate_order_payload(payload: Dict[str, Any]) -> None:
     required_fields = ["order_id", "block_id", "driver_id", "products", "dispatch_date"]
 
     # Validate payload
@@ -68,6 +250,10 @@ def _handle_order_data(payload: Dict[str, Any]) -> None:
         missing = [f for f in required_fields if f not in payload]
         raise ValueError(f"Missing required fields in payload: {', '.join(missing)}")
 
+
+def _handle_order_data(payload: Dict[str, Any]) -> None:
+    _validate_order_payload(payload)
+
     # Create order using the order service
     order = order_service.create_or_update_order(payload)
 
@@ -77,67 +263,454 @@ def _handle_order_data(payload: Dict[str, Any]) -> None:
     print(f"Created order with ID {order.id}")
 
 
-def run():
-    r = redis.from_url(REDIS_URL)
-    ensure_group(r)
-    block_ms = 5000
+def _event_id(msg_id) -> str:
+    """Stream IDs are read as bytes; events are stored with their text form."""
+    return msg_id.decode() if isinstance(msg_id, bytes) else msg_id
+
+
+def parse_message(fields: Dict[bytes, bytes]) -> Optional[Tuple[str, dict]]:
+    """
+    Extract the event type and payload from a Symfony Messenger stream entry.
+
+    Args:
+        fields: Raw fields of the stream entry
+
+    Returns:
+        Optional[Tuple[str, dict]]: (event_type, payload), or None when the entry
+        does not contain an event
+    """
+    return envelope_decoder.decode(fields[b"message"])
+
+
+def _error_code(exc: Exception) -> Optional[int]:
+    """MySQL error number of a DB error, e.g. OperationalError(2006, "...")."""
+    code = exc.args[0] if exc.args else None
+    return code if isinstance(code, int) else None
+
+
+def is_connection_error(exc: Exception) -> bool:
+    """
+    Tell whether a DB error means the connection is lost or unusable.
 
-    while True:
+    :param exc: Exception raised by a query
+    :return: True for interface errors and disconnect codes; an operational
+        error without a MySQL code is treated as a disconnect too
+    """
+    if isinstance(exc, InterfaceError):
+        return True
+    if not isinstance(exc, OperationalError):
+        return False
+    code = _error_code(exc)
+    return code is None or code in DB_DISCONNECT_CODES
+
+
+def is_lock_error(exc: Exception) -> bool:
+    """
+    Tell whether a DB error is a deadlock or a lock wait timeout.
+
+    :param exc: Exception raised by a query
+    :return: True when the transaction can be run again as is
+    """
+    return isinstance(exc, DatabaseError) and _error_code(exc) in DB_LOCK_CODES
+
+
+def _write_events(
+    events: List[Tuple[bytes, str, dict]],
+) -> List[Tuple[bytes, str, dict]]:
+    """Write the events in one transaction and return the ones that succeeded."""
+    processed: List[Tuple[bytes, str, dict]] = []
+
+    with transaction.atomic():
         try:
-            resp = r.xreadgroup(
-                GROUP, CONSUMER_NAME, streams={STREAM: ">"}, count=10, block=block_ms
-            )
+            with transaction.atomic():
+                handle_events(
+                    [(_event_id(msg_id), t, payload) for msg_id, t, payload in events]
+                )
+            return events
+        except Exception as e:
+            if is_connection_error(e) or is_lock_error(e):
+                raise
+            print(f"Bulk processing failed, retrying one message at a time: {e}")
+
+        for msg_id, event_type, payload in events:
+            try:
+                with transaction.atomic():
+                    handle_event(_event_id(msg_id), event_type, payload)
+                processed.append((msg_id, event_type, payload))
+            except Exception as e:
+                if is_connection_error(e) or is_lock_error(e):
+                    raise
+                print(f"Error processing message {msg_id}: {e}")
+
+    return processed
+
+
+def process_batch(
+    messages: List[Tuple[bytes, Dict[bytes, bytes]]], r: Optional[redis.Redis] = None
+) -> List[bytes]:
+    """
+    Process a batch of stream entries inside a single DB transaction.
 
-            if not resp:
+    The batch is first written in bulk (see handle_events). If that fails,
+    every message is retried in its own savepoint, so a bad payload only rolls
+    back its own changes and the rest of the batch is still committed.
+
+    A lost DB connection is raised instead, so nothing of the batch is acked
+    and the caller can reconnect. A deadlock or lock wait timeout rolls back
+    the whole transaction, which is then run again up to
+    DB_TRANSACTION_RETRIES times before the error is raised.
+
+    Entries that hold no event are acked right away, and entries that cannot
+    be parsed are moved to the dead-letter stream, since no retry can change
+    them.
+
+    Args:
+        messages: List of (msg_id, fields) read from the stream
+        r: Redis connection used to dead-letter unparseable entries; without
+            it they are left pending
+
+    Returns:
+        List[bytes]: IDs of the messages that were processed or skipped and can
+            be acked
+    """
+    BATCH_SIZES.observe(len(messages))
+    events: List[Tuple[bytes, str, dict]] = []
+    skipped: List[bytes] = []
+    invalid: List[Tuple[bytes, Dict[bytes, bytes]]] = []
+
+    with PHASE_SECONDS.time(phase="parse"):
+        for msg_id, fields in messages:
+            try:
+                event = parse_message(fields)
+            except json.JSONDecodeError as e:
+                print(f"JSON decode error in message {msg_id}: {e}")
+                invalid.append((msg_id, fields))
+                continue
+            except EnvelopeDecodeError as e:
+                print(f"Invalid envelope in message {msg_id}: {e}")
+                invalid.append((msg_id, fields))
+                continue
+            except Exception as e:
+                print(f"Error processing message {msg_id}: {e}")
+                invalid.append((msg_id, fields))
                 continue
 
-            for stream_name, messages in resp:
-                for msg_id, fields in messages:
-                    try:
-                        raw = fields[b"message"].decode("utf-8")
+            if event is None:
+                skipped.append(msg_id)
+            else:
+                events.append((msg_id, *event))
+
+    MESSAGES.inc(len(messages) - len(events), result="skipped")
+    if r is not None and invalid:
+        dead_letter_messages(r, invalid, {}, reason="unparseable")
+        DEAD_LETTERED.inc(len(invalid))
+    with PHASE_SECONDS.time(phase="db"):
+        for attempt in range(1, DB_TRANSACTION_RETRIES + 1):
+            try:
+                processed = _write_events(events)
+                break
+            except DatabaseError as e:
+                if not is_lock_error(e) or attempt == DB_TRANSACTION_RETRIES:
+                    raise
+                print(f"Batch transaction rolled back ({e}), attempt {attempt}")
+
+    MESSAGES.inc(len(processed), result="processed")
+    MESSAGES.inc(len(events) - len(processed), result="failed")
+
+    # Send the committed events to Django-Q for async processing
+    if DISPATCH_TO_Q:
+        with PHASE_SECONDS.time(phase="dispatch"):
+            dispatch_batch_to_q(
+                (_event_id(msg_id), event_type, payload)
+                for msg_id, event_type, payload in processed
+            )
+
+    return [msg_id for msg_id, _, _ in processed] + skipped
+
+
+def ack_messages(r: redis.Redis, msg_ids: List[bytes]) -> None:
+    """Acknowledge the given messages with pipelined XACK commands."""
+    if not msg_ids:
+        return
+
+    with PHASE_SECONDS.time(phase="ack"):
+        pipe = r.pipeline(transaction=False)
+        for start in range(0, len(msg_ids), ACK_CHUNK_SIZE):
+            end = start + ACK_CHUNK_SIZE
+            pipe.xack(STREAM, GROUP, *msg_ids[start:end])
+        pipe.execute()
+
+
+def _autoclaim(
+    r: redis.Redis, consumer_name: str, start_id: bytes
+) -> Tuple[bytes, List[Tuple[bytes, Optional[Dict[bytes, bytes]]]]]:
+    """
+    Claim a page of idle pending entries with XAUTOCLAIM.
+
+    redis-py 3.x has no wrapper for the command, so the raw reply is parsed here.
+    Entries deleted from the stream come back with ``None`` fields.
+    """
+    reply = r.execute_command(
+        "XAUTOCLAIM",
+        STREAM,
+        GROUP,
+        consumer_name,
+        RECLAIM_MIN_IDLE_MS,
+        start_id,
+        "COUNT",
+        BATCH_SIZE,
+    )
+    next_id, entries = reply[0], reply[1]
+
+    messages = []
+    for msg_id, fields in entries:
+        if fields is None:
+            messages.append((msg_id, None))
+        else:
+            messages.append((msg_id, dict(zip(fields[::2], fields[1::2]))))
+
+    return next_id, messages
+
+
+def _delivery_counts(r: redis.Redis, msg_ids: List[bytes]) -> Dict[bytes, int]:
+    """Fetch the delivery counter of each message with one pipelined XPENDING per ID."""
+    pipe = r.pipeline(transaction=False)
+    for msg_id in msg_ids:
+        pipe.xpending_range(STREAM, GROUP, msg_id, msg_id, 1)
+
+    counts = {}
+    for msg_id, pending in zip(msg_ids, pipe.execute()):
+        counts[msg_id] = pending[0]["times_delivered"] if pending else 0
+
+    return counts
+
+
+def dead_letter_messages(
+    r: redis.Redis,
+    messages: List[Tuple[bytes, Dict[bytes, bytes]]],
+    counts: Dict[bytes, int],
+    reason: str = "max deliveries",
+) -> None:
+    """Move messages to the dead-letter stream and remove them from the PEL."""
+    if not messages:
+        return
+
+    pipe = r.pipeline(transaction=True)
+    for msg_id, fields in messages:
+        dead_fields = dict(fields)
+        dead_fields[b"original_id"] = msg_id
+        dead_fields[b"deliveries"] = counts.get(msg_id, 0)
+        dead_fields[b"reason"] = reason
+        pipe.xadd(DEAD_LETTER_STREAM, dead_fields)
+        pipe.xack(STREAM, GROUP, msg_id)
+    pipe.execute()
+
+    for msg_id, _ in messages:
+        print(
+            f"Message {msg_id} moved to {DEAD_LETTER_STREAM} ({reason}, "
+            f"{counts.get(msg_id, 0)} deliveries)"
+        )
+
+
+def reclaim_pending(r: redis.Redis, consumer_name: str) -> int:
+    """
+    Reprocess entries left in the PEL by failed or crashed consumers.
+
+    Entries idle for longer than RECLAIM_MIN_IDLE_MS are claimed in pages of
+    BATCH_SIZE. Entries delivered more than MAX_DELIVERIES times are moved to
+    the dead-letter stream; the rest go through the regular batch path.
+
+    Args:
+        r: Redis connection
+        consumer_name: Consumer that takes ownership of the claimed entries
+
+    Returns:
+        int: Number of entries claimed in this pass
+    """
+    start_id = b"0-0"
+    claimed = 0
+
+    while not _stop_event.is_set():
+        next_id, messages = _autoclaim(r, consumer_name, start_id)
+        claimed += len(messages)
+        RECLAIMED.inc(len(messages))
+
+        # Entries already deleted from the stream can only be acked
+        deleted = [msg_id for msg_id, fields in messages if fields is None]
+        messages = [
+            (msg_id, fields) for msg_id, fields in messages if fields is not None
+        ]
+        ack_messages(r, deleted)
+
+        if messages:
+            counts = _delivery_counts(r, [msg_id for msg_id, _ in messages])
+            dead = [m for m in messages if counts[m[0]] > MAX_DELIVERIES]
+            retry = [m for m in messages if counts[m[0]] <= MAX_DELIVERIES]
+
+            dead_letter_messages(r, dead, counts)
+            DEAD_LETTERED.inc(len(dead))
+            ack_messages(r, process_batch(retry, r))
 
-                        match = re.search(r's:\d+:"(.*)";', raw)
-                        if not match:
-                            continue
+        if next_id in (b"0-0", "0-0"):
+            break
+        start_id = next_id
 
-                        inner_json_str = match.group(1)
-                        outer_json = json.loads(inner_json_str)
-                        body_json = json.loads(outer_json["body"])
+    if claimed:
+        print(f"Reclaimed {claimed} pending messages")
 
-                        if not body_json:
-                            continue
+    return claimed
 
-                        event_type = body_json.get(b"eventType") or body_json.get(
-                            "eventType"
-                        )
-                        payload = body_json.get(b"payload") or body_json.get("payload")
 
-                        if isinstance(event_type, bytes):
-                            event_type = event_type.decode()
+def database_available() -> bool:
+    """
+    Check that the database answers before claiming pending entries.
+
+    Every XAUTOCLAIM counts as a delivery, so reclaiming during a database
+    outage would push healthy entries past MAX_DELIVERIES into the
+    dead-letter stream.
+    """
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return True
+    except DatabaseError as e:
+        print(f"Database unavailable, skipping the reclaim pass: {e}")
+        connections.close_all()
+        return False
+
+
+def log_identity_cache_stats() -> None:
+    """Print the hit ratio of the driver/block/product lookups of this process."""
+    stats = order_service.cache.stats()
+    if stats["hits"] + stats["misses"]:
+        print(
+            f"Identity cache hit ratio {stats['hitRatio']:.1%} "
+            f"({stats['hits']} hits, {stats['misses']} misses, {stats['size']} entries)"
+        )
+
+
+def request_stop() -> None:
+    """Ask the consumer loop to exit once the batch in progress is acked."""
+    _stop_event.set()
+
+
+def read_stream_stats(r: redis.Redis) -> Dict[str, Any]:
+    """
+    Read the backlog of the stream and of the consumer group.
+
+    Returns:
+        Dict[str, Any]: length of the stream, lag and pending entries of the
+            group (lag is None before Redis 7), idle ms of the oldest pending
+            entry and (name, pending, idle ms) of each consumer
+    """
+    stats: Dict[str, Any] = {
+        "length": r.xlen(STREAM),
+        "lag": None,
+        "pending": 0,
+        "oldest_pending_idle_ms": None,
+        "consumers": [],
+    }
+
+    for group in r.xinfo_groups(STREAM):
+        if _event_id(group["name"]) == GROUP:
+            stats["pending"] = group["pending"]
+            stats["lag"] = group.get("lag")
+
+    if stats["pending"]:
+        oldest = r.xpending_range(STREAM, GROUP, "-", "+", 1)
+        if oldest:
+            stats["oldest_pending_idle_ms"] = oldest[0]["time_since_delivered"]
+
+        stats["consumers"] = [
+            (_event_id(c["name"]), c["pending"], c["idle"])
+            for c in r.xinfo_consumers(STREAM, GROUP)
+        ]
+
+    return stats
 
-                        if isinstance(payload, bytes):
-                            payload = json.loads(payload.decode())
-                        elif isinstance(payload, str):
-                            payload = json.loads(payload)
 
-                        print(f"Processing event: {event_type}")
-                        print(f"Payload: {payload}")
+def update_stream_metrics(r: redis.Redis) -> None:
+    """Copy the stream and group backlog into the gauges."""
+    stats = read_stream_stats(r)
 
-                        # Handle the event
-                        handle_event(msg_id, event_type, payload)
+    STREAM_LENGTH.set(stats["length"])
+    PENDING_ENTRIES.set(stats["pending"])
+    OLDEST_PENDING_SECONDS.set((stats["oldest_pending_idle_ms"] or 0) / 1000)
+    if stats["lag"] is not None:
+        STREAM_LAG.set(stats["lag"])
 
-                        # Send event to Django-Q for async processing
-                        dispatch_to_q(msg_id, event_type, payload)
 
-                        # Acknowledge the message
-                        r.xack(STREAM, GROUP, msg_id)
+def update_cache_metrics() -> None:
+    """Copy the identity and response cache counters into the gauges."""
+    stats = order_service.cache.stats()
 
-                    except json.JSONDecodeError as e:
-                        print(f"JSON decode error in message {msg_id}: {e}")
-                    except Exception as e:
-                        print(f"Error processing message {msg_id}: {e}")
+    IDENTITY_CACHE.set(stats["hits"], stat="hits")
+    IDENTITY_CACHE.set(stats["misses"], stat="misses")
+    IDENTITY_CACHE.set(stats["size"], stat="entries")
+    IDENTITY_CACHE_HIT_RATIO.set(stats["hitRatio"])
+    RESPONSE_CACHE_INVALIDATIONS.set(
+        order_service.response_cache.stats()["invalidations"]
+    )
+
+
+def retry_delay(failures: int) -> float:
+    """Exponential backoff after `failures` consecutive failed iterations."""
+    return min(RETRY_BACKOFF * 2 ** (failures - 1), RETRY_BACKOFF_MAX)
+
+
+def run(consumer_name: str = CONSUMER_NAME, metrics_port: int = METRICS_PORT):
+    start_metrics_server(metrics, metrics_port)
+    r = get_redis(REDIS_URL)
+    group_ready = False
+    next_reclaim = 0.0
+    failures = 0
+
+    while not _stop_event.is_set():
+        try:
+            # Created here so a Redis server still starting is retried too
+            if not group_ready:
+                ensure_group(r)
+                group_ready = True
+
+            # Periodically pick up entries that other consumers never acked
+            if time.monotonic() >= next_reclaim:
+                next_reclaim = time.monotonic() + RECLAIM_INTERVAL
+                close_old_connections()
+                if database_available():
+                    reclaim_pending(r, consumer_name)
+                update_stream_metrics(r)
+                update_cache_metrics()
+                log_identity_cache_stats()
+
+            resp = r.xreadgroup(
+                GROUP,
+                consumer_name,
+                streams={STREAM: ">"},
+                count=BATCH_SIZE,
+                block=BLOCK_MS,
+            )
+            failures = 0
+
+            if not resp:
+                continue
+
+            for stream_name, messages in resp:
+                # Drop the DB connection when it is past CONN_MAX_AGE or broken;
+                # a reused one is health checked before the batch queries
+                close_old_connections()
+                acked = process_batch(messages, r)
+
+                # Acknowledge every message of the batch that succeeded
+                ack_messages(r, acked)
         except Exception as e:
-            print(f"Error in Redis consumer: {e}")
-            import time
+            LOOP_ERRORS.inc()
+            failures += 1
+            delay = retry_delay(failures)
+            print(f"Error in Redis consumer: {e}, retrying in {delay:.1f}s")
+
+            # Reconnect on the next batch, e.g. after a MySQL restart
+            if is_connection_error(e):
+                connections.close_all()
+            _stop_event.wait(delay)
 
-            time.sleep(5)  # Prevent tight loop on errors
+    print(f"Redis consumer {consumer_name} stopped")
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .helpers.identity_cache_helper import identity_cache
+from .models import Block, Driver, Product
+
+
+@receiver(post_save, sender=Driver)
+@receiver(post_save, sender=Block)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Driver)
+@receiver(post_delete, sender=Block)
+@receiver(post_delete, sender=Product)
+def invalidate_identity_cache(sender, instance, created=False, **kwargs):
+    """Drop changed drivers, blocks and products from the ingestion cache."""
+    # A new row cannot be cached yet, no process has to drop anything
+    if created:
+        return
+    identity_cache.invalidate(sender, instance.pk)
@@ -1,27 +1,75 @@
+import os
+from typing import Iterable, List, Tuple
+
 from django.db import IntegrityError, transaction
 from django_q.tasks import async_task
 
+from .helpers.redis_pool_helper import enqueue_tasks
 from .models import RedisOutbox
+from .services.outbox_retention_service import OutboxRetentionService
+
+# Events per process_events_batch_q task
+Q_BATCH_SIZE = int(os.getenv("Q_BATCH_SIZE", 500))
 
 
 def process_event_q(event_id: str, event_type: str, payload: dict):
     try:
+        # Insert first and let the unique event_id reject duplicates
         with transaction.atomic():
-            obj, created = RedisOutbox.objects.get_or_create(
+            RedisOutbox.objects.create(
                 event_id=event_id,
-                defaults={
-                    "event_type": event_type,
-                    "payload": payload,
-                    "received": True,
-                },
+                event_type=event_type,
+                payload=payload,
+                received=True,
             )
-
-            if not created:
-                return f"Q: Event {event_id} already exists"
     except IntegrityError:
-        return f"Q: Event {event_id} race handled"
+        return f"Q: Event {event_id} already exists"
     return f"Q: Event {event_id} stored"
 
 
 def dispatch_to_q(event_id, event_type, payload):
     async_task("service_app.tasks.process_event_q", event_id, event_type, payload)
+
+
+def process_events_batch_q(events: List[Tuple[str, str, dict]]):
+    """
+    Store a batch of events in the outbox with a single bulk insert.
+
+    Events already stored (same event_id) are skipped by the database.
+    """
+    RedisOutbox.objects.bulk_create(
+        [
+            RedisOutbox(
+                event_id=event_id,
+                event_type=event_type,
+                payload=payload,
+                received=True,
+            )
+            for event_id, event_type, payload in events
+        ],
+        ignore_conflicts=True,
+    )
+    return f"Q: Batch of {len(events)} events stored"
+
+
+def dispatch_batch_to_q(events: Iterable[Tuple[str, str, dict]]) -> int:
+    """
+    Enqueue process_events_batch_q tasks of at most Q_BATCH_SIZE events.
+
+    The tasks of one call are pipelined with a Redis broker.
+
+    :param events: (event_id, event_type, payload) of each event
+    :return: Number of tasks enqueued
+    """
+    events = [tuple(event) for event in events]
+    chunks = []
+    for start in range(0, len(events), Q_BATCH_SIZE):
+        end = start + Q_BATCH_SIZE
+        chunks.append((events[start:end],))
+    return enqueue_tasks("service_app.tasks.process_events_batch_q", chunks)
+
+
+def purge_outbox_q():
+    """Scheduled outbox retention (see outbox_retention_command --schedule)."""
+    result = OutboxRetentionService().purge()
+    return f"Q: Outbox retention deleted {result['deleted']} rows"
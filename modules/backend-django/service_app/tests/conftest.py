@@ -1,9 +1,29 @@
 import pytest
 from rest_framework.test import APIClient
+from ..helpers.identity_cache_helper import identity_cache
+from ..helpers.response_cache_helper import response_cache
 from ..models import Block, Order, Driver, Product
 from django.utils import timezone
 
 
+@pytest.fixture(autouse=True)
+def local_response_cache(settings):
+    """The shared Redis cache is not available in tests: use process memory."""
+    settings.CACHES = {
+        settings.RESPONSE_CACHE_ALIAS: settings.CACHE_BACKENDS["locmem"],
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches(local_response_cache):
+    """Rows created or rolled back by a test must not leak into the next one."""
+    identity_cache.clear()
+    response_cache.clear()
+    yield
+    identity_cache.clear()
+    response_cache.clear()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
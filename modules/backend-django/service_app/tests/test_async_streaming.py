@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from rest_framework import status
+
+
+async def get_streamed(async_client, url: str):
+    """GET through the ASGI handler and read the async streamed body."""
+    response = await async_client.get(url)
+    body = b"".join([chunk async for chunk in response.streaming_content])
+    return response, json.loads(body)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncStreaming:
+    @pytest.fixture(autouse=True)
+    def asgi_mode(self, settings):
+        settings.SERVER_MODE = "asgi"
+
+    @pytest.fixture
+    def orders(self, order_factory, block_factory, driver_factory, product_factory):
+        driver = driver_factory()
+        product = product_factory()
+        blocks = [block_factory(name="A"), block_factory(name="B")]
+
+        for i in range(5):
+            order = order_factory(
+                code=f"ORD-{i}",
+                status="IN_DISPATCH",
+                block=blocks[i % 2],
+                driver=driver,
+            )
+            order.products.add(product)
+
+    @pytest.mark.parametrize("url_name", ["dispatch-list", "distribution-blocks-list"])
+    def test_async_stream_matches_regular_list(
+        self, api_client, async_client, orders, url_name
+    ):
+        url = reverse(url_name)
+        regular = api_client.get(url)
+
+        response, data = async_to_sync(get_streamed)(async_client, f"{url}?stream=true")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.is_async
+        assert data == json.loads(regular.content)
+
+    def test_async_stream_honours_orders_limit(self, async_client, orders):
+        url = reverse("distribution-blocks-list")
+
+        _, data = async_to_sync(get_streamed)(
+            async_client, f"{url}?stream=true&orders_limit=1"
+        )
+
+        assert [len(block["orders"]) for block in data] == [1, 1]
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+BLOCKS_URL = reverse("distribution-blocks-list")
+
+
+@pytest.mark.django_db
+class TestBlockDistributionViewSet:
+    @pytest.fixture
+    def blocks(self, order_factory, block_factory, driver_factory):
+        driver = driver_factory()
+        block_a = block_factory(name="A")
+        block_b = block_factory(name="B")
+        block_factory(name="C")
+
+        for i in range(3):
+            order_factory(
+                code=f"ORD-A{i}", status="DELIVERED", block=block_a, driver=driver
+            )
+        order_factory(code="ORD-B0", status="PENDING", block=block_b)
+
+        return block_a, block_b
+
+    def test_filtered_blocks_use_a_semi_join(self, api_client, blocks):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(f"{BLOCKS_URL}?status=DELIVERED")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [b["name"] for b in response.data] == ["A"]
+        assert len(response.data[0]["orders"]) == 3
+
+        block_query = next(
+            q["sql"]
+            for q in queries
+            if 'FROM "block"' in q["sql"] and "ORDER BY" in q["sql"]
+        )
+        assert "EXISTS" in block_query
+        assert "DISTINCT" not in block_query
+
+    def test_list_blocks_by_page(self, api_client, blocks):
+        response = api_client.get(f"{BLOCKS_URL}?page=2&page_size=2")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [b["name"] for b in response.data] == ["C"]
+
+    def test_orders_limit_per_block(self, api_client, blocks):
+        response = api_client.get(f"{BLOCKS_URL}?orders_limit=2")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [len(b["orders"]) for b in response.data] == [2, 1, 0]
+        assert [o["code"] for o in response.data[0]["orders"]] == ["ORD-A0", "ORD-A1"]
+
+    def test_streamed_page_matches_regular_response(self, api_client, blocks):
+        params = "page=1&page_size=2&orders_limit=2"
+        regular = api_client.get(f"{BLOCKS_URL}?{params}")
+        streamed = api_client.get(f"{BLOCKS_URL}?{params}&stream=true")
+
+        body = b"".join(streamed.streaming_content)
+        assert json.loads(body) == json.loads(regular.content)
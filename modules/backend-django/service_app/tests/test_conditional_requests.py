@@ -0,0 +1,121 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from ..helpers.response_cache_helper import response_cache
+from ..models import Order
+
+DISPATCH_URL = reverse("dispatch-list")
+CONSOLIDATION_URL = reverse("consolidation-list")
+BLOCKS_URL = reverse("distribution-blocks-list")
+DASHBOARD_URL = reverse("dashboard-list")
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+    @pytest.fixture
+    def orders(self, order_factory, block_factory, driver_factory):
+        block = block_factory()
+        driver = driver_factory()
+        return [
+            order_factory(code="ORD-901", status="IN_DISPATCH", block=block),
+            order_factory(
+                code="ORD-902", status="APPROVED", block=block, driver=driver
+            ),
+        ]
+
+    @pytest.mark.parametrize(
+        "url", [DISPATCH_URL, CONSOLIDATION_URL, BLOCKS_URL, DASHBOARD_URL]
+    )
+    def test_matching_etag_returns_not_modified(self, api_client, orders, url):
+        first = api_client.get(url)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first["ETag"]
+        assert first["Last-Modified"]
+
+        second = api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert second.status_code == status.HTTP_304_NOT_MODIFIED
+        assert second.content == b""
+
+    @pytest.mark.parametrize(
+        "url", [DISPATCH_URL, CONSOLIDATION_URL, BLOCKS_URL, DASHBOARD_URL]
+    )
+    def test_cache_hits_do_not_query_the_database(
+        self, api_client, orders, url, django_assert_num_queries
+    ):
+        first = api_client.get(url)
+
+        with django_assert_num_queries(0):
+            hit = api_client.get(url)
+            not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert hit.status_code == status.HTTP_200_OK
+        assert hit["X-Cache"] == "HIT"
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_if_modified_since_returns_not_modified(self, api_client, orders):
+        first = api_client.get(DISPATCH_URL)
+
+        second = api_client.get(
+            DISPATCH_URL, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+
+        assert second.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_etag_changes_when_an_order_leaves_the_listing(self, api_client, orders):
+        first = api_client.get(DISPATCH_URL)
+        before = response_cache.snapshot(orders[0])
+
+        Order.objects.filter(code="ORD-901").update(status="PENDING")
+        orders[0].refresh_from_db()
+        response_cache.invalidate_orders([before, response_cache.snapshot(orders[0])])
+        second = api_client.get(DISPATCH_URL, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second["ETag"] != first["ETag"]
+        assert [o["code"] for o in first.data] == ["ORD-901"]
+        assert second.data == []
+
+    def test_etag_always_matches_the_cached_body(self, api_client, orders):
+        first = api_client.get(DISPATCH_URL)
+
+        # Write that bypasses the invalidation: the cached body and its ETag
+        # are still served together until the entry expires
+        Order.objects.filter(code="ORD-901").update(status="PENDING")
+        stale = api_client.get(DISPATCH_URL)
+
+        assert stale["X-Cache"] == "HIT"
+        assert stale["ETag"] == first["ETag"]
+        assert stale.data == first.data
+
+        response_cache.clear()
+        fresh = api_client.get(DISPATCH_URL, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert fresh.status_code == status.HTTP_200_OK
+        assert fresh["ETag"] != first["ETag"]
+        assert fresh.data == []
+
+    def test_miss_answers_not_modified_without_building(
+        self, api_client, orders, django_assert_num_queries
+    ):
+        first = api_client.get(DISPATCH_URL)
+        response_cache.clear()
+
+        # One aggregate query for the validators, no listing query
+        with django_assert_num_queries(1):
+            second = api_client.get(DISPATCH_URL, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert second.status_code == status.HTTP_304_NOT_MODIFIED
+        assert second["X-Cache"] == "MISS"
+
+    def test_etag_changes_when_an_order_is_saved(self, api_client, orders):
+        first = api_client.get(DISPATCH_URL)
+
+        orders[0].save()
+        response_cache.clear()
+        second = api_client.get(DISPATCH_URL, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second["ETag"] != first["ETag"]
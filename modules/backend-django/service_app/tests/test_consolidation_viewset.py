@@ -129,3 +129,49 @@ class TestConsolidationViewSet:
         product_names = {p["Name"] for p in response.data[0]["orders"][0]["products"]}
         assert "Laptop" in product_names
         assert "Mouse" in product_names
+
+    def test_list_consolidation_groups_by_driver_and_block(
+        self, api_client, order_factory, block_factory, driver_factory
+    ):
+        block = block_factory()
+        driver = driver_factory()
+
+        order_factory(code="ORD-401", status="APPROVED", block=block, driver=driver)
+        order_factory(code="ORD-402", status="APPROVED", block=block, driver=driver)
+        order_factory(code="ORD-403", status="APPROVED", block=block)
+
+        response = api_client.get(CONSOLIDATION_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 2
+
+        with_driver, without_driver = response.data
+        assert with_driver["driver"]["id"] == driver.id
+        assert with_driver["blockId"] == block.id
+        assert with_driver["total"] == 2
+        assert with_driver["approved"] == 2
+        assert with_driver["pending"] == 0
+        assert [o["code"] for o in with_driver["orders"]] == ["ORD-401", "ORD-402"]
+        assert without_driver["driver"] is None
+        assert without_driver["total"] == 1
+
+    def test_list_consolidation_paginates_groups(
+        self, api_client, order_factory, block_factory, driver_factory,
+        django_assert_max_num_queries
+    ):
+        block = block_factory()
+        for i in range(3):
+            driver = driver_factory(license_plate=f"PLT-{i}")
+            order_factory(code=f"ORD-50{i}", status="APPROVED", block=block, driver=driver)
+
+        with django_assert_max_num_queries(4):
+            response = api_client.get(f"{CONSOLIDATION_URL}?page=2&page_size=2")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+        assert response.data[0]["orders"][0]["code"] == "ORD-502"
+
+    def test_list_consolidation_rejects_invalid_page(self, api_client):
+        response = api_client.get(f"{CONSOLIDATION_URL}?page=0")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,94 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+import pytest
+
+from ..services.consumer_pool_service import ConsumerPool
+
+
+def sleeping_worker(consumer_name, metrics_port):
+    """Worker that runs until it is terminated."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    time.sleep(60)
+
+
+def crashing_worker_in(directory):
+    """Worker that records its start in directory, then crashes."""
+
+    def worker(consumer_name, metrics_port):
+        with open(os.path.join(directory, consumer_name), "a") as f:
+            f.write(f"{metrics_port}\n")
+        os._exit(1)
+
+    return worker
+
+
+def stop_after(seconds):
+    """Send SIGTERM to this process, as a process manager would."""
+    timer = threading.Timer(seconds, os.kill, (os.getpid(), signal.SIGTERM))
+    timer.start()
+    return timer
+
+
+@pytest.fixture(autouse=True)
+def restore_signal_handlers():
+    handlers = {
+        signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    yield
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+
+
+def build_pool(workers, target, **kwargs):
+    return ConsumerPool(
+        workers,
+        consumer_prefix="worker",
+        restart_delay=0,
+        shutdown_timeout=5,
+        metrics_port=kwargs.pop("metrics_port", 0),
+        target=target,
+        poll_interval=0.05,
+        **kwargs,
+    )
+
+
+class TestConsumerPool:
+    def test_consumer_names_start_with_the_hostname(self):
+        pool = build_pool(2, sleeping_worker, metrics_port=9100)
+
+        hostname = socket.gethostname()
+        assert pool.consumer_name(1) == f"{hostname}-worker-1"
+        assert pool.consumer_name(2) == f"{hostname}-worker-2"
+        assert [pool.metrics_port_of(i) for i in (1, 2)] == [9100, 9101]
+
+    def test_spawns_one_process_per_worker_and_stops_on_sigterm(self):
+        pool = build_pool(3, sleeping_worker)
+
+        stop_after(0.5)
+        pool.run()
+
+        processes = pool._processes
+        assert sorted(processes) == [1, 2, 3]
+        assert [processes[i].name for i in (1, 2, 3)] == [
+            pool.consumer_name(i) for i in (1, 2, 3)
+        ]
+        assert all(not p.is_alive() for p in processes.values())
+        assert {p.exitcode for p in processes.values()} == {-signal.SIGTERM}
+
+    def test_restarts_crashed_workers_under_the_same_name(self, tmp_path):
+        pool = build_pool(2, crashing_worker_in(str(tmp_path)), metrics_port=9100)
+
+        stop_after(0.5)
+        pool.run()
+
+        starts = {
+            name: (tmp_path / name).read_text().split() for name in os.listdir(tmp_path)
+        }
+        assert sorted(starts) == [pool.consumer_name(1), pool.consumer_name(2)]
+        assert len(starts[pool.consumer_name(1)]) > 1
+        assert set(starts[pool.consumer_name(1)]) == {"9100"}
+        assert set(starts[pool.consumer_name(2)]) == {"9101"}
@@ -64,3 +64,48 @@ class TestDashboardViewSet:
         for field in expected_fields:
             assert field in data
         assert data["code"] == "ORD-100"
+
+    def test_list_dashboard_returns_aggregates(self, api_client, order_factory, block_factory):
+        block_x = block_factory(name="Block X")
+        block_y = block_factory(name="Block Y")
+        order_factory(code="ORD-020", status="COMPLETED", block=block_x)
+        order_factory(code="ORD-021", status="APPROVED", block=block_x)
+        order_factory(code="ORD-022", status="PENDING", block=block_y)
+
+        response = api_client.get(DASHBOARD_URL)
+
+        assert response.status_code == 200
+        assert response.data["totalOrders"] == 3
+        assert response.data["byStatus"]["COMPLETED"] == 1
+        assert response.data["byStatus"]["PENDING"] == 1
+        assert response.data["byStatus"]["REJECTED"] == 0
+        assert response.data["byBlock"] == [
+            {"blockId": block_x.id, "blockName": "Block X", "total": 2},
+            {"blockId": block_y.id, "blockName": "Block Y", "total": 1},
+        ]
+        assert sum(day["total"] for day in response.data["byDay"]) == 3
+
+    def test_list_dashboard_filters_points_by_bbox(self, api_client, order_factory):
+        order_factory(code="ORD-030", status="PENDING", latitude=9.9, longitude=-84.1)
+        order_factory(code="ORD-031", status="PENDING", latitude=19.4, longitude=-99.1)
+
+        response = api_client.get(f"{DASHBOARD_URL}?bbox=-85,9,-83,11")
+
+        assert response.status_code == 200
+        assert [o["code"] for o in response.data["orders"]] == ["ORD-030"]
+        assert response.data["totalOrders"] == 2
+
+    def test_list_dashboard_limits_points(self, api_client, order_factory):
+        for i in range(3):
+            order_factory(code=f"ORD-04{i}", status="PENDING")
+
+        response = api_client.get(f"{DASHBOARD_URL}?limit=2")
+
+        assert response.status_code == 200
+        assert len(response.data["orders"]) == 2
+        assert response.data["truncated"] is True
+
+    def test_list_dashboard_rejects_invalid_bbox(self, api_client):
+        response = api_client.get(f"{DASHBOARD_URL}?bbox=1,2,3")
+
+        assert response.status_code == 400
@@ -0,0 +1,101 @@
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from ..helpers.date_range_helper import date_range_filter, day_range
+
+SHIPPING_URL = reverse("shipping-list")
+DISPATCH_URL = reverse("dispatch-list")
+BLOCKS_URL = reverse("distribution-blocks-list")
+
+
+class TestDayRange:
+    def test_day_range_uses_active_timezone(self):
+        with timezone.override(ZoneInfo("America/Costa_Rica")):
+            start, end = day_range(date(2025, 8, 12), date(2025, 8, 12))
+
+        assert start == datetime(2025, 8, 12, 6, tzinfo=ZoneInfo("UTC"))
+        assert end - start == timedelta(days=1)
+
+    def test_open_ended_range(self):
+        start, end = day_range(date(2025, 8, 12), None)
+
+        assert start is not None
+        assert end is None
+
+    def test_last_representable_day_has_no_upper_bound(self):
+        start, end = day_range(date.max, date.max)
+
+        assert start == timezone.make_aware(
+            datetime.combine(date.max, datetime.min.time())
+        )
+        assert end is None
+
+    def test_date_range_filter_has_no_date_transform(self):
+        filters = date_range_filter("dispatch_date", date_str="2025-08-12")
+
+        lookups = {key for key, _ in filters.children}
+        assert lookups == {"dispatch_date__gte", "dispatch_date__lt"}
+
+    def test_date_range_filter_rejects_invalid_dates(self):
+        with pytest.raises(ValueError):
+            date_range_filter("dispatch_date", date_from_str="2025-13-01")
+
+
+@pytest.mark.django_db
+class TestDateRangeFiltering:
+    @pytest.fixture
+    def orders(self, order_factory, block_factory):
+        block = block_factory()
+        base = timezone.make_aware(datetime(2025, 8, 10, 12))
+        for i in range(4):
+            order_factory(
+                code=f"ORD-60{i}",
+                status="COMPLETED",
+                block=block,
+                dispatch_date=base + timedelta(days=i),
+            )
+
+    def test_filters_by_inclusive_date_range(self, api_client, orders):
+        response = api_client.get(
+            f"{SHIPPING_URL}?date_from=2025-08-11&date_to=2025-08-12"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [o["code"] for o in response.data] == ["ORD-601", "ORD-602"]
+
+    def test_filters_by_single_day_at_day_boundaries(
+        self, api_client, order_factory, block_factory
+    ):
+        block = block_factory()
+        day = timezone.make_aware(datetime(2025, 8, 12))
+        order_factory(
+            code="ORD-701", status="COMPLETED", block=block, dispatch_date=day
+        )
+        order_factory(
+            code="ORD-702",
+            status="COMPLETED",
+            block=block,
+            dispatch_date=day + timedelta(days=1),
+        )
+
+        response = api_client.get(f"{SHIPPING_URL}?date=2025-08-12")
+
+        assert [o["code"] for o in response.data] == ["ORD-701"]
+
+    @pytest.mark.parametrize("url", [DISPATCH_URL, BLOCKS_URL])
+    def test_last_representable_day_is_not_an_error(self, api_client, orders, url):
+        response = api_client.get(f"{url}?date=9999-12-31")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == []
+
+    def test_invalid_date_returns_no_orders(self, api_client, orders):
+        response = api_client.get(f"{SHIPPING_URL}?date_from=not-a-date")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == []
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from ..helpers.envelope_helper import (
+    EnvelopeDecodeError,
+    EnvelopeDecoder,
+    JsonEnvelopeDecoder,
+    PhpSerializedEnvelopeDecoder,
+    get_envelope_decoder,
+)
+
+PAYLOAD = {
+    "order_id": 1,
+    "destination": 'Av. "Central";  Peñalolén ✓',
+    "products": [1, 2],
+}
+
+
+def build_envelope(payload=PAYLOAD):
+    body = json.dumps(
+        {"eventType": "order.created", "payload": payload}, ensure_ascii=False
+    )
+    return json.dumps({"body": body, "headers": {}}, ensure_ascii=False)
+
+
+def php_serialize(envelope):
+    return f's:{len(envelope.encode("utf-8"))}:"{envelope}";'.encode("utf-8")
+
+
+class TestEnvelopeDecoders:
+    def test_php_decoder_handles_quotes_and_multibyte_characters(self):
+        raw = php_serialize(build_envelope())
+
+        assert PhpSerializedEnvelopeDecoder().decode(raw) == ("order.created", PAYLOAD)
+
+    def test_php_decoder_rejects_length_mismatch(self):
+        envelope = build_envelope()
+        raw = f's:{len(envelope)}:"{envelope}";'.encode("utf-8")
+
+        with pytest.raises(EnvelopeDecodeError):
+            PhpSerializedEnvelopeDecoder().decode(raw)
+
+    def test_php_decoder_rejects_non_php_strings(self):
+        with pytest.raises(EnvelopeDecodeError):
+            PhpSerializedEnvelopeDecoder().decode(b"garbage")
+
+    def test_json_decoder_decodes_plain_envelope(self):
+        raw = build_envelope().encode("utf-8")
+
+        assert JsonEnvelopeDecoder().decode(raw) == ("order.created", PAYLOAD)
+
+    def test_decoders_decode_payload_encoded_as_string(self):
+        raw = php_serialize(build_envelope(payload=json.dumps(PAYLOAD)))
+
+        assert get_envelope_decoder("php", loads=json.loads).decode(raw)[1] == PAYLOAD
+
+    def test_base_decoder_cannot_be_instantiated(self):
+        with pytest.raises(TypeError):
+            EnvelopeDecoder()
+
+    def test_get_envelope_decoder_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            get_envelope_decoder("xml")
@@ -0,0 +1,56 @@
+import pytest
+
+from ..services.idempotency_service import (
+    MemoryRecentIdsFilter,
+    RecentIdsFilter,
+    RedisBloomFilter,
+)
+
+
+class FakeBitmapPipeline:
+    def __init__(self, bitmaps):
+        self.bitmaps = bitmaps
+        self.results = []
+
+    def getbit(self, key, offset):
+        self.results.append(int(offset in self.bitmaps.get(key, set())))
+
+    def setbit(self, key, offset, value):
+        self.bitmaps.setdefault(key, set()).add(offset)
+        self.results.append(0)
+
+    def expire(self, key, seconds):
+        self.results.append(True)
+
+    def execute(self):
+        return self.results
+
+
+class FakeBitmapRedis:
+    def __init__(self):
+        self.bitmaps = {}
+
+    def pipeline(self, transaction=True):
+        return FakeBitmapPipeline(self.bitmaps)
+
+
+class TestRecentIdsFilters:
+    def test_memory_filter_forgets_oldest_ids(self):
+        recent = MemoryRecentIdsFilter(maxsize=2)
+        recent.add(["1-0", "2-0", "3-0"])
+
+        assert recent.seen(["1-0", "2-0", "3-0"]) == {"2-0", "3-0"}
+
+    def test_bloom_filter_finds_added_ids(self):
+        bloom = RedisBloomFilter(FakeBitmapRedis(), bits=2**16)
+        bloom.add(["1-0", "2-0"])
+
+        assert bloom.seen(["1-0", "2-0", "3-0"]) == {"1-0", "2-0"}
+
+    def test_filter_must_implement_seen_and_add(self):
+        class SeenOnlyFilter(RecentIdsFilter):
+            def seen(self, event_ids):
+                return set()
+
+        with pytest.raises(TypeError):
+            SeenOnlyFilter()
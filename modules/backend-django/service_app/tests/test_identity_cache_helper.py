@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+from ..helpers.identity_cache_helper import IdentityCache
+from ..models import Block, Driver
+from ..services.order_service import OrderService
+
+
+class TestIdentityCache:
+    def test_cache_evicts_least_recently_used_entries(self):
+        cache = IdentityCache(maxsize=2)
+        first, second, third = Block(id=1), Block(id=2), Block(id=3)
+
+        cache.set_many([first, second])
+        cache.get(Block, 1)
+        cache.set_many([third])
+
+        assert cache.get(Block, 1) is first
+        assert cache.get(Block, 2) is None
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_cache_keys_include_the_model(self):
+        cache = IdentityCache()
+        cache.set_many([Block(id=1)])
+
+        assert cache.get(Driver, 1) is None
+
+    def test_entries_expire_after_the_ttl(self, monkeypatch):
+        cache = IdentityCache(ttl=60)
+        block = Block(id=1)
+        cache.set_many([block])
+
+        assert cache.get(Block, 1) is block
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+        assert cache.get(Block, 1) is None
+
+    def test_invalidation_reaches_other_processes(self):
+        # Two caches on the same shared backend stand for two processes
+        consumer, api = IdentityCache(version_interval=0), IdentityCache()
+        consumer.set_many([Block(id=1), Block(id=2), Driver(id=1)])
+        consumer.get(Block, 1)
+
+        api.invalidate(Block, 2)
+
+        assert consumer.get(Block, 1) is None
+        assert consumer.get(Block, 2) is None
+        assert consumer.get(Driver, 1) is not None
+
+    def test_shared_version_is_read_once_per_interval(self, monkeypatch):
+        consumer, api = IdentityCache(version_interval=5), IdentityCache()
+        reads = []
+        shared_version = consumer._shared_version
+        monkeypatch.setattr(
+            consumer,
+            "_shared_version",
+            lambda model: reads.append(model) or shared_version(model),
+        )
+        block = Block(id=1)
+        consumer.set_many([block])
+
+        for _ in range(10):
+            assert consumer.get(Block, 1) is block
+        api.invalidate(Block, 1)
+        assert consumer.get(Block, 1) is block
+        assert len(reads) == 1
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+
+        assert consumer.get(Block, 1) is None
+        assert len(reads) == 2
+
+    def test_lookups_survive_an_unreachable_shared_cache(self, monkeypatch):
+        class UnreachableCaches:
+            def __getitem__(self, alias):
+                raise ConnectionError("Redis is down")
+
+        monkeypatch.setattr(
+            "service_app.helpers.identity_cache_helper.caches", UnreachableCaches()
+        )
+        cache = IdentityCache(version_interval=0)
+        block = Block(id=1)
+        cache.set_many([block])
+
+        assert cache.get(Block, 1) is block
+        cache.invalidate(Block, 1)
+        assert cache.get(Block, 1) is None
+
+
+@pytest.mark.django_db
+class TestOrderServiceIdentityCache:
+    def test_cached_lookups_skip_the_database(
+        self, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        service = OrderService(cache=IdentityCache())
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service._get_or_create_driver(1)
+
+        with django_assert_num_queries(0):
+            assert service._get_or_create_driver(1).id == 1
+
+    def test_saving_an_instance_invalidates_the_cache(
+        self, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        cache = IdentityCache()
+        monkeypatch.setattr("service_app.signals.identity_cache", cache)
+        service = OrderService(cache=cache)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            block = service._get_or_create_block(1)
+
+        block.name = "Renamed"
+        block.save()
+
+        assert cache.get(Block, 1) is None
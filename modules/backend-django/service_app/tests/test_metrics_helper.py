@@ -0,0 +1,93 @@
+import socket
+from urllib.request import urlopen
+
+import pytest
+
+from ..helpers.metrics_helper import Metric, MetricsRegistry, start_metrics_server
+
+
+class TestMetricsRegistry:
+    def test_counters_and_gauges_render_per_label_set(self):
+        registry = MetricsRegistry()
+        messages = registry.counter("messages_total", "Messages")
+        lag = registry.gauge("lag", "Lag")
+
+        messages.inc(result="processed")
+        messages.inc(2, result="processed")
+        messages.inc(result="failed")
+        lag.set(7)
+        lag.set(3)
+
+        assert registry.render().splitlines() == [
+            "# HELP messages_total Messages",
+            "# TYPE messages_total counter",
+            'messages_total{result="failed"} 1',
+            'messages_total{result="processed"} 3',
+            "# HELP lag Lag",
+            "# TYPE lag gauge",
+            "lag 3",
+        ]
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        seconds = registry.histogram("seconds", "Seconds", buckets=(0.1, 1))
+
+        for value in (0.05, 0.1, 0.5, 2):
+            seconds.observe(value, phase="db")
+
+        lines = registry.render().splitlines()
+        assert lines[2:] == [
+            'seconds_bucket{phase="db",le="0.1"} 2',
+            'seconds_bucket{phase="db",le="1"} 3',
+            'seconds_bucket{phase="db",le="+Inf"} 4',
+            'seconds_sum{phase="db"} 2.65',
+            'seconds_count{phase="db"} 4',
+        ]
+        assert seconds.count(phase="db") == 4
+
+    def test_histogram_times_a_block(self):
+        registry = MetricsRegistry()
+        seconds = registry.histogram("seconds", "Seconds")
+
+        with seconds.time(phase="ack"):
+            pass
+
+        assert seconds.count(phase="ack") == 1
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors").inc(reason='bad "quote"')
+
+        assert 'errors_total{reason="bad \\"quote\\""} 1' in registry.render()
+
+    def test_metric_without_samples_cannot_be_instantiated(self):
+        with pytest.raises(TypeError):
+            Metric("untyped_total", "Untyped")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestMetricsServer:
+    def test_server_exposes_the_registry(self):
+        registry = MetricsRegistry()
+        registry.counter("events_total", "Events").inc(5)
+        port = free_port()
+
+        server = start_metrics_server(registry, port, host="127.0.0.1")
+        try:
+            with urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert "events_total 5" in body
+        assert content_type.startswith("text/plain; version=0.0.4")
+
+    def test_port_zero_disables_the_server(self):
+        assert start_metrics_server(MetricsRegistry(), 0) is None
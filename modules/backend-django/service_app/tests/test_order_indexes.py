@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ..services.dashboard_service import DashboardService
+from ..viewsets.process_viewsets import (
+    ConsolidationViewSet,
+    DispatchViewSet,
+    DistributionOrdersViewSet,
+    PreparationViewSet,
+    ReceivingViewSet,
+    ShippingViewSet,
+)
+
+ORDER_TABLE = "order"
+
+
+def build_view(viewset_class, **params):
+    view = viewset_class()
+    view.request = Request(APIRequestFactory().get("/", params))
+    view.format_kwarg = None
+    return view
+
+
+def order_table_plan(queryset):
+    """
+    Return (access, index) for each read of the order table in the query plan.
+
+    ``access`` is "scan" for a full table scan and "index" otherwise.
+    """
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            details = [row[-1] for row in cursor.fetchall()]
+            return [
+                ("index" if " USING " in detail else "scan", detail)
+                for detail in details
+                if detail.split()[:2]
+                in (["SCAN", ORDER_TABLE], ["SEARCH", ORDER_TABLE])
+            ]
+
+        if connection.vendor == "mysql":
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return [
+                ("scan" if row["type"] == "ALL" else "index", row["key"])
+                for row in rows
+                if row["table"] == ORDER_TABLE
+            ]
+
+    pytest.skip(f"No query plan check for {connection.vendor}")
+
+
+@pytest.mark.django_db
+class TestOrderIndexes:
+    @pytest.mark.parametrize(
+        "viewset_class",
+        [
+            DispatchViewSet,
+            PreparationViewSet,
+            ShippingViewSet,
+            ReceivingViewSet,
+            DistributionOrdersViewSet,
+        ],
+    )
+    @pytest.mark.parametrize(
+        "params",
+        [{}, {"driver": "1"}, {"block": "1"}, {"date": "2025-08-12"}],
+    )
+    def test_process_endpoint_queries_use_an_index(self, viewset_class, params):
+        queryset = build_view(viewset_class, **params).get_queryset()
+
+        plan = order_table_plan(queryset)
+
+        assert plan
+        assert all(access == "index" for access, _ in plan), plan
+
+    def test_consolidation_group_query_uses_an_index(self):
+        queryset = build_view(ConsolidationViewSet).get_group_queryset()
+
+        plan = order_table_plan(queryset)
+
+        assert plan
+        assert all(access == "index" for access, _ in plan), plan
+
+    @pytest.mark.parametrize("bbox", [None, (-71.0, -34.0, -70.0, -33.0)])
+    def test_dashboard_points_query_uses_the_dispatch_index(self, bbox):
+        queryset = DashboardService.points_queryset(bbox)[:10]
+
+        plan = order_table_plan(queryset)
+
+        assert plan
+        assert all(access == "index" for access, _ in plan), plan
+        assert "order_dispatch_idx" in plan[0][1]
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+DISPATCH_URL = reverse("dispatch-list")
+
+
+@pytest.mark.django_db
+class TestOrderKeysetPagination:
+    def test_list_keeps_plain_response_without_pagination_params(
+        self, api_client, order_factory, block_factory
+    ):
+        order_factory(code="ORD-001", status="IN_DISPATCH", block=block_factory())
+
+        response = api_client.get(DISPATCH_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data, list)
+
+    def test_cursor_pages_follow_dispatch_date_and_id(
+        self, api_client, order_factory, block_factory
+    ):
+        block = block_factory()
+        now = timezone.now()
+        order_factory(
+            code="ORD-3", status="IN_DISPATCH", block=block, dispatch_date=now
+        )
+        order_factory(
+            code="ORD-1", status="IN_DISPATCH", block=block, dispatch_date=None
+        )
+        order_factory(
+            code="ORD-4", status="IN_DISPATCH", block=block, dispatch_date=now
+        )
+        order_factory(
+            code="ORD-2",
+            status="IN_DISPATCH",
+            block=block,
+            dispatch_date=now - timedelta(days=1),
+        )
+        order_factory(
+            code="ORD-5",
+            status="IN_DISPATCH",
+            block=block,
+            dispatch_date=now + timedelta(days=1),
+        )
+
+        codes = []
+        url = f"{DISPATCH_URL}?page_size=2"
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data["results"]) <= 2
+
+            codes += [o["code"] for o in response.data["results"]]
+            url = response.data["next"]
+
+        assert codes == ["ORD-1", "ORD-2", "ORD-3", "ORD-4", "ORD-5"]
+
+    def test_invalid_cursor_returns_not_found(self, api_client):
+        response = api_client.get(f"{DISPATCH_URL}?cursor=not-a-cursor")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,113 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Block, Driver, Order, Product
+from ..services.order_service import OrderService
+
+
+def build_payload(order_id, driver_id=1, block_id=1, products=(1, 2)):
+    return {
+        "order_id": order_id,
+        "driver_id": driver_id,
+        "block_id": block_id,
+        "products": list(products),
+        "dispatch_date": "2025-08-12 10:00:00",
+    }
+
+
+@pytest.mark.django_db
+class TestUpsertOrders:
+    def test_upsert_orders_creates_orders_and_related_objects(self):
+        orders = OrderService().upsert_orders(
+            [
+                build_payload(100),
+                build_payload(101, driver_id=2, block_id=3, products=[3]),
+            ]
+        )
+
+        assert [o.id for o in orders] == [100, 101]
+        assert Driver.objects.count() == 2
+        assert Block.objects.filter(name="Block-3").exists()
+        assert Product.objects.count() == 3
+        assert set(Order.objects.get(id=100).products.values_list("id", flat=True)) == {
+            1,
+            2,
+        }
+        assert Order.objects.get(id=101).status == "APPROVED"
+        assert [o.code for o in orders] == ["PED-000100", "PED-000101"]
+
+    def test_upsert_orders_updates_existing_orders_and_products(
+        self, order_factory, block_factory, product_factory
+    ):
+        order = order_factory(code="ORD-001", status="PENDING", block=block_factory())
+        order.products.set([product_factory(sku="OLD")])
+
+        OrderService().upsert_orders([build_payload(order.id, products=[7, 8])])
+
+        order.refresh_from_db()
+        assert order.status == "APPROVED"
+        assert order.driver_id == 1
+        assert set(order.products.values_list("id", flat=True)) == {7, 8}
+
+    def test_upsert_orders_query_count_does_not_grow_with_batch_size(self):
+        service = OrderService()
+
+        with CaptureQueriesContext(connection) as small:
+            service.upsert_orders(
+                [
+                    build_payload(i, driver_id=i, block_id=i, products=[i])
+                    for i in range(1, 5)
+                ]
+            )
+        with CaptureQueriesContext(connection) as large:
+            service.upsert_orders(
+                [
+                    build_payload(i, driver_id=i, block_id=i, products=[i])
+                    for i in range(10, 60)
+                ]
+            )
+
+        assert len(large) == len(small)
+
+
+@pytest.mark.django_db
+class TestOrderCodes:
+    # Order ids whose PED-XXXX code is already used by another fixture order
+    FIXTURE_CODE_IDS = (302, 559, 1201, 18, 28)
+
+    @pytest.fixture
+    def fixture_orders(self):
+        for fixture in ("block_data", "driver_data", "product_data", "order_data"):
+            call_command("loaddata", fixture, verbosity=0)
+        return {order.pk: order.code for order in Order.objects.all()}
+
+    def test_events_for_ids_of_fixture_codes_create_orders(self, fixture_orders):
+        service = OrderService()
+
+        service.upsert_orders([build_payload(i) for i in self.FIXTURE_CODE_IDS[:3]])
+        for order_id in self.FIXTURE_CODE_IDS[3:]:
+            service.create_or_update_order(build_payload(order_id))
+
+        codes = list(Order.objects.values_list("code", flat=True))
+        assert Order.objects.filter(id__in=self.FIXTURE_CODE_IDS).count() == 5
+        assert len(codes) == len(set(codes))
+
+    def test_existing_orders_keep_their_code(self, fixture_orders):
+        OrderService().upsert_orders([build_payload(9), build_payload(10)])
+        OrderService().create_or_update_order(build_payload(11))
+
+        for order_id in (9, 10, 11):
+            assert Order.objects.get(id=order_id).code == fixture_orders[order_id]
+
+    def test_taken_codes_get_a_suffix(self, order_factory, block_factory):
+        block = block_factory()
+        order_factory(code="PED-000500", status="PENDING", block=block)
+        order_factory(code="PED-000500-1", status="PENDING", block=block)
+
+        orders = OrderService().upsert_orders([build_payload(500), build_payload(501)])
+        OrderService().create_or_update_order(build_payload(502))
+
+        assert [o.code for o in orders] == ["PED-000500-2", "PED-000501"]
+        assert Order.objects.get(id=502).code == "PED-000502"
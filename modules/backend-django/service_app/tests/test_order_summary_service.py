@@ -0,0 +1,147 @@
+from datetime import date
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import OrderDaySummary, OrderSummary
+from ..services.dashboard_service import DashboardService
+from ..services.order_service import OrderService
+from ..services.order_summary_service import OrderSummaryService
+
+CONSOLIDATION_URL = reverse("consolidation-list")
+DASHBOARD_URL = reverse("dashboard-list")
+DAY = date(2025, 8, 12)
+
+
+def build_payload(order_id, driver_id=1, block_id=1):
+    return {
+        "order_id": order_id,
+        "driver_id": driver_id,
+        "block_id": block_id,
+        "products": [1],
+        "dispatch_date": "2025-08-12 10:00:00",
+    }
+
+
+@pytest.mark.django_db
+class TestOrderSummaryService:
+    def test_ingestion_keeps_summary_up_to_date(self):
+        service = OrderService()
+        service.upsert_orders([build_payload(1), build_payload(2, driver_id=2)])
+        service.create_or_update_order(build_payload(1, driver_id=2))
+
+        assert OrderSummaryService().stored() == {(2, 1, "APPROVED"): 2}
+        assert OrderSummaryService().check() == {}
+
+    def test_status_change_moves_order_between_groups(
+        self, order_factory, block_factory
+    ):
+        block = block_factory()
+        order = order_factory(code="ORD-001", status="PENDING", block=block)
+        summary = OrderSummaryService()
+        summary.rebuild()
+
+        OrderService().create_or_update_order(
+            build_payload(order.id, block_id=block.id)
+        )
+
+        stored = summary.stored()
+        assert (0, block.id, "PENDING") not in stored
+        assert stored[(1, block.id, "APPROVED")] == 1
+        assert summary.check() == {}
+
+    def test_apply_changes_upserts_the_touched_groups(self):
+        OrderSummary.objects.create(driver_id=1, block_id=2, status="APPROVED", total=5)
+        OrderSummary.objects.create(driver_id=1, block_id=1, status="PENDING", total=1)
+        OrderDaySummary.objects.create(day=DAY, status="PENDING", total=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            OrderSummaryService().apply_changes(
+                [(1, 1, "PENDING", DAY)],
+                [(1, 1, "APPROVED", DAY), (2, 2, "APPROVED", None)],
+            )
+
+        # One statement per table, without reading or locking the groups first
+        assert [q["sql"].split()[:3] for q in queries.captured_queries] == [
+            ["INSERT", "INTO", '"order_summary"'],
+            ["INSERT", "INTO", '"order_day_summary"'],
+        ]
+        assert OrderSummaryService().stored() == {
+            (1, 2, "APPROVED"): 5,
+            (1, 1, "APPROVED"): 1,
+            (2, 2, "APPROVED"): 1,
+        }
+        assert OrderSummaryService().stored_days() == {(DAY, "APPROVED"): 1}
+
+    def test_ingestion_keeps_day_summary_up_to_date(self):
+        service = OrderService()
+        service.upsert_orders([build_payload(1), build_payload(2, driver_id=2)])
+        service.create_or_update_order(
+            {**build_payload(1), "dispatch_date": "2025-08-13 10:00:00"}
+        )
+
+        assert OrderSummaryService().stored_days() == {
+            (DAY, "APPROVED"): 1,
+            (date(2025, 8, 13), "APPROVED"): 1,
+        }
+        assert OrderSummaryService().check() == {}
+
+    def test_check_command_reports_drift_and_rebuild_fixes_it(
+        self, order_factory, block_factory, capsys
+    ):
+        order_factory(code="ORD-001", status="PENDING", block=block_factory())
+
+        with pytest.raises(CommandError):
+            call_command("order_summary_command", "--check")
+        assert "status=PENDING: stored=0 actual=1" in capsys.readouterr().out
+
+        call_command("order_summary_command")
+        call_command("order_summary_command", "--check")
+
+        assert OrderSummary.objects.get().total == 1
+        assert OrderDaySummary.objects.get().total == 1
+
+
+@pytest.mark.django_db
+class TestOrderSummaryReads:
+    @pytest.fixture(autouse=True)
+    def summary_reads(self, settings):
+        settings.ORDER_SUMMARY_READS = True
+
+    @pytest.fixture
+    def orders(self):
+        return OrderService().upsert_orders(
+            [
+                build_payload(1, driver_id=1, block_id=1),
+                build_payload(2, driver_id=1, block_id=1),
+                build_payload(3, driver_id=2, block_id=2),
+            ]
+        )
+
+    def test_consolidation_reads_counts_from_summary(self, api_client, orders):
+        OrderSummary.objects.filter(driver_id=2).update(total=7)
+
+        response = api_client.get(CONSOLIDATION_URL)
+
+        assert [group["total"] for group in response.data] == [2, 7]
+        assert [len(group["orders"]) for group in response.data] == [2, 1]
+
+    def test_dashboard_reads_days_from_summary(self, orders):
+        today = timezone.localdate()
+        OrderService().upsert_orders(
+            [{**build_payload(4), "dispatch_date": f"{today} 10:00:00"}]
+        )
+        OrderDaySummary.objects.filter(day=today).update(total=7)
+
+        assert DashboardService().count_by_day(days=30) == [{"day": today, "total": 7}]
+
+    def test_dashboard_reads_counts_from_summary(self, api_client, orders):
+        response = api_client.get(DASHBOARD_URL)
+
+        assert response.data["byStatus"]["APPROVED"] == 3
+        assert response.data["countBlocks"] == 2
+        assert [b["total"] for b in response.data["byBlock"]] == [2, 1]
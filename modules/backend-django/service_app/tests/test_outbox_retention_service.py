@@ -0,0 +1,96 @@
+import gzip
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from django_q.models import Schedule
+
+from ..models import RedisOutbox
+from ..services.outbox_retention_service import OutboxRetentionService
+
+
+@pytest.mark.django_db
+class TestOutboxRetentionService:
+    @pytest.fixture
+    def outbox(self):
+        """Five expired rows and two recent ones."""
+        for i in range(7):
+            RedisOutbox.objects.create(
+                event_id=f"{i}-0",
+                event_type="order.created",
+                payload={"order_id": i},
+                received=True,
+            )
+        old = timezone.now() - timedelta(days=40)
+        RedisOutbox.objects.filter(event_id__in=[f"{i}-0" for i in range(5)]).update(
+            created_at=old
+        )
+
+    @staticmethod
+    def read_archive(path):
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            return [json.loads(line) for line in archive]
+
+    def test_purge_archives_then_deletes_in_batches(self, outbox, tmp_path):
+        service = OutboxRetentionService(
+            retention_days=30, batch_size=2, archive_dir=str(tmp_path)
+        )
+
+        result = service.purge()
+
+        assert result["deleted"] == 5
+        assert result["batches"] == 3
+        assert sorted(RedisOutbox.objects.values_list("event_id", flat=True)) == [
+            "5-0",
+            "6-0",
+        ]
+
+        rows = self.read_archive(result["archive"])
+        assert [row["event_id"] for row in rows] == [f"{i}-0" for i in range(5)]
+        assert rows[0]["payload"] == {"order_id": 0}
+        assert rows[0]["received"] is True
+
+    def test_each_batch_costs_a_bounded_number_of_queries(
+        self, outbox, django_assert_max_num_queries
+    ):
+        service = OutboxRetentionService(
+            retention_days=30, batch_size=10, archive_dir=None
+        )
+
+        # one select and one delete per batch, plus the empty select
+        with django_assert_max_num_queries(3):
+            result = service.purge()
+
+        assert result == {"deleted": 5, "batches": 1, "archive": None}
+
+    def test_max_batches_stops_early(self, outbox):
+        service = OutboxRetentionService(batch_size=2, archive_dir=None)
+
+        assert service.purge(max_batches=1)["deleted"] == 2
+        assert service.count_expired() == 3
+
+    def test_retention_must_be_positive(self):
+        with pytest.raises(ValueError):
+            OutboxRetentionService(retention_days=0)
+
+
+@pytest.mark.django_db
+class TestOutboxRetentionCommand:
+    def test_dry_run_only_counts(self, capsys):
+        RedisOutbox.objects.create(event_id="1-0", event_type="t", payload={})
+        RedisOutbox.objects.update(created_at=timezone.now() - timedelta(days=90))
+
+        call_command("outbox_retention_command", "--dry-run")
+
+        assert capsys.readouterr().out.startswith("1 outbox rows")
+        assert RedisOutbox.objects.count() == 1
+
+    def test_schedule_is_created_once(self):
+        call_command("outbox_retention_command", "--schedule")
+        call_command("outbox_retention_command", "--schedule")
+
+        schedule = Schedule.objects.get(name="outbox-retention")
+        assert schedule.func == "service_app.tasks.purge_outbox_q"
+        assert schedule.schedule_type == Schedule.DAILY
@@ -0,0 +1,158 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from ..helpers.dto_helper import (
+    block_to_dto,
+    dispatch_order_to_dict,
+    distribution_order_to_dto,
+    order_to_dto,
+    preparation_order_to_dict,
+)
+from ..helpers.projection_helper import (
+    DISPATCH_PROJECTION,
+    DISTRIBUTION_PROJECTION,
+    ORDER_PROJECTION,
+    PREPARATION_PROJECTION,
+    RECEIVING_PROJECTION,
+    block_to_dict,
+)
+from ..models import Block, Order
+
+
+def receiving_order_to_dict(order):
+    data = order_to_dto(order).model_dump(by_alias=True)
+    data["hasIncidents"] = bool(order.incidents)
+    return data
+
+
+@pytest.mark.django_db
+class TestProjectionParity:
+    @pytest.fixture
+    def orders(self, order_factory, block_factory, driver_factory, product_factory):
+        block = block_factory(name="Centro")
+        driver = driver_factory()
+        products = [product_factory(name=f"P{i}", sku=f"SKU{i}") for i in range(2)]
+
+        full = order_factory(
+            code="ORD-FULL",
+            status="DELIVERED",
+            block=block,
+            driver=driver,
+            user="ana",
+            volume=1.5,
+            weight=2.25,
+            incidents="Caja golpeada",
+            number_of_bags=3,
+        )
+        full.products.set(products)
+        order_factory(
+            code="ORD-EMPTY",
+            status="PENDING",
+            block=block,
+            latitude=None,
+            longitude=None,
+        )
+
+        return list(
+            Order.objects.select_related("driver")
+            .prefetch_related("products")
+            .order_by("id")
+        )
+
+    @pytest.mark.parametrize(
+        "projection,reference",
+        [
+            (ORDER_PROJECTION, lambda o: order_to_dto(o).model_dump(by_alias=True)),
+            (
+                DISPATCH_PROJECTION,
+                lambda o: dispatch_order_to_dict(
+                    order_to_dto(o).model_dump(by_alias=True)
+                ),
+            ),
+            (
+                PREPARATION_PROJECTION,
+                lambda o: preparation_order_to_dict(
+                    order_to_dto(o).model_dump(by_alias=True)
+                ),
+            ),
+            (RECEIVING_PROJECTION, receiving_order_to_dict),
+            (
+                DISTRIBUTION_PROJECTION,
+                lambda o: distribution_order_to_dto(o).model_dump(by_alias=True),
+            ),
+        ],
+    )
+    def test_projection_matches_dto_output(self, orders, projection, reference):
+        for order in orders:
+            projected = projection(order)
+            expected = reference(order)
+
+            assert projected == expected
+            assert list(projected) == list(expected)
+
+    def test_block_to_dict_matches_dto_output(self, orders):
+        block = Block.objects.prefetch_related("orders__products").get()
+
+        assert block_to_dict(block) == block_to_dto(block).model_dump(by_alias=True)
+
+
+@pytest.mark.django_db
+class TestProjectionQuerysets:
+    @pytest.fixture
+    def orders(self, order_factory, driver_factory, product_factory):
+        driver = driver_factory()
+        product = product_factory()
+        for i, order_status in enumerate(["IN_DISPATCH", "PENDING"]):
+            order = order_factory(code=f"ORD-{i}", status=order_status, driver=driver)
+            order.products.add(product)
+
+    @staticmethod
+    def get_queries(api_client, url):
+        """Return the SQL of the listing and all the queries of the request."""
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+
+        sqls = [q["sql"] for q in queries]
+        listing = [sql for sql in sqls if 'FROM "order"' in sql and "ORDER BY" in sql]
+        assert len(listing) == 1
+        return listing[0], sqls
+
+    @pytest.mark.parametrize(
+        "projection",
+        [
+            ORDER_PROJECTION,
+            DISPATCH_PROJECTION,
+            PREPARATION_PROJECTION,
+            RECEIVING_PROJECTION,
+            DISTRIBUTION_PROJECTION,
+        ],
+    )
+    def test_projection_reads_no_deferred_field(
+        self, orders, projection, django_assert_num_queries
+    ):
+        queryset = projection.apply(Order.objects.order_by("id"))
+        expected = 2 if projection.prefetch_related else 1
+
+        with django_assert_num_queries(expected):
+            [projection(order) for order in queryset]
+
+    def test_dispatch_skips_driver_join_and_products(self, api_client, orders):
+        listing, queries = self.get_queries(api_client, reverse("dispatch-list"))
+
+        assert "JOIN" not in listing
+        assert '"order"."user"' not in listing
+        assert not any('FROM "product"' in sql for sql in queries)
+
+    def test_preparation_prefetches_products_without_driver_join(
+        self, api_client, orders
+    ):
+        listing, queries = self.get_queries(api_client, reverse("preparation-list"))
+
+        assert '"driver"' not in listing
+        assert any('FROM "product"' in sql for sql in queries)
@@ -0,0 +1,501 @@
+import json
+
+import pytest
+from django.db import InterfaceError, OperationalError
+
+from ..helpers.identity_cache_helper import IdentityCache
+from ..helpers.response_cache_helper import ResponseCache
+from ..models import Block, Order, RedisOutbox
+from ..services import redis_consumer_service
+
+
+def build_message(event_type, payload):
+    body = json.dumps({"eventType": event_type, "payload": payload})
+    envelope = json.dumps({"body": body, "headers": {}})
+    raw = f's:{len(envelope.encode("utf-8"))}:"{envelope}";'
+    return {b"message": raw.encode("utf-8")}
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    calls = []
+    monkeypatch.setattr(redis_consumer_service, "DISPATCH_TO_Q", True)
+    monkeypatch.setattr(
+        redis_consumer_service,
+        "dispatch_batch_to_q",
+        lambda events: calls.extend(events),
+    )
+    return calls
+
+
+@pytest.mark.django_db
+class TestProcessBatch:
+    def test_process_batch_acks_only_successful_messages(
+        self, dispatched, order_factory, block_factory, driver_factory, product_factory
+    ):
+        block = block_factory()
+        driver = driver_factory()
+        product = product_factory()
+        order = order_factory(code="ORD-001", status="PENDING", block=block)
+
+        good = build_message(
+            "order.created",
+            {
+                "order_id": order.id,
+                "block_id": block.id,
+                "driver_id": driver.id,
+                "products": [product.id],
+                "dispatch_date": "2025-08-12 10:00:00",
+            },
+        )
+        bad = build_message("order.created", {"order_id": order.id})
+
+        acked = redis_consumer_service.process_batch([(b"1-0", good), (b"2-0", bad)])
+
+        assert acked == [b"1-0"]
+        assert len(dispatched) == 1
+        assert RedisOutbox.objects.count() == 1
+
+        order = Order.objects.get(id=order.id)
+        assert order.status == "APPROVED"
+        assert order.driver_id == driver.id
+        assert list(order.products.values_list("id", flat=True)) == [product.id]
+
+    def test_process_batch_skips_events_already_in_outbox(
+        self, dispatched, order_factory, block_factory
+    ):
+        block = block_factory()
+        order = order_factory(code="ORD-001", status="PENDING", block=block)
+        RedisOutbox.objects.create(
+            event_id="1-0", event_type="order.created", payload={}, received=True
+        )
+        message = build_message(
+            "order.created",
+            {
+                "order_id": order.id,
+                "block_id": block.id,
+                "driver_id": 1,
+                "products": [],
+                "dispatch_date": "2025-08-12 10:00:00",
+            },
+        )
+
+        acked = redis_consumer_service.process_batch([(b"1-0", message)])
+
+        assert acked == [b"1-0"]
+        assert RedisOutbox.objects.count() == 1
+        assert Order.objects.get(id=order.id).status == "PENDING"
+
+    def test_process_batch_dead_letters_messages_without_envelope(self, dispatched):
+        skipped = redis_consumer_service.MESSAGES.value(result="skipped")
+        batches = redis_consumer_service.BATCH_SIZES.count()
+        fake = FakeRedis({})
+
+        acked = redis_consumer_service.process_batch(
+            [(b"1-0", {b"message": b"garbage"})], fake
+        )
+
+        assert acked == []
+        assert dispatched == []
+        assert fake.acked == [b"1-0"]
+        assert fake.dead[0][1][b"reason"] == "unparseable"
+        assert redis_consumer_service.MESSAGES.value(result="skipped") == skipped + 1
+        assert redis_consumer_service.BATCH_SIZES.count() == batches + 1
+
+    def test_process_batch_does_not_dispatch_by_default(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            redis_consumer_service, "handle_events", lambda events: None
+        )
+        monkeypatch.setattr(
+            redis_consumer_service,
+            "dispatch_batch_to_q",
+            lambda events: calls.append(1),
+        )
+        message = build_message("order.created", {"order_id": 1})
+
+        acked = redis_consumer_service.process_batch([(b"1-0", message)])
+
+        assert acked == [b"1-0"]
+        assert redis_consumer_service.DISPATCH_TO_Q is False
+        assert calls == []
+
+    def test_process_batch_acks_entries_without_event(self, dispatched):
+        envelope = json.dumps({"body": "{}", "headers": {}})
+        raw = f's:{len(envelope)}:"{envelope}";'.encode()
+
+        acked = redis_consumer_service.process_batch([(b"1-0", {b"message": raw})])
+
+        assert acked == [b"1-0"]
+        assert dispatched == []
+
+    def test_process_batch_raises_on_lost_db_connection(self, dispatched, monkeypatch):
+        def lost_connection(events):
+            raise OperationalError("MySQL server has gone away")
+
+        retried = []
+        monkeypatch.setattr(redis_consumer_service, "handle_events", lost_connection)
+        monkeypatch.setattr(
+            redis_consumer_service, "handle_event", lambda *args: retried.append(args)
+        )
+        message = build_message("order.created", {"order_id": 1})
+
+        with pytest.raises(OperationalError):
+            redis_consumer_service.process_batch([(b"1-0", message)])
+
+        assert retried == []
+        assert dispatched == []
+
+    def test_process_batch_retries_the_transaction_after_a_deadlock(
+        self, dispatched, monkeypatch
+    ):
+        attempts = []
+
+        def deadlock_once(events):
+            attempts.append(events)
+            if len(attempts) == 1:
+                raise OperationalError(1213, "Deadlock found when trying to get lock")
+
+        retried = []
+        monkeypatch.setattr(redis_consumer_service, "handle_events", deadlock_once)
+        monkeypatch.setattr(
+            redis_consumer_service, "handle_event", lambda *args: retried.append(args)
+        )
+        message = build_message("order.created", {"order_id": 1})
+
+        acked = redis_consumer_service.process_batch([(b"1-0", message)])
+
+        assert acked == [b"1-0"]
+        assert len(attempts) == 2
+        assert retried == []
+        assert [event_id for event_id, _, _ in dispatched] == ["1-0"]
+
+    def test_process_batch_raises_after_repeated_lock_timeouts(
+        self, dispatched, monkeypatch
+    ):
+        attempts = []
+
+        def lock_timeout(event_id, event_type, payload):
+            attempts.append(event_id)
+            raise OperationalError(1205, "Lock wait timeout exceeded")
+
+        def bulk_failure(events):
+            raise ValueError("bad payload")
+
+        monkeypatch.setattr(redis_consumer_service, "handle_events", bulk_failure)
+        monkeypatch.setattr(redis_consumer_service, "handle_event", lock_timeout)
+        failed = redis_consumer_service.MESSAGES.value(result="failed")
+        message = build_message("order.created", {"order_id": 1})
+
+        with pytest.raises(OperationalError):
+            redis_consumer_service.process_batch([(b"1-0", message), (b"2-0", message)])
+
+        # The lock error stops the batch instead of failing its message
+        assert attempts == ["1-0"] * redis_consumer_service.DB_TRANSACTION_RETRIES
+        assert redis_consumer_service.MESSAGES.value(result="failed") == failed
+        assert dispatched == []
+
+
+@pytest.mark.parametrize(
+    "error, disconnect, lock",
+    [
+        (OperationalError(2006, "MySQL server has gone away"), True, False),
+        (OperationalError(2013, "Lost connection to MySQL server"), True, False),
+        (OperationalError("MySQL server has gone away"), True, False),
+        (InterfaceError(0, ""), True, False),
+        (OperationalError(1213, "Deadlock found"), False, True),
+        (OperationalError(1205, "Lock wait timeout exceeded"), False, True),
+        (OperationalError(1054, "Unknown column"), False, False),
+        (ValueError("bad payload"), False, False),
+    ],
+)
+def test_db_errors_are_classified_by_code(error, disconnect, lock):
+    assert redis_consumer_service.is_connection_error(error) is disconnect
+    assert redis_consumer_service.is_lock_error(error) is lock
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.results = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.results.append(getattr(self.redis_client, name)(*args, **kwargs))
+
+        return command
+
+    def execute(self):
+        return self.results
+
+
+class FakeRedis:
+    """Minimal stand-in for the stream commands used by the reclaim pass."""
+
+    def __init__(self, pending):
+        self.pending = pending
+        self.acked = []
+        self.dead = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def execute_command(self, *args):
+        entries = [
+            [msg_id, [k for kv in fields.items() for k in kv]]
+            for msg_id, (fields, _) in self.pending.items()
+        ]
+        return [b"0-0", entries, []]
+
+    def xpending_range(self, name, groupname, min, max, count):
+        return [{"message_id": min, "times_delivered": self.pending[min][1]}]
+
+    def xack(self, name, groupname, *ids):
+        self.acked.extend(ids)
+
+    def xadd(self, name, fields):
+        self.dead.append((name, fields))
+
+
+@pytest.mark.django_db
+class TestReclaimPending:
+    def test_reclaim_retries_and_dead_letters_pending_messages(self, dispatched):
+        failing = build_message("order.created", {"order_id": 1})
+        fake = FakeRedis(
+            {
+                b"1-0": (failing, 2),
+                b"2-0": (failing, redis_consumer_service.MAX_DELIVERIES + 1),
+                b"3-0": ({b"message": b"garbage"}, 1),
+            }
+        )
+
+        claimed = redis_consumer_service.reclaim_pending(fake, "worker-1")
+
+        assert claimed == 3
+        assert fake.acked == [b"2-0", b"3-0"]
+        assert [fields[b"original_id"] for _, fields in fake.dead] == [b"2-0", b"3-0"]
+        assert [fields[b"reason"] for _, fields in fake.dead] == [
+            "max deliveries",
+            "unparseable",
+        ]
+        assert {name for name, _ in fake.dead} == {
+            redis_consumer_service.DEAD_LETTER_STREAM
+        }
+
+
+class FakeStopEvent:
+    """Stop event that records the waits and stops after `iterations` checks."""
+
+    def __init__(self, iterations):
+        self.iterations = iterations
+        self.waits = []
+
+    def is_set(self):
+        self.iterations -= 1
+        return self.iterations < 0
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+
+
+class TestRun:
+    @pytest.fixture
+    def consumer(self, monkeypatch):
+        """Run the consumer loop on a fake stream whose reads follow `replies`."""
+        calls = {
+            "batches": [],
+            "acked": [],
+            "closed_all": 0,
+            "close_old": 0,
+            "reclaims": 0,
+        }
+
+        def start(replies, database_up=True):
+            def xreadgroup(*args, **kwargs):
+                reply = replies.pop(0)
+                if isinstance(reply, Exception):
+                    raise reply
+                return reply
+
+            fake = FakeRedis({})
+            fake.xgroup_create = lambda *args, **kwargs: None
+            fake.xreadgroup = xreadgroup
+            stop_event = FakeStopEvent(len(replies))
+
+            monkeypatch.setattr(redis_consumer_service, "get_redis", lambda url: fake)
+            monkeypatch.setattr(redis_consumer_service, "_stop_event", stop_event)
+            monkeypatch.setattr(
+                redis_consumer_service,
+                "reclaim_pending",
+                lambda r, name: calls.__setitem__("reclaims", calls["reclaims"] + 1),
+            )
+            monkeypatch.setattr(
+                redis_consumer_service, "database_available", lambda: database_up
+            )
+            monkeypatch.setattr(
+                redis_consumer_service, "update_stream_metrics", lambda r: None
+            )
+            monkeypatch.setattr(
+                redis_consumer_service,
+                "process_batch",
+                lambda messages, r=None: calls["batches"].append(messages)
+                or [msg_id for msg_id, _ in messages],
+            )
+            monkeypatch.setattr(
+                redis_consumer_service.connections,
+                "close_all",
+                lambda: calls.__setitem__("closed_all", calls["closed_all"] + 1),
+            )
+            monkeypatch.setattr(
+                redis_consumer_service,
+                "close_old_connections",
+                lambda: calls.__setitem__("close_old", calls["close_old"] + 1),
+            )
+
+            redis_consumer_service.run()
+            calls["acked"] = fake.acked
+            calls["waits"] = stop_event.waits
+            return calls
+
+        return start
+
+    def test_run_reconnects_with_backoff_after_db_errors(self, consumer):
+        message = (b"1-0", {b"message": b"garbage"})
+
+        calls = consumer(
+            [
+                OperationalError("MySQL server has gone away"),
+                OperationalError("MySQL server has gone away"),
+                [(b"events_stream", [message])],
+            ]
+        )
+
+        assert calls["waits"] == [
+            redis_consumer_service.retry_delay(1),
+            redis_consumer_service.retry_delay(2),
+        ]
+        assert calls["closed_all"] == 2
+        assert calls["batches"] == [[message]]
+        assert calls["acked"] == [b"1-0"]
+
+    def test_run_keeps_the_connection_after_a_deadlock(self, consumer):
+        batch = [(b"events_stream", [(b"1-0", {})])]
+
+        calls = consumer([OperationalError(1213, "Deadlock found"), batch])
+
+        assert calls["waits"] == [redis_consumer_service.retry_delay(1)]
+        assert calls["closed_all"] == 0
+        assert calls["batches"] == [[(b"1-0", {})]]
+
+    def test_run_recycles_old_connections_per_batch(self, consumer):
+        batch = [(b"events_stream", [(b"1-0", {})])]
+
+        calls = consumer([batch, batch])
+
+        assert calls["waits"] == []
+        assert calls["closed_all"] == 0
+        # once for the reclaim pass and once per batch
+        assert calls["close_old"] == 3
+        assert calls["reclaims"] == 1
+
+    def test_run_does_not_reclaim_during_a_database_outage(self, consumer):
+        batch = [(b"events_stream", [(b"1-0", {})])]
+
+        calls = consumer([batch], database_up=False)
+
+        # Claiming would count a delivery of every pending entry
+        assert calls["reclaims"] == 0
+        assert calls["batches"] == [[(b"1-0", {})]]
+
+
+def test_database_available_reports_an_outage(monkeypatch):
+    def unreachable():
+        raise OperationalError(2003, "Can't connect to MySQL server")
+
+    closed = []
+    monkeypatch.setattr(redis_consumer_service.connection, "cursor", unreachable)
+    monkeypatch.setattr(
+        redis_consumer_service.connections, "close_all", lambda: closed.append(1)
+    )
+
+    assert redis_consumer_service.database_available() is False
+    assert closed == [1]
+
+
+def test_identity_cache_hit_ratio_is_logged(monkeypatch, capsys):
+    cache = IdentityCache(alias=None)
+    cache.set_many([Block(id=1)])
+    cache.get_many(Block, [1, 1, 1, 2])
+    monkeypatch.setattr(redis_consumer_service.order_service, "cache", cache)
+
+    redis_consumer_service.log_identity_cache_stats()
+
+    assert "Identity cache hit ratio 75.0% (3 hits, 1 misses" in capsys.readouterr().out
+
+
+def test_cache_counters_are_exported_as_gauges(monkeypatch):
+    cache = IdentityCache(alias=None)
+    cache.set_many([Block(id=1)])
+    cache.get_many(Block, [1, 1, 1, 2])
+    response_cache = ResponseCache(stats_interval=3600)
+    response_cache.invalidations = 5
+    monkeypatch.setattr(redis_consumer_service.order_service, "cache", cache)
+    monkeypatch.setattr(
+        redis_consumer_service.order_service, "response_cache", response_cache
+    )
+
+    redis_consumer_service.update_cache_metrics()
+
+    gauge = redis_consumer_service.IDENTITY_CACHE
+    assert [gauge.value(stat=s) for s in ("hits", "misses", "entries")] == [3, 1, 1]
+    assert redis_consumer_service.IDENTITY_CACHE_HIT_RATIO.value() == 0.75
+    assert redis_consumer_service.RESPONSE_CACHE_INVALIDATIONS.value() == 5
+    assert 'consumer_identity_cache{stat="hits"} 3' in (
+        redis_consumer_service.metrics.render()
+    )
+
+
+def test_retry_delay_doubles_up_to_the_maximum():
+    delays = [redis_consumer_service.retry_delay(n) for n in range(1, 10)]
+
+    assert delays[0] == redis_consumer_service.RETRY_BACKOFF
+    assert delays[1] == 2 * redis_consumer_service.RETRY_BACKOFF
+    assert max(delays) == redis_consumer_service.RETRY_BACKOFF_MAX
+    assert delays == sorted(delays)
+
+
+class FakeStreamInfo:
+    """Replies of the stream introspection commands."""
+
+    def xlen(self, name):
+        return 42
+
+    def xinfo_groups(self, name):
+        return [
+            {"name": b"other", "pending": 9, "lag": 9},
+            {"name": redis_consumer_service.GROUP.encode(), "pending": 3, "lag": 5},
+        ]
+
+    def xpending_range(self, name, groupname, min, max, count):
+        return [{"message_id": b"1-0", "time_since_delivered": 2500}]
+
+    def xinfo_consumers(self, name, groupname):
+        return [{"name": b"worker-1", "pending": 3, "idle": 1000}]
+
+
+def test_stream_stats_feed_the_backlog_gauges():
+    fake = FakeStreamInfo()
+
+    stats = redis_consumer_service.read_stream_stats(fake)
+    redis_consumer_service.update_stream_metrics(fake)
+
+    assert stats == {
+        "length": 42,
+        "lag": 5,
+        "pending": 3,
+        "oldest_pending_idle_ms": 2500,
+        "consumers": [("worker-1", 3, 1000)],
+    }
+    assert redis_consumer_service.STREAM_LAG.value() == 5
+    assert redis_consumer_service.PENDING_ENTRIES.value() == 3
+    assert redis_consumer_service.OLDEST_PENDING_SECONDS.value() == 2.5
@@ -0,0 +1,82 @@
+from django_q.brokers import redis_broker
+from django_q.signing import SignedPackage
+
+from ..helpers import redis_pool_helper
+
+
+class FakePipeline:
+    def __init__(self, connection):
+        self.connection = connection
+        self.commands = []
+
+    def rpush(self, key, value):
+        self.commands.append((key, value))
+
+    def execute(self):
+        self.connection.round_trips += 1
+        self.connection.pushed.extend(self.commands)
+        return [len(self.commands)]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.round_trips = 0
+        self.pushed = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def rpush(self, key, value):
+        self.round_trips += 1
+        self.pushed.append((key, value))
+
+
+class FakeRedisBroker(redis_broker.Redis):
+    @staticmethod
+    def get_connection(list_key: str = None):
+        return FakeConnection()
+
+
+class TestConnectionPool:
+    def test_pool_is_shared_per_url(self, settings):
+        url = "redis://localhost:6379/5"
+
+        first = redis_pool_helper.get_redis(url)
+        second = redis_pool_helper.get_redis(url)
+        other = redis_pool_helper.get_redis("redis://localhost:6379/6")
+
+        assert first.connection_pool is second.connection_pool
+        assert first.connection_pool is not other.connection_pool
+        assert (
+            first.connection_pool.max_connections
+            == settings.REDIS_POOL_OPTIONS["max_connections"]
+        )
+
+    def test_pooled_broker_uses_the_shared_pool(self):
+        broker = redis_pool_helper.PooledRedisBroker(list_key="test")
+
+        assert broker.connection.connection_pool is (
+            redis_pool_helper.get_connection_pool()
+        )
+
+
+class TestEnqueueTasks:
+    def test_redis_broker_enqueues_a_batch_in_one_round_trip(self, monkeypatch):
+        broker = FakeRedisBroker(list_key="test")
+        monkeypatch.setattr(redis_pool_helper, "get_broker", lambda: broker)
+
+        count = redis_pool_helper.enqueue_tasks(
+            "service_app.tasks.process_event_q",
+            [(f"{i}-0", "order.created", {"order_id": i}) for i in range(3)],
+        )
+
+        assert count == 3
+        assert broker.connection.round_trips == 1
+        tasks = [SignedPackage.loads(value) for _, value in broker.connection.pushed]
+        assert [task["args"][0] for task in tasks] == ["0-0", "1-0", "2-0"]
+        assert {key for key, _ in broker.connection.pushed} == {broker.list_key}
+
+    def test_empty_batch_does_not_touch_the_broker(self, monkeypatch):
+        monkeypatch.setattr(redis_pool_helper, "get_broker", lambda: 1 / 0)
+
+        assert redis_pool_helper.enqueue_tasks("service_app.tasks.x", []) == 0
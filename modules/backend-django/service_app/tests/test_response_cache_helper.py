@@ -0,0 +1,154 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from ..helpers.response_cache_helper import ResponseCache, response_cache
+from ..models import Order
+from ..services.order_service import OrderService
+
+CONSOLIDATION_URL = reverse("consolidation-list")
+
+
+def build_payload(order_id, driver_id=1, block_id=1):
+    return {
+        "order_id": order_id,
+        "driver_id": driver_id,
+        "block_id": block_id,
+        "products": [1],
+        "dispatch_date": "2025-08-12 10:00:00",
+    }
+
+
+class TestResponseCacheTags:
+    def test_entry_tags_use_first_filter(self):
+        tags = ResponseCache.entry_tags(
+            ["APPROVED", "PENDING"], {"block": "3", "date": "2025-08-12"}
+        )
+
+        assert tags == ["status:APPROVED:block:3", "status:PENDING:block:3"]
+
+    def test_entry_tags_normalize_filter_values(self):
+        assert ResponseCache.entry_tags(["APPROVED"], {"driver": "05"}) == [
+            "status:APPROVED:driver:5"
+        ]
+        assert ResponseCache.entry_tags(["APPROVED"], {"date": "2025-8-2"}) == [
+            "status:APPROVED:date:2025-08-02"
+        ]
+        assert ResponseCache.entry_tags(["APPROVED"], {"block": "abc"}) == [
+            "status:APPROVED"
+        ]
+
+    def test_order_tags_cover_every_entry_of_the_order(self):
+        tags = ResponseCache.order_tags(("APPROVED", 5, 3, "2025-08-12"))
+
+        assert tags == [
+            "status:APPROVED",
+            "status:APPROVED:driver:5",
+            "status:APPROVED:block:3",
+            "status:APPROVED:date:2025-08-12",
+        ]
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    def test_second_request_is_served_from_cache(self, api_client):
+        OrderService().upsert_orders([build_payload(1)])
+
+        first = api_client.get(CONSOLIDATION_URL)
+        second = api_client.get(CONSOLIDATION_URL)
+
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+        assert response_cache.stats()["hits"] == 1
+        assert response_cache.stats()["misses"] == 1
+
+    def test_order_change_invalidates_matching_entries(
+        self, api_client, django_capture_on_commit_callbacks
+    ):
+        service = OrderService()
+        service.upsert_orders([build_payload(1)])
+        api_client.get(CONSOLIDATION_URL)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service.create_or_update_order(build_payload(2))
+
+        response = api_client.get(CONSOLIDATION_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-Cache"] == "MISS"
+        assert response.data[0]["total"] == 2
+
+    def test_order_change_keeps_entries_of_other_drivers(
+        self, api_client, django_capture_on_commit_callbacks
+    ):
+        service = OrderService()
+        service.upsert_orders([build_payload(1, driver_id=1), build_payload(2, 2)])
+        api_client.get(f"{CONSOLIDATION_URL}?driver=2")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service.upsert_orders([build_payload(3, driver_id=1)])
+
+        response = api_client.get(f"{CONSOLIDATION_URL}?driver=2")
+
+        assert response["X-Cache"] == "HIT"
+        assert Order.objects.count() == 3
+
+    def test_status_change_invalidates_the_previous_status(
+        self,
+        api_client,
+        order_factory,
+        block_factory,
+        django_capture_on_commit_callbacks,
+    ):
+        order = order_factory(code="ORD-801", status="PENDING", block=block_factory())
+        preparation_url = reverse("preparation-list")
+        assert len(api_client.get(preparation_url).data) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            OrderService().create_or_update_order(build_payload(order.id))
+
+        assert api_client.get(preparation_url).data == []
+
+    def test_unreachable_cache_builds_the_response(
+        self, api_client, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        class UnreachableCaches:
+            def __getitem__(self, alias):
+                raise ConnectionError("Redis is down")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                "service_app.helpers.response_cache_helper.caches", UnreachableCaches()
+            )
+
+            with django_capture_on_commit_callbacks(execute=True):
+                OrderService().upsert_orders([build_payload(1)])
+            response = api_client.get(CONSOLIDATION_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-Cache"] == "MISS"
+        assert response.data[0]["total"] == 1
+
+    def test_counters_are_shared_between_processes(self, api_client):
+        OrderService().upsert_orders([build_payload(1)])
+        worker = ResponseCache(stats_interval=0)
+        worker.get_or_set("/a/", {}, ["APPROVED"], lambda: [1])
+        worker.get_or_set("/a/", {}, ["APPROVED"], lambda: [1])
+        api_client.get(CONSOLIDATION_URL)
+
+        stats = ResponseCache().shared_stats()
+
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["hitRatio"] == pytest.approx(1 / 3)
+
+    def test_stats_command_prints_the_shared_counters(self, capsys):
+        worker = ResponseCache(stats_interval=0)
+        worker.get_or_set("/a/", {}, ["APPROVED"], lambda: [1])
+        worker.get_or_set("/a/", {}, ["APPROVED"], lambda: [1])
+
+        call_command("response_cache_stats_command")
+
+        assert "1 hits, 1 misses (hit ratio 50.0%)" in capsys.readouterr().out
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from ..models import Block, Order
+from ..viewsets import block_viewsets, process_viewsets
+
+SHIPPING_URL = reverse("shipping-list")
+BLOCKS_URL = reverse("distribution-blocks-list")
+
+
+def streamed_json(response):
+    return json.loads(b"".join(response.streaming_content))
+
+
+@pytest.mark.django_db
+class TestStreamingResponses:
+    @pytest.fixture
+    def orders(self, order_factory, block_factory, driver_factory, product_factory):
+        driver = driver_factory()
+        products = [
+            product_factory(name="Laptop", sku="LP-1"),
+            product_factory(sku="P2"),
+        ]
+        block_a = block_factory(name="Block A")
+        block_b = block_factory(name="Block B")
+        block_factory(name="Block C")
+
+        for index, block in enumerate([block_a, block_a, block_b]):
+            order = order_factory(
+                code=f"ORD-{index}",
+                status="COMPLETED",
+                block=block,
+                driver=driver,
+                destination="Peñalolén",
+            )
+            order.products.set(products)
+
+    def test_streamed_order_list_matches_regular_response(self, api_client, orders):
+        regular = api_client.get(SHIPPING_URL)
+        streamed = api_client.get(f"{SHIPPING_URL}?stream=true")
+
+        assert streamed.status_code == status.HTTP_200_OK
+        assert streamed.streaming
+        assert streamed_json(streamed) == json.loads(regular.content)
+
+    def test_streamed_block_list_matches_regular_response(self, api_client, orders):
+        for query in ["", "status=COMPLETED"]:
+            regular = api_client.get(f"{BLOCKS_URL}?{query}")
+            streamed = api_client.get(f"{BLOCKS_URL}?{query}&stream=true")
+
+            assert streamed.status_code == status.HTTP_200_OK
+            assert streamed_json(streamed) == json.loads(regular.content)
+
+    def test_streamed_empty_list(self, api_client):
+        response = api_client.get(f"{SHIPPING_URL}?stream=true")
+
+        assert streamed_json(response) == []
+
+    def test_streamed_order_list_is_read_in_keyset_chunks(
+        self, api_client, orders, order_factory, monkeypatch
+    ):
+        monkeypatch.setattr(process_viewsets, "STREAM_CHUNK_SIZE", 2)
+        block = Block.objects.get(name="Block C")
+        for index in range(3):
+            order_factory(code=f"NULL-{index}", status="COMPLETED", block=block)
+        Order.objects.filter(code__startswith="NULL-").update(dispatch_date=None)
+        regular = api_client.get(SHIPPING_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            streamed = streamed_json(api_client.get(f"{SHIPPING_URL}?stream=true"))
+
+        assert [o["code"] for o in streamed] == [
+            o["code"] for o in json.loads(regular.content)
+        ]
+        assert len(streamed) == 6
+        assert sum("LIMIT 2" in q["sql"] for q in queries) == 4
+
+    def test_streamed_block_list_prefetches_orders_per_page_of_blocks(
+        self, api_client, orders, block_factory, monkeypatch
+    ):
+        monkeypatch.setattr(block_viewsets, "STREAM_BLOCK_PAGE_SIZE", 2)
+        for index in range(3):
+            block_factory(name=f"Block Z{index}")
+        regular = api_client.get(BLOCKS_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            streamed = streamed_json(api_client.get(f"{BLOCKS_URL}?stream=true"))
+
+        assert streamed == json.loads(regular.content)
+        order_queries = [q for q in queries if '"block_id" IN' in q["sql"]]
+        assert len(order_queries) == 3
@@ -0,0 +1,54 @@
+import pytest
+
+from .. import tasks
+from ..models import RedisOutbox
+
+
+@pytest.mark.django_db
+class TestProcessEventsBatchQ:
+    def test_batch_is_stored_with_one_insert(self, django_assert_num_queries):
+        events = [(f"{i}-0", "order.created", {"order_id": i}) for i in range(3)]
+
+        with django_assert_num_queries(1):
+            tasks.process_events_batch_q(events)
+
+        assert sorted(RedisOutbox.objects.values_list("event_id", flat=True)) == [
+            "0-0",
+            "1-0",
+            "2-0",
+        ]
+        assert RedisOutbox.objects.filter(received=True).count() == 3
+
+    def test_events_already_stored_are_skipped(self):
+        RedisOutbox.objects.create(
+            event_id="1-0", event_type="order.created", payload={"old": True}
+        )
+
+        tasks.process_events_batch_q(
+            [
+                ("1-0", "order.created", {"order_id": 1}),
+                ("2-0", "order.created", {"order_id": 2}),
+            ]
+        )
+
+        assert RedisOutbox.objects.count() == 2
+        assert RedisOutbox.objects.get(event_id="1-0").payload == {"old": True}
+
+
+class TestDispatchBatchToQ:
+    def test_events_are_split_in_batches(self, monkeypatch):
+        enqueued = []
+        monkeypatch.setattr(tasks, "Q_BATCH_SIZE", 2)
+        monkeypatch.setattr(
+            tasks,
+            "enqueue_tasks",
+            lambda func, calls: enqueued.append((func, calls)) or len(calls),
+        )
+        events = [(f"{i}-0", "order.created", {}) for i in range(5)]
+
+        assert tasks.dispatch_batch_to_q(iter(events)) == 3
+
+        func, calls = enqueued[0]
+        assert func == "service_app.tasks.process_events_batch_q"
+        assert [len(batch) for batch, in calls] == [2, 2, 1]
+        assert [event for batch, in calls for event in batch] == events
@@ -1,7 +1,7 @@
-from datetime import datetime
-from typing import Optional
+from itertools import count
+from typing import AsyncIterator, Iterator, Optional
 
-from django.db.models import Prefetch, Q
+from django.db.models import Exists, OuterRef, Prefetch, Q
 from drf_spectacular.utils import (
     OpenApiExample,
     OpenApiParameter,
@@ -12,9 +12,25 @@ from rest_framework import mixins, permissions, viewsets
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from ..helpers.dto_helper import block_to_dto
+from ..helpers.conditional_helper import (
+    cached_response,
+    get_validators,
+    not_modified_response,
+    set_validators,
+)
+from ..helpers.date_range_helper import dispatch_date_filter
 from ..helpers.enum_helper import get_order_status
-from ..models import Block, Order
+from ..helpers.projection_helper import block_to_dict
+from ..helpers.streaming_helper import (
+    STREAM_BLOCK_PAGE_SIZE,
+    async_json_array_chunks,
+    is_async_streaming,
+    is_streaming_requested,
+    json_array_chunks,
+    streaming_json_response,
+)
+from ..models import Block, Order, OrderStatus
+from ..pagination import get_page_slice
 from ..serializers import BlockDistributionSerializer
 
 
@@ -29,8 +45,11 @@ class BlockDistributionViewSet(
 
     Query params:
     - date: YYYY-MM-DD (filters orders by dispatch_date date)
+    - date_from / date_to: YYYY-MM-DD (inclusive range of dispatch dates)
     - driver: int (driver ID)
     - status: str (one of OrderStatus values)
+    - page / page_size: int (page of blocks)
+    - orders_limit: int (first orders of each block only)
     """
 
     serializer_class = BlockDistributionSerializer
@@ -46,19 +65,24 @@ class BlockDistributionViewSet(
         filtered_orders = self._apply_filter_to_queryset(request=request)
 
         if filtered_orders is not None:
-            # Only include blocks that have matching orders
-            queryset = (
-                queryset.prefetch_related(Prefetch("orders", queryset=filtered_orders))
-                .filter(orders__in=filtered_orders)
-                .distinct()
+            # Only include blocks that have matching orders, as a semi-join
+            # (EXISTS) instead of a join to the orders plus DISTINCT
+            queryset = queryset.filter(
+                Exists(filtered_orders.filter(block_id=OuterRef("pk")))
             )
+            orders = filtered_orders
         else:
-            orders = Order.objects.order_by("dispatch_date", "id")
+            orders = self._get_orders_queryset()
 
-            # If no filters, just prefetch all orders for all blocks
-            queryset = queryset.prefetch_related(Prefetch("orders", queryset=orders))
+        # Keep the first orders of each block only (one windowed query);
+        # sliced prefetches need to_attr
+        orders_limit = self._get_orders_limit(request)
+        if orders_limit is not None:
+            orders = orders[:orders_limit]
 
-        return queryset
+        return queryset.prefetch_related(
+            Prefetch("orders", queryset=orders, to_attr="filtered_orders")
+        )
 
     # Override list to return camelCase + Spanish status using DTOs
     @extend_schema(
@@ -72,6 +96,18 @@ class BlockDistributionViewSet(
                 type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="date_from",
+                description="Desde: Listar bloques desde esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="date_to",
+                description="Hasta: Listar bloques hasta esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
             OpenApiParameter(
                 name="driver",
                 description="Chofer: Listar bloques por chofer",
@@ -85,6 +121,24 @@ class BlockDistributionViewSet(
                 location=OpenApiParameter.QUERY,
                 enum=get_order_status(),
             ),
+            OpenApiParameter(
+                name="page",
+                description="Página de bloques, desde 1",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description="Cantidad de bloques por página",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="orders_limit",
+                description="Máximo de pedidos por bloque",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
         ],
         responses={200: OpenApiTypes.OBJECT},
         examples=[
@@ -128,9 +182,28 @@ class BlockDistributionViewSet(
         ],
     )
     def list(self, request: Request, *args, **kwargs) -> Response:
-        queryset = self.get_queryset()
-        data = [block_to_dto(block).model_dump(by_alias=True) for block in queryset]
-        return Response(data)
+        if is_streaming_requested(request):
+            validators = get_validators(*self._get_validator_querysets(request))
+            not_modified = not_modified_response(request, validators)
+            if not_modified is not None:
+                return not_modified
+
+            if is_async_streaming():
+                chunks = self._astream_blocks(request)
+            else:
+                chunks = self._stream_blocks(request)
+            response = streaming_json_response(chunks)
+            return set_validators(response, validators)
+
+        return cached_response(
+            request,
+            OrderStatus.values,
+            lambda: [
+                block_to_dict(block, block.filtered_orders)
+                for block in self.get_page(request)
+            ],
+            lambda: self._get_validator_querysets(request),
+        )
 
     # Override retrieve similarly
     @extend_schema(
@@ -152,12 +225,69 @@ class BlockDistributionViewSet(
     )
     def retrieve(self, request: Request, *args, **kwargs) -> Response:
         instance = self.get_object()
-        dto = block_to_dto(instance)
-        return Response(dto.model_dump(by_alias=True))
+        return Response(block_to_dict(instance, instance.filtered_orders))
+
+    def _get_validator_querysets(self, request: Request):
+        """Blocks and orders the listing is built from, for its validators."""
+        orders = self._apply_filter_to_queryset(request=request)
+        return [
+            Block.objects.all(),
+            orders if orders is not None else Order.objects.all(),
+        ]
+
+    def get_page(self, request: Request):
+        """Blocks of the requested page (all of them when no page is asked)."""
+        queryset = self.get_queryset()
+
+        page = get_page_slice(request)
+        if page is not None:
+            queryset = queryset[page]
+        return queryset
+
+    def _stream_blocks(self, request: Request) -> Iterator[str]:
+        """
+        Encode the block listing as JSON chunks.
+
+        Blocks are read STREAM_BLOCK_PAGE_SIZE at a time, each page with its
+        orders prefetched, so the listing is never held in memory as a whole
+        and the number of queries doesn't grow with the number of blocks.
+        """
+        blocks = self.get_page(request)
+
+        def iterate_blocks():
+            for start in count(0, STREAM_BLOCK_PAGE_SIZE):
+                end = start + STREAM_BLOCK_PAGE_SIZE
+                page = list(blocks[start:end])
+                yield from page
+
+                if len(page) < STREAM_BLOCK_PAGE_SIZE:
+                    return
+
+        return json_array_chunks(
+            block_to_dict(block, block.filtered_orders) for block in iterate_blocks()
+        )
+
+    def _astream_blocks(self, request: Request) -> AsyncIterator[str]:
+        """Same as _stream_blocks, with async ORM queries."""
+        blocks = self.get_page(request)
+
+        async def iterate_blocks():
+            for start in count(0, STREAM_BLOCK_PAGE_SIZE):
+                end = start + STREAM_BLOCK_PAGE_SIZE
+                page = [block async for block in blocks[start:end]]
+                for block in page:
+                    yield block
+
+                if len(page) < STREAM_BLOCK_PAGE_SIZE:
+                    return
+
+        return async_json_array_chunks(
+            block_to_dict(block, block.filtered_orders)
+            async for block in iterate_blocks()
+        )
 
     @staticmethod
     def _apply_filter_to_queryset(request):
-        date_str: Optional[str] = request.query_params.get("date")
         driver_id: Optional[str] = request.query_params.get("driver")
         status: Optional[str] = request.query_params.get("status")
 
@@ -167,9 +297,12 @@ class BlockDistributionViewSet(
         has_filters = False
 
         # Apply filters only if they are provided
-        if date_str:
-            target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-            order_filters &= Q(dispatch_date__date=target_date)
+        try:
+            date_filters = dispatch_date_filter(request)
+        except ValueError:
+            date_filters = Q(pk__isnull=True)
+        if date_filters:
+            order_filters &= date_filters
             has_filters = True
 
         if driver_id:
@@ -182,11 +315,22 @@ class BlockDistributionViewSet(
 
         # Only apply order filters if any filter was provided
         if has_filters:
-            return (
-                Order.objects.select_related("driver")
-                .prefetch_related("products")
-                .filter(order_filters)
-                .order_by("dispatch_date", "id")
-            )
+            return BlockDistributionViewSet._get_orders_queryset(order_filters)
 
         return None
+
+    @staticmethod
+    def _get_orders_queryset(order_filters: Q = Q()):
+        return (
+            Order.objects.select_related("driver")
+            .prefetch_related("products")
+            .filter(order_filters)
+            .order_by("dispatch_date", "id")
+        )
+
+    @staticmethod
+    def _get_orders_limit(request: Request) -> Optional[int]:
+        try:
+            return max(int(request.query_params["orders_limit"]), 1)
+        except (KeyError, ValueError):
+            return None
@@ -1,32 +1,137 @@
+from typing import Optional
+
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiTypes,
+    extend_schema,
+)
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
-from ..models import Order, Block
+from ..helpers.conditional_helper import cached_response
+from ..models import Block, Order, OrderStatus
 from ..serializers import OrderDashboardSerializer
+from ..services.dashboard_service import (
+    DASHBOARD_DAYS,
+    DASHBOARD_MAX_POINTS,
+    BoundingBox,
+    DashboardService,
+)
+
+# Upper bounds of the query params, whatever the client asks
+MAX_POINTS_LIMIT = 2000
+MAX_DAYS = 366
 
 
 class DashboardViewSet(viewsets.ViewSet):
+    dashboard_service = DashboardService()
+
     @staticmethod
     def get_queryset():
         return Order.objects.all()
 
-    def list(self, request: Request, *args, **kwargs) -> Response:
-        # Get all orders
-        orders = self.get_queryset()
-        serializer = OrderDashboardSerializer(orders, many=True)
-
-        # Get the blocks with completed and approved status
-        blocks_count = (
-            Block.objects.filter(
-                orders__status__in=["COMPLETED", "APPROVED"]
+    @extend_schema(
+        tags=["Dashboard"],
+        summary="Dashboard - Resumen",
+        description=(
+            "Totales por estado, bloque y día, y los pedidos del área visible del "
+            "mapa (como máximo `limit`)."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="bbox",
+                description="Área visible: oeste,sur,este,norte (grados)",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description=f"Máximo de pedidos en el mapa (por defecto {DASHBOARD_MAX_POINTS})",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="days",
+                description=f"Días incluidos en byDay (por defecto {DASHBOARD_DAYS})",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+        examples=[
+            OpenApiExample(
+                "Ejemplo",
+                value={
+                    "countBlocks": 2,
+                    "totalOrders": 3,
+                    "byStatus": {"COMPLETED": 1, "APPROVED": 2},
+                    "byBlock": [{"blockId": 1, "blockName": "Centro", "total": 3}],
+                    "byDay": [{"day": "2025-08-12", "total": 3}],
+                    "orders": [
+                        {
+                            "status": "COMPLETED",
+                            "destination": "Sucursal Central",
+                            "code": "ORD-001",
+                            "latitude": "9.934000",
+                            "longitude": "-84.087000",
+                        }
+                    ],
+                    "truncated": False,
+                },
             )
-            .distinct()
-            .count()
+        ],
+    )
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        bbox = self._get_bbox(request)
+        limit = self._get_int_param(
+            request, "limit", DASHBOARD_MAX_POINTS, MAX_POINTS_LIMIT
+        )
+        days = self._get_int_param(request, "days", DASHBOARD_DAYS, MAX_DAYS)
+
+        return cached_response(
+            request,
+            OrderStatus.values,
+            lambda: self.summarize(bbox, limit, days),
+            lambda: [Order.objects.all(), Block.objects.all()],
         )
 
-        response = {
-            "countBlocks": blocks_count,
-            "orders": serializer.data,
+    def summarize(self, bbox: Optional[BoundingBox], limit: int, days: int) -> dict:
+        """Build the dashboard payload."""
+        service = self.dashboard_service
+        by_status = service.count_by_status()
+        points, truncated = service.get_points(bbox, limit)
+
+        return {
+            "countBlocks": service.count_blocks(),
+            "totalOrders": sum(by_status.values()),
+            "byStatus": by_status,
+            "byBlock": service.count_by_block(),
+            "byDay": service.count_by_day(days),
+            "orders": list(OrderDashboardSerializer(points, many=True).data),
+            "truncated": truncated,
         }
 
-        return Response(response)
+    @staticmethod
+    def _get_bbox(request: Request) -> Optional[BoundingBox]:
+        value: Optional[str] = request.query_params.get("bbox")
+        if not value:
+            return None
+
+        try:
+            west, south, east, north = (float(part) for part in value.split(","))
+        except ValueError:
+            raise ValidationError({"bbox": "Expected west,south,east,north"})
+
+        if west > east or south > north:
+            raise ValidationError({"bbox": "Expected west <= east and south <= north"})
+        return west, south, east, north
+
+    @staticmethod
+    def _get_int_param(request: Request, name: str, default: int, maximum: int) -> int:
+        try:
+            value = int(request.query_params[name])
+        except (KeyError, ValueError):
+            return default
+        return min(max(value, 1), maximum)
@@ -1,7 +1,7 @@
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-from django.db.models import Q
+from django.conf import settings
+from django.db.models import Count, Min, Q
 from drf_spectacular.utils import (
     OpenApiExample,
     OpenApiParameter,
@@ -12,34 +12,128 @@ from rest_framework import mixins, permissions, viewsets
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from ..helpers.dto_helper import (
-    build_consolidation_group,
-    dispatch_order_to_dict,
-    distribution_order_to_dto,
-    order_to_dto,
-    preparation_order_to_dict,
+from ..helpers.conditional_helper import (
+    cached_response,
+    get_validators,
+    not_modified_response,
+    set_validators,
 )
+from ..helpers.date_range_helper import dispatch_date_filter
 from ..helpers.enum_helper import get_order_status
+from ..helpers.projection_helper import (
+    CONSOLIDATION_STATUS_COUNTS,
+    DISPATCH_PROJECTION,
+    DISTRIBUTION_PROJECTION,
+    ORDER_PROJECTION,
+    PREPARATION_PROJECTION,
+    RECEIVING_PROJECTION,
+    OrderProjection,
+    consolidation_group_to_dict,
+)
+from ..helpers.streaming_helper import (
+    STREAM_CHUNK_SIZE,
+    async_json_array_chunks,
+    is_async_streaming,
+    is_streaming_requested,
+    json_array_chunks,
+    streaming_json_response,
+)
 from ..models import Order
+from ..pagination import (
+    OrderKeysetPagination,
+    aiterate_by_keyset,
+    get_page_slice,
+    iterate_by_keyset,
+)
+from ..services.order_summary_service import OrderSummaryService
 
 
 class BaseOrderListViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     permission_classes = [permissions.AllowAny]
+    pagination_class = OrderKeysetPagination
+    projection: OrderProjection = ORDER_PROJECTION
+    # Order statuses returned by the endpoint, used to tag cached responses
+    cache_statuses: Tuple[str, ...] = ()
+
+    def serialize_order(self, order: Order) -> dict:
+        """Build the response item of an order for this endpoint."""
+        return self.projection(order)
+
+    def list_orders(self, request: Request) -> Response:
+        """
+        List the orders of get_queryset().
+
+        The response is a plain list, or a keyset-paginated page when the
+        client asks for it (`cursor` / `page_size`) or when
+        settings.ORDER_LIST_PAGINATION is "always". With `stream=true` the
+        plain list is streamed instead of being built in memory, read in
+        keyset chunks of (dispatch_date, id) and with async ORM queries when
+        served by ASGI. Other responses go through the response cache.
+        """
+        queryset = self.get_queryset()
+
+        if is_streaming_requested(request):
+            validators = get_validators(queryset)
+            not_modified = not_modified_response(request, validators)
+            if not_modified is not None:
+                return not_modified
+
+            if is_async_streaming():
+                chunks = async_json_array_chunks(self.aserialize_orders(queryset))
+            else:
+                orders = iterate_by_keyset(queryset, STREAM_CHUNK_SIZE)
+                chunks = json_array_chunks(self.serialize_order(o) for o in orders)
+            response = streaming_json_response(chunks)
+            return set_validators(response, validators)
+
+        def build():
+            if self._pagination_requested(request):
+                page = self.paginate_queryset(queryset)
+                orders = [self.serialize_order(o) for o in page]
+                return self.get_paginated_response(orders).data
+
+            return [self.serialize_order(o) for o in queryset]
+
+        return self.cached_response(request, build)
+
+    async def aserialize_orders(self, queryset) -> AsyncIterator[dict]:
+        """Serialize the orders of a queryset with async ORM queries."""
+        async for order in aiterate_by_keyset(queryset, STREAM_CHUNK_SIZE):
+            yield self.serialize_order(order)
+
+    def cached_response(self, request: Request, build: Callable[[], Any]) -> Response:
+        """
+        Answer a conditional GET from the response cache.
+
+        The payload comes from the cache, or from build() on a miss, with the
+        ETag/Last-Modified stored alongside it. On a miss the validators come
+        from get_queryset(), so a 304 doesn't build the payload.
+        """
+        return cached_response(
+            request, self.cache_statuses, build, lambda: [self.get_queryset()]
+        )
+
+    def _pagination_requested(self, request: Request) -> bool:
+        if settings.ORDER_LIST_PAGINATION == "always":
+            return True
+
+        paginator = self.paginator
+        return (
+            paginator.cursor_query_param in request.query_params
+            or paginator.page_size_query_param in request.query_params
+        )
 
     @staticmethod
     def _build_filters(request: Request) -> Q:
-        date_str: Optional[str] = request.query_params.get("date")
         driver_id: Optional[str] = request.query_params.get("driver")
         block_id: Optional[str] = request.query_params.get("block")
         status: Optional[str] = request.query_params.get("status")
 
         filters = Q()
-        if date_str:
-            try:
-                target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                filters &= Q(dispatch_date__date=target_date)
-            except ValueError:
-                filters &= Q(pk__isnull=True)
+        try:
+            filters &= dispatch_date_filter(request)
+        except ValueError:
+            filters &= Q(pk__isnull=True)
         if driver_id:
             filters &= Q(driver_id=driver_id)
         if block_id:
@@ -49,19 +143,23 @@ class BaseOrderListViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
             filters &= Q(status=normalized)
         return filters
 
-    @staticmethod
-    def get_base_queryset(extra_filters: Q = Q()):
-        return (
-            Order.objects.select_related("driver", "block")
-            .prefetch_related("products")
-            .filter(extra_filters)
-            .order_by("dispatch_date", "id")
-        )
+    def get_base_queryset(self, extra_filters: Q = Q(), select_related=()):
+        """
+        Orders matching the filters, sorted by (dispatch_date, id).
+
+        Only the columns and relations read by the endpoint projection are
+        loaded; select_related adds foreign keys the view itself reads.
+        """
+        queryset = Order.objects.filter(extra_filters).order_by("dispatch_date", "id")
+        return self.projection.apply(queryset, select_related)
 
 
 class DispatchViewSet(BaseOrderListViewSet):
     """Orders sent from SMEs to DC (default status: IN_DISPATCH)."""
 
+    projection = DISPATCH_PROJECTION
+    cache_statuses = ("IN_DISPATCH",)
+
     def get_queryset(self):
         filters = self._build_filters(self.request) & Q(status="IN_DISPATCH")
         return self.get_base_queryset(filters)
@@ -77,6 +175,18 @@ class DispatchViewSet(BaseOrderListViewSet):
                 type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="date_from",
+                description="Desde: Listar pedidos desde esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="date_to",
+                description="Hasta: Listar pedidos hasta esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
             OpenApiParameter(
                 name="driver",
                 description="Chofer: Listar pedidos por chofer",
@@ -117,17 +227,15 @@ class DispatchViewSet(BaseOrderListViewSet):
         ],
     )
     def list(self, request: Request, *args, **kwargs) -> Response:
-        data = [
-            dispatch_order_to_dict(order_to_dto(o).model_dump(by_alias=True))
-            for o in self.get_queryset()
-        ]
-
-        return Response(data)
+        return self.list_orders(request)
 
 
 class PreparationViewSet(BaseOrderListViewSet):
     """Prepared orders with products and weight/volume status (default: PENDING)."""
 
+    projection = PREPARATION_PROJECTION
+    cache_statuses = ("PENDING",)
+
     def get_queryset(self):
         filters = self._build_filters(self.request) & Q(status="PENDING")
         return self.get_base_queryset(filters)
@@ -143,6 +251,18 @@ class PreparationViewSet(BaseOrderListViewSet):
                 type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="date_from",
+                description="Desde: Listar pedidos desde esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="date_to",
+                description="Hasta: Listar pedidos hasta esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
             OpenApiParameter(
                 name="driver",
                 description="Chofer: Listar pedidos por chofer",
@@ -185,17 +305,14 @@ class PreparationViewSet(BaseOrderListViewSet):
         ],
     )
     def list(self, request: Request, *args, **kwargs) -> Response:
-        data = [
-            preparation_order_to_dict(order_to_dto(o).model_dump(by_alias=True))
-            for o in self.get_queryset()
-        ]
-
-        return Response(data)
+        return self.list_orders(request)
 
 
 class ShippingViewSet(BaseOrderListViewSet):
     """Orders ready to ship (default: COMPLETED)."""
 
+    cache_statuses = ("COMPLETED",)
+
     def get_queryset(self):
         filters = self._build_filters(self.request) & Q(status="COMPLETED")
         return self.get_base_queryset(filters)
@@ -211,6 +328,18 @@ class ShippingViewSet(BaseOrderListViewSet):
                 type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="date_from",
+                description="Desde: Listar pedidos desde esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="date_to",
+                description="Hasta: Listar pedidos hasta esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
             OpenApiParameter(
                 name="driver",
                 description="Chofer: Listar pedidos por chofer",
@@ -259,13 +388,15 @@ class ShippingViewSet(BaseOrderListViewSet):
         ],
     )
     def list(self, request: Request, *args, **kwargs) -> Response:
-        data = [order_to_dto(o).model_dump(by_alias=True) for o in self.get_queryset()]
-        return Response(data)
+        return self.list_orders(request)
 
 
 class ReceivingViewSet(BaseOrderListViewSet):
     """Receipt at DC; show incidents (default: READY_TO_SHIP)."""
 
+    projection = RECEIVING_PROJECTION
+    cache_statuses = ("READY_TO_SHIP",)
+
     def get_queryset(self):
         filters = self._build_filters(self.request) & Q(status="READY_TO_SHIP")
         return self.get_base_queryset(filters)
@@ -281,6 +412,18 @@ class ReceivingViewSet(BaseOrderListViewSet):
                 type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="date_from",
+                description="Desde: Listar pedidos desde esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="date_to",
+                description="Hasta: Listar pedidos hasta esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
             OpenApiParameter(
                 name="driver",
                 description="Chofer: Listar pedidos por chofer",
@@ -330,20 +473,18 @@ class ReceivingViewSet(BaseOrderListViewSet):
         ],
     )
     def list(self, request: Request, *args, **kwargs) -> Response:
-        result = []
-        for o in self.get_queryset():
-            dto = order_to_dto(o).model_dump(by_alias=True)
-            dto["hasIncidents"] = bool(o.incidents)
-            result.append(dto)
-        return Response(result)
+        return self.list_orders(request)
 
 
 class ConsolidationViewSet(BaseOrderListViewSet):
     """Group orders by driver and block; return completion status counts."""
 
+    cache_statuses = ("APPROVED",)
+    summary_service = OrderSummaryService()
+
     def get_queryset(self):
         filters = self._build_filters(self.request) & Q(status="APPROVED")
-        return self.get_base_queryset(filters)
+        return self.get_base_queryset(filters, select_related=("block",))
 
     @extend_schema(
         tags=["Procesos"],
@@ -356,6 +497,18 @@ class ConsolidationViewSet(BaseOrderListViewSet):
                 type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="date_from",
+                description="Desde: Listar pedidos desde esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="date_to",
+                description="Hasta: Listar pedidos hasta esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
             OpenApiParameter(
                 name="driver",
                 description="Chofer: Listar pedidos por chofer",
@@ -375,6 +528,18 @@ class ConsolidationViewSet(BaseOrderListViewSet):
                 location=OpenApiParameter.QUERY,
                 enum=get_order_status(),
             ),
+            OpenApiParameter(
+                name="page",
+                description="Página de grupos (chofer/bloque), desde 1",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description="Cantidad de grupos por página",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
         ],
         responses={200: OpenApiTypes.OBJECT},
         examples=[
@@ -427,26 +592,126 @@ class ConsolidationViewSet(BaseOrderListViewSet):
         ],
     )
     def list(self, request: Request, *args, **kwargs) -> Response:
-        orders = list(self.get_queryset())
+        return self.cached_response(request, lambda: self.consolidate(request))
 
-        groups: Dict[Tuple[Optional[int], Optional[int]], List[Order]] = {}
-        for o in orders:
-            key = (o.driver_id, o.block_id)
-            groups.setdefault(key, []).append(o)
+    def consolidate(self, request: Request) -> List[dict]:
+        """Build the consolidation groups of the requested page."""
+        groups = self.get_summary_groups(request)
+        if groups is None:
+            groups = self.get_group_queryset()
+
+        page = get_page_slice(request)
+        if page is not None:
+            groups = groups[page]
+
+        groups = list(groups)
+        orders_by_group = self._get_group_orders(groups)
 
         data = []
-        # We'll need driver and block instances; prefetch done in queryset
-        for (driver_id, block_id), ords in groups.items():
-            driver = ords[0].driver if ords and ords[0].driver.id == driver_id else None
-            block = ords[0].block if ords and ords[0].block.id == block_id else None
-            dto = build_consolidation_group(driver, block, ords)
-            data.append(dto.model_dump(by_alias=True))
-        return Response(data)
+        for group in groups:
+            key = (group["driver_id"], group["block_id"])
+            ords = orders_by_group.get(key, [])
+            driver = ords[0].driver if ords else None
+            block = ords[0].block if ords else None
+            data.append(consolidation_group_to_dict(driver, block, group, ords))
+        return data
+
+    def get_group_queryset(self):
+        """
+        One row per (driver, block) with the total and per-status counts.
+
+        Counting is done by the database in a single GROUP BY query. Groups
+        come in the order of their first order by (dispatch_date, id).
+        """
+        filters = self._build_filters(self.request) & Q(status="APPROVED")
+        status_counts = {
+            key: Count("id", filter=Q(status=status))
+            for key, status in CONSOLIDATION_STATUS_COUNTS.items()
+        }
+
+        return (
+            Order.objects.filter(filters)
+            .order_by()
+            .values("driver_id", "block_id")
+            .annotate(
+                total=Count("id"),
+                first_dispatch_date=Min("dispatch_date"),
+                first_id=Min("id"),
+                **status_counts,
+            )
+            .order_by("first_dispatch_date", "first_id")
+        )
+
+    def get_summary_groups(self, request: Request) -> Optional[List[dict]]:
+        """
+        Read the groups from the order_summary table, in O(groups).
+
+        Only used with settings.ORDER_SUMMARY_READS and without date filters,
+        which the summary does not keep. Groups come ordered by
+        (driver, block). Returns None when the summary cannot answer.
+        """
+        params = request.query_params
+        if not settings.ORDER_SUMMARY_READS or any(
+            params.get(name) for name in ("date", "date_from", "date_to")
+        ):
+            return None
+
+        try:
+            driver_id = int(params["driver"]) if params.get("driver") else None
+            block_id = int(params["block"]) if params.get("block") else None
+        except ValueError:
+            return None
+
+        statuses = {"APPROVED"}
+        if params.get("status"):
+            status = params["status"]
+            statuses &= {get_order_status(only_dict=True).get(status.upper(), status)}
+
+        groups = self.summary_service.get_groups(statuses, driver_id, block_id)
+        return [
+            {
+                "driver_id": group["driver_id"],
+                "block_id": group["block_id"],
+                "total": group["total"],
+                **{
+                    key: group["counts"][status]
+                    for key, status in CONSOLIDATION_STATUS_COUNTS.items()
+                },
+            }
+            for group in groups
+        ]
+
+    def _get_group_orders(
+        self, groups: List[dict]
+    ) -> Dict[Tuple[Optional[int], Optional[int]], List[Order]]:
+        """Fetch the orders of the given groups only, keyed by (driver, block)."""
+        if not groups:
+            return {}
+
+        in_groups = Q(pk__isnull=True)
+        for group in groups:
+            in_groups |= self._group_filter(group["driver_id"], group["block_id"])
+
+        orders = self.get_queryset().filter(in_groups)
+
+        orders_by_group: Dict[Tuple[Optional[int], Optional[int]], List[Order]] = {}
+        for o in orders:
+            orders_by_group.setdefault((o.driver_id, o.block_id), []).append(o)
+        return orders_by_group
+
+    @staticmethod
+    def _group_filter(driver_id: Optional[int], block_id: Optional[int]) -> Q:
+        driver = Q(driver__isnull=True) if driver_id is None else Q(driver_id=driver_id)
+        block = Q(block__isnull=True) if block_id is None else Q(block_id=block_id)
+        return driver & block
 
 
 class DistributionOrdersViewSet(BaseOrderListViewSet):
     """Deliveries made, pending, and rejected, with confirmations."""
 
+    projection = DISTRIBUTION_PROJECTION
+    cache_statuses = ("DELIVERED", "PENDING", "REJECTED")
+
     def get_queryset(self):
         filters = self._build_filters(self.request) & Q(
             status__in=["DELIVERED", "PENDING", "REJECTED"]
@@ -473,6 +738,18 @@ class DistributionOrdersViewSet(BaseOrderListViewSet):
                 type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="date_from",
+                description="Desde: Listar pedidos desde esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="date_to",
+                description="Hasta: Listar pedidos hasta esta fecha (inclusive)",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
             OpenApiParameter(
                 name="driver",
                 description="Chofer: Listar pedidos por chofer",
@@ -522,8 +799,4 @@ class DistributionOrdersViewSet(BaseOrderListViewSet):
         ],
     )
     def list(self, request: Request, *args, **kwargs) -> Response:
-        data = [
-            distribution_order_to_dto(o).model_dump(by_alias=True)
-            for o in self.get_queryset()
-        ]
-        return Response(data)
+        return self.list_orders(request)
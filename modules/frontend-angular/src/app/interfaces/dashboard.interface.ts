@@ -6,9 +6,28 @@ export interface DashboardOrder extends BaseOrder {
   code: string;
 }
 
+export interface DashboardBlockCount {
+  blockId: number;
+  blockName: string;
+  total: number;
+}
+
+export interface DashboardDayCount {
+  day: string;
+  total: number;
+}
+
+// Visible area of the map, in degrees
+export type BoundingBox = [west: number, south: number, east: number, north: number];
+
 export interface DashboardResponse {
   countBlocks: number;
+  totalOrders: number;
+  byStatus: { [status: string]: number };
+  byBlock: DashboardBlockCount[];
+  byDay: DashboardDayCount[];
   orders: DashboardOrder[];
+  truncated: boolean;
 }
 
 export interface KPI {
@@ -1,13 +1,19 @@
-import { Component, OnInit } from '@angular/core';
+import { Component, OnDestroy, OnInit } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { MatCardModule } from '@angular/material/card';
 import { MatIconModule } from '@angular/material/icon';
 import { MatGridListModule } from '@angular/material/grid-list';
 import { MatProgressSpinnerModule } from '@angular/material/progress-spinner';
-import { finalize } from 'rxjs/operators';
+import { EMPTY, Subject } from 'rxjs';
+import { catchError, debounceTime, finalize, switchMap, takeUntil } from 'rxjs/operators';
 
 import { DashboardService } from '../../services/dashboard.service';
-import { DashboardOrder, KPI, MapMarker } from '../../interfaces/dashboard.interface';
+import {
+  BoundingBox,
+  DashboardOrder,
+  KPI,
+  MapMarker,
+} from '../../interfaces/dashboard.interface';
 import { MapComponent } from '../../shared/map.component';
 
 @Component({
@@ -18,17 +24,56 @@ import { MapComponent } from '../../shared/map.component';
   imports: [CommonModule, MatCardModule, MatIconModule, MatGridListModule, MatProgressSpinnerModule, MapComponent],
   styleUrls: ['./dashboard.component.scss'],
 })
-export class DashboardComponent implements OnInit {
+export class DashboardComponent implements OnInit, OnDestroy {
   public kpis: KPI[] = [];
   public orders: DashboardOrder[] = [];
   public mapMarkers: MapMarker[] = [];
   public isLoading = true;
   public error: string | null = null;
 
+  private readonly bounds$ = new Subject<BoundingBox>();
+  private readonly destroy$ = new Subject<void>();
+
   constructor(private dashboardService: DashboardService) {}
 
   public ngOnInit(): void {
     this.loadDashboardData();
+    this.followMapBounds();
+  }
+
+  public ngOnDestroy(): void {
+    this.destroy$.next();
+    this.destroy$.complete();
+  }
+
+  /**
+   * Called when the map is panned or zoomed
+   */
+  public onBoundsChange(bbox: BoundingBox): void {
+    this.bounds$.next(bbox);
+  }
+
+  /**
+   * Reloads the map points of the visible area once the map stops moving
+   */
+  private followMapBounds(): void {
+    this.bounds$
+      .pipe(
+        debounceTime(300),
+        switchMap((bbox) =>
+          this.dashboardService.getDashboardData(bbox).pipe(
+            catchError((err) => {
+              console.error('Error loading map points:', err);
+              return EMPTY;
+            })
+          )
+        ),
+        takeUntil(this.destroy$)
+      )
+      .subscribe((data) => {
+        this.orders = data.orders;
+        this.mapMarkers = this.dashboardService.getMapMarkers(data.orders);
+      });
   }
 
   /**
@@ -48,7 +93,7 @@ export class DashboardComponent implements OnInit {
       .subscribe({
         next: (data) => {
           this.orders = data.orders;
-          this.kpis = this.dashboardService.getKPIs(data.orders);
+          this.kpis = this.dashboardService.getKPIs(data);
           this.mapMarkers = this.dashboardService.getMapMarkers(data.orders);
         },
         error: (err) => {
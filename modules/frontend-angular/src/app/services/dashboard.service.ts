@@ -1,7 +1,12 @@
 import { Injectable, inject } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
-import { DashboardResponse, KPI, MapMarker } from '../interfaces/dashboard.interface';
+import {
+  BoundingBox,
+  DashboardResponse,
+  KPI,
+  MapMarker,
+} from '../interfaces/dashboard.interface';
 
 @Injectable({
   providedIn: 'root',
@@ -11,20 +16,34 @@ export class DashboardService {
   private http = inject(HttpClient);
 
   /**
-   * Fetches dashboard data from the API
+   * Fetches dashboard data from the API, with the map points of the visible area
    */
-  public getDashboardData(): Observable<DashboardResponse> {
-    return this.http.get<DashboardResponse>(`${this.apiUrl}/dashboard/`);
+  public getDashboardData(bbox?: BoundingBox): Observable<DashboardResponse> {
+    let params = new HttpParams();
+    if (bbox) {
+      params = params.set('bbox', this.formatBoundingBox(bbox));
+    }
+    return this.http.get<DashboardResponse>(`${this.apiUrl}/dashboard/`, { params });
+  }
+
+  /**
+   * Widens the area to 3 decimals (about 100 m), so that small pans share the
+   * cached response
+   */
+  private formatBoundingBox([west, south, east, north]: BoundingBox): string {
+    const down = (value: number) => (Math.floor(value * 1000) / 1000).toFixed(3);
+    const up = (value: number) => (Math.ceil(value * 1000) / 1000).toFixed(3);
+    return [down(west), down(south), up(east), up(north)].join(',');
   }
 
   /**
-   * Transforms dashboard data into KPI metrics
+   * Transforms the dashboard aggregates into KPI metrics
    */
-  public getKPIs(orders: any[]): KPI[] {
-    const totalOrders = orders.length;
-    const inDispatch = orders.filter(o => o.status === 'IN_DISPATCH').length;
-    const completed = orders.filter(o => o.status === 'COMPLETED').length;
-    const pending = orders.filter(o => ['PENDING'].includes(o.status)).length;
+  public getKPIs(data: DashboardResponse): KPI[] {
+    const totalOrders = data.totalOrders;
+    const inDispatch = data.byStatus['IN_DISPATCH'] ?? 0;
+    const completed = data.byStatus['COMPLETED'] ?? 0;
+    const pending = data.byStatus['PENDING'] ?? 0;
 
     return [
       {
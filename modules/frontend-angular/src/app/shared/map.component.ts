@@ -1,6 +1,8 @@
 import {
   Component,
   Input,
+  Output,
+  EventEmitter,
   OnInit,
   OnDestroy,
   ElementRef,
@@ -10,6 +12,8 @@ import {
 import { CommonModule } from '@angular/common';
 import * as L from 'leaflet';
 
+import { BoundingBox } from '../interfaces/dashboard.interface';
+
 export interface MapMarker {
   lat: number;
   lng: number;
@@ -55,6 +59,11 @@ export class MapComponent implements OnInit, OnDestroy, AfterViewInit {
   @Input() public center: [number, number] = [-33.4489, -70.6693]; // Santiago
   @Input() public zoom: number = 10;
   @Input() public fullHeight: boolean = false;
+  // Zoom to the markers whenever they change; off when the markers follow the view
+  @Input() public fitToMarkers: boolean = true;
+
+  // Visible area, on load and after every pan or zoom
+  @Output() public boundsChange = new EventEmitter<BoundingBox>();
 
   private map!: L.Map;
   private markerLayer!: L.LayerGroup;
@@ -73,6 +82,7 @@ export class MapComponent implements OnInit, OnDestroy, AfterViewInit {
   public ngAfterViewInit(): void {
     this.initMap();
     this.addMarkers();
+    this.boundsChange.emit(this.getBoundingBox());
   }
 
   public ngOnDestroy(): void {
@@ -89,6 +99,12 @@ export class MapComponent implements OnInit, OnDestroy, AfterViewInit {
     }).addTo(this.map);
 
     this.markerLayer = L.layerGroup().addTo(this.map);
+    this.map.on('moveend', () => this.boundsChange.emit(this.getBoundingBox()));
+  }
+
+  private getBoundingBox(): BoundingBox {
+    const bounds = this.map.getBounds();
+    return [bounds.getWest(), bounds.getSouth(), bounds.getEast(), bounds.getNorth()];
   }
 
   private addMarkers(): void {
@@ -142,7 +158,7 @@ export class MapComponent implements OnInit, OnDestroy, AfterViewInit {
     });
 
     // Fit bounds if we have markers
-    if (this._markers.length > 0) {
+    if (this.fitToMarkers && this._markers.length > 0) {
       const group = L.featureGroup(this._markerLayers);
       this.map.fitBounds(group.getBounds().pad(0.1));
     }